@@ -102,6 +102,7 @@ def main():
     from wavecam.pipeline import Pipeline
     from wavecam.ptz_visca import NullPtz, ViscaIP
     from wavecam.recorder import Recorder, RecorderConfig, main_stream_from_detection_source
+    from wavecam.visca_scheduler import ViscaScheduler
     from wavecam.web import build_app
 
     cfg_path = sys.argv[1] if len(sys.argv) > 1 else "config.yaml"
@@ -109,9 +110,13 @@ def main():
 
     # PTZ backend
     if cfg.ptz.enabled:
-        ptz = ViscaIP(cfg.ptz.ip, cfg.ptz.port, cfg.ptz.address)
+        ptz = ViscaIP(cfg.ptz.ip, cfg.ptz.port, cfg.ptz.address, async_rx=cfg.ptz.async_rx)
+        # Reset on the raw transport before the scheduler's writer owns the socket.
         if cfg.ptz.reset_sequence:
             ptz.reset_sequence()
+        if cfg.ptz.scheduler:
+            ptz = ViscaScheduler(ptz, cfg.ptz.send_min_gap_sec)
+            ptz.start()
         ptz.stop()  # ensure stationary at startup
         print(f"[run] PTZ ENABLED -> VISCA {cfg.ptz.ip}:{cfg.ptz.port}")
     else:
@@ -119,9 +124,9 @@ def main():
         print("[run] PTZ disabled (detection-only). Set ptz.enabled=true when ready.")
 
     def detector_factory():
-        from wavecam.detector import PersonDetector
-        print(f"[run] loading YOLO model: {cfg.detector.model}")
-        return PersonDetector(cfg.detector)
+        from wavecam.detector import make_detector
+        print(f"[run] loading YOLO model ({cfg.detector.backend}): {cfg.detector.model}")
+        return make_detector(cfg.detector)
 
     pipe = Pipeline(cfg, ptz, detector_factory)
     pipe.recorder = Recorder(
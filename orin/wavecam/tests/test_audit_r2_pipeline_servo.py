@@ -292,7 +292,7 @@ def _minimal_real_pipeline(ptz_enabled: bool = False):
         loop=types.SimpleNamespace(target_fps=100.0, log_every_sec=100),
     )
     pipe = Pipeline(cfg, _NullPtz(), detector_factory=lambda: None)
-    pipe.grab = types.SimpleNamespace(start=lambda: None, read=lambda: None,
+    pipe.grab = types.SimpleNamespace(start=lambda: None, acquire=lambda: None,
                                       connected=False, stop=lambda: None, frames=0)
     return pipe
 
@@ -0,0 +1,45 @@
+"""user-010: color-segmentation bench tool smoke test.
+
+Verifies:
+  - Module imports without error
+  - Default arg values (640x360 + 1280x720, both paths)
+  - Malformed size rejected
+  - run_bench times both paths and reports mask agreement
+"""
+from __future__ import annotations
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+
+
+def _mod():
+    return importlib.import_module("bench_color")
+
+
+def test_module_imports():
+    mod = _mod()
+    assert hasattr(mod, "build_parser")
+    assert hasattr(mod, "run_bench")
+    assert hasattr(mod, "main")
+
+
+def test_default_args():
+    args = _mod().build_parser().parse_args([])
+    assert args.sizes == [(640, 360), (1280, 720)]
+    assert args.paths == ["hsv", "lut"]
+    assert args.frames == 200 and args.preset == "orange_red"
+
+
+def test_bad_size_rejected():
+    with pytest.raises(SystemExit):
+        _mod().build_parser().parse_args(["--sizes", "640by360"])
+
+
+def test_run_bench_small(capsys):
+    _mod().run_bench([(64, 48)], ["hsv", "lut"], n_frames=2, warmup=0)
+    out = capsys.readouterr().out
+    assert "hsv" in out and "lut" in out and "mask agreement" in out
@@ -0,0 +1,53 @@
+"""user-006: detector-latency bench tool smoke test.
+
+No models loaded. Verifies:
+  - Module imports without error
+  - Default arg values (imgsz 320/480/640, ultralytics + onnx)
+  - Unknown backend rejected
+  - run_bench skips a backend with no model and survives a load failure
+"""
+from __future__ import annotations
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+
+
+def _mod():
+    return importlib.import_module("bench_detector")
+
+
+def test_module_imports():
+    mod = _mod()
+    assert hasattr(mod, "build_parser")
+    assert hasattr(mod, "run_bench")
+    assert hasattr(mod, "main")
+
+
+def test_default_args():
+    args = _mod().build_parser().parse_args([])
+    assert args.imgsz == [320, 480, 640]
+    assert args.backends == ["u", "o"]
+    assert args.frames == 200 and args.warmup == 10
+    assert args.pt is None and args.onnx is None
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(SystemExit):
+        _mod().build_parser().parse_args(["--backends", "x"])
+
+
+def test_run_bench_non_fatal(capsys, monkeypatch):
+    mod = _mod()
+
+    def boom(*a, **k):
+        raise RuntimeError("no onnxruntime")
+
+    monkeypatch.setattr(mod, "_detector", boom)
+    mod.run_bench(None, "missing.onnx", [320], ["u", "o"], n_frames=2, warmup=0)
+    captured = capsys.readouterr()
+    assert "SKIPPED" in captured.out
+    assert "ERROR" in captured.err
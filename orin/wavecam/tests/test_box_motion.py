@@ -0,0 +1,52 @@
+"""user-008: encoder motion compensation of cached YOLO boxes."""
+from __future__ import annotations
+
+import pytest
+
+from wavecam.box_motion import compensate_boxes, conf_decay
+from wavecam.detector import PersonBox
+
+W, H = 640, 360
+CURVE = [(0, 64.0), (16384, 32.0)]                     # 10 px/deg wide, 20 at 16384
+BOX = PersonBox(300.0, 150.0, 340.0, 230.0, 0.8, track_id=7)
+
+
+def _one(then, now, **kw):
+    (b,) = compensate_boxes([BOX], then, now, CURVE, W, H, **kw)
+    return b
+
+
+def test_pan_right_moves_boxes_left_and_tilt_up_moves_them_down():
+    b = _one((0, 0, 0), (72, 0, 0))                    # +5 deg pan at 14.4 counts/deg
+    assert (b.x1, b.x2, b.y1) == pytest.approx((250.0, 290.0, 150.0))
+    b = _one((0, 0, 0), (0, 36, 0))                    # +2.5 deg tilt
+    assert (b.y1, b.y2, b.x1) == pytest.approx((175.0, 255.0, 300.0))
+    assert b.track_id == 7 and b.conf == pytest.approx(0.8)
+
+
+def test_signed_calibrated_scale_flips_direction():
+    b = _one((0, 0, 0), (72, 0, 0), pan_enc_per_deg=-14.4)
+    assert b.x1 == pytest.approx(350.0)
+
+
+def test_zoom_in_scales_about_frame_centre():
+    b = _one((0, 0, 0), (0, 0, 16384))                 # hfov 64 -> 32: 2x
+    assert (b.x1, b.y1, b.x2, b.y2) == pytest.approx((280.0, 120.0, 360.0, 280.0))
+
+
+def test_boxes_pushed_off_frame_are_dropped():
+    assert compensate_boxes([BOX], (0, 0, 0), (-600, 0, 0), CURVE, W, H) == []
+
+
+def test_missing_pose_or_curve_means_no_compensation():
+    assert compensate_boxes([BOX], None, (0, 0, 0), CURVE, W, H) is None
+    assert compensate_boxes([BOX], (0, 0, 0), None, CURVE, W, H) is None
+    assert compensate_boxes([BOX], (0, 0, 0), (0, 0, 0), [], W, H) is None
+
+
+def test_conf_decay_half_life():
+    assert conf_decay(0.3, 0.3) == pytest.approx(0.5)
+    assert conf_decay(0.0, 0.3) == 1.0
+    assert conf_decay(1.0, 0.0) == 1.0
+    b = _one((0, 0, 0), (0, 0, 0), conf_scale=conf_decay(0.6, 0.3))
+    assert b.conf == pytest.approx(0.2)
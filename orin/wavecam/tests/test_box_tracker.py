@@ -0,0 +1,75 @@
+"""user-009: between-detection Kalman/IoU box tracker."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from wavecam.box_tracker import BoxTracker, iou_matrix
+from wavecam.config import load_config
+from wavecam.detector import PersonBox
+
+
+def _box(cx, cy, w=40.0, h=80.0, conf=0.8):
+    return PersonBox(cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2, conf)
+
+
+def _walk(tr, vx, n=10, dt=0.1, x0=100.0):
+    for i in range(n):
+        out = tr.update([_box(x0 + vx * i * dt, 200.0)], i * dt)
+    return out
+
+
+def test_iou_matrix():
+    a = np.array([[0, 0, 10, 10], [0, 0, 10, 10]], float)
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], float)
+    assert iou_matrix(a, b)[0].tolist() == pytest.approx([1.0, 1 / 3, 0.0])
+    assert iou_matrix(a, b[:0]).shape == (2, 0)
+
+
+def test_constant_velocity_prediction_between_detections():
+    tr = BoxTracker(max_age_sec=1.0)
+    (b,) = _walk(tr, vx=100.0)                       # last det at cx=190, t=0.9
+    assert b.center[0] == pytest.approx(190.0, abs=3.0)
+    (p,) = tr.predict(1.2)
+    assert p.center[0] == pytest.approx(220.0, abs=5.0)
+    assert p.center[1] == pytest.approx(200.0, abs=1.0)
+    assert p.track_id == b.track_id == 1
+
+
+def test_ids_persist_and_new_people_get_new_ids():
+    tr = BoxTracker()
+    tr.update([_box(100, 200), _box(400, 200)], 0.0)
+    out = tr.update([_box(405, 200), _box(104, 200), _box(600, 100)], 0.1)
+    ids = {round(b.center[0], -1): b.track_id for b in out}
+    assert ids[100.0] == 1 and ids[400.0] == 2 and ids[600.0] == 3
+
+
+def test_centroid_fallback_keeps_id_for_a_fast_jump():
+    tr = BoxTracker(iou_thresh=0.3, centroid_gate=1.0)
+    tr.update([_box(100, 200)], 0.0)
+    (b,) = tr.update([_box(150, 200)], 0.1)          # no overlap at w=40
+    assert b.track_id == 1 and len(tr) == 1
+
+
+def test_tracks_expire_after_max_age():
+    tr = BoxTracker(max_age_sec=0.5)
+    tr.update([_box(100, 200)], 0.0)
+    assert len(tr.predict(0.4)) == 1
+    assert tr.predict(0.6) == []
+    tr.update([], 0.6)
+    assert len(tr) == 0
+
+
+def test_predict_is_read_only_so_an_older_async_result_still_applies():
+    tr = BoxTracker()
+    tr.update([_box(100, 200)], 0.0)
+    tr.predict(0.5)
+    (b,) = tr.update([_box(110, 200)], 0.1)
+    assert b.track_id == 1 and b.center[0] == pytest.approx(110.0, abs=2.0)
+
+
+def test_config_loads_tracker_keys(tmp_path):
+    p = tmp_path / "c.yaml"
+    p.write_text("detector:\n  box_tracker: true\n")
+    det = load_config(str(p)).detector
+    assert det.box_tracker is True and det.tracker_max_age_sec == 0.6
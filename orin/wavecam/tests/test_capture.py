@@ -42,7 +42,7 @@ class _FakeCap:
     def set(self, *a):
         pass
 
-    def read(self):
+    def read(self, image=None):
         if self.reads:
             return self.reads.pop(0)
         return (False, None)
@@ -131,7 +131,7 @@ def test_frame_freeze_stalls_frames_counter_while_read_stays_non_none(monkeypatc
             super().__init__()
             self.n = 0
 
-        def read(self):
+        def read(self, image=None):
             self.n += 1
             if self.n <= 3:
                 return (True, FRAME)
@@ -152,6 +152,210 @@ def test_frame_freeze_stalls_frames_counter_while_read_stays_non_none(monkeypatc
         g.join(timeout=2)
 
 
+# ---------------------------------------------------------------------------
+# user-001: preallocated frame ring + read-only leases
+# ---------------------------------------------------------------------------
+
+class _CountingCap(_FakeCap):
+    """Decodes an incrementing value into the caller's buffer when given one
+    (the real cv2 read(image) contract), else allocates."""
+
+    def __init__(self, limit=10_000):
+        super().__init__()
+        self.n = 0
+        self.limit = limit
+        self.into = 0
+        self.unwedge = threading.Event()
+
+    def read(self, image=None):
+        if self.n >= self.limit:
+            self.unwedge.wait(timeout=5.0)    # wedged past the scripted frames
+            return (False, None)
+        self.n += 1
+        if image is not None and image.shape == FRAME.shape:
+            image[...] = self.n % 256
+            self.into += 1
+            return (True, image)
+        return (True, np.full(FRAME.shape, self.n % 256, dtype=np.uint8))
+
+
+def test_lease_is_read_only_and_never_overwritten_while_held(monkeypatch):
+    cap = _CountingCap()
+    _patch_cv2(monkeypatch, lambda *a, **k: cap)
+    g = _run_grabber(FrameGrabber(_cfg(), ring_size=3))
+    try:
+        assert _wait_for(lambda: g.frames >= 5)
+        lease = g.acquire()
+        snapshot = lease.image.copy()
+        assert not lease.image.flags.writeable, "leased frames must be read-only"
+        n0 = g.frames
+        assert _wait_for(lambda: g.frames >= n0 + 20), "decoder must keep running"
+        assert np.array_equal(lease.image, snapshot), "decoder overwrote a leased slot"
+        assert lease.valid
+        lease.release()
+        assert cap.into > 0, "steady state must decode into ring buffers in place"
+    finally:
+        g.stop()
+        g.join(timeout=2)
+
+
+def test_leases_carry_advancing_generation(monkeypatch):
+    _patch_cv2(monkeypatch, lambda *a, **k: _CountingCap())
+    g = _run_grabber(FrameGrabber(_cfg()))
+    try:
+        assert _wait_for(lambda: g.frames >= 3)
+        with g.acquire() as a:
+            seq_a = a.seq
+        assert _wait_for(lambda: g.frames > seq_a)
+        with g.acquire() as b:
+            assert b.seq > seq_a
+    finally:
+        g.stop()
+        g.join(timeout=2)
+
+
+def test_all_slots_leased_drops_instead_of_overwriting(monkeypatch):
+    cap = _CountingCap(limit=3)
+    cap.unwedge.set()
+    _patch_cv2(monkeypatch, lambda *a, **k: cap)
+    g = FrameGrabber(_cfg(), ring_size=3)
+    g._slots[0].buf = FRAME.copy()
+    g._slots[1].buf = FRAME.copy()
+    g._slots[0].refs = g._slots[1].refs = 1     # consumer pins two slots
+    g._latest_idx = 2                           # third is the latest
+    g._slots[2].buf = FRAME.copy()
+    _run_grabber(g)
+    try:
+        assert _wait_for(lambda: g.dropped_no_slot >= 1)
+        assert g.frames == 0, "no slot free: nothing may be published"
+    finally:
+        g.stop()
+        g.join(timeout=2)
+
+
+def test_shared_lease_pins_the_slot_until_both_are_released(monkeypatch):
+    """user-005: share() hands the same frame to the detector worker; the slot
+    stays pinned until the LAST holder releases it."""
+    cap = _CountingCap()
+    _patch_cv2(monkeypatch, lambda *a, **k: cap)
+    g = _run_grabber(FrameGrabber(_cfg(), ring_size=3))
+    try:
+        assert _wait_for(lambda: g.frames >= 2)
+        lease = g.acquire()
+        shared = lease.share()
+        snapshot = lease.image.copy()
+        assert shared.seq == lease.seq and shared.image is lease.image
+        lease.release()
+        base = g.frames
+        assert _wait_for(lambda: g.frames >= base + 5)
+        assert shared.valid and np.array_equal(shared.image, snapshot)
+        shared.release()
+        assert g._slots[shared._slot].refs == 0
+    finally:
+        g.stop()
+        g.join(timeout=2)
+
+
+def test_read_returns_private_writable_copy(monkeypatch):
+    _patch_cv2(monkeypatch, lambda *a, **k: _CountingCap())
+    g = _run_grabber(FrameGrabber(_cfg()))
+    try:
+        assert _wait_for(lambda: g.frames >= 2)
+        img = g.read()
+        assert img.flags.writeable
+        img[...] = 0                            # must not corrupt the ring
+        assert all(s.refs == 0 for s in g._slots), "read() must release its lease"
+    finally:
+        g.stop()
+        g.join(timeout=2)
+
+
+def test_wait_for_frame_returns_next_frame_with_capture_time(monkeypatch):
+    _patch_cv2(monkeypatch, lambda *a, **k: _CountingCap())
+    g = _run_grabber(FrameGrabber(_cfg()))
+    try:
+        assert _wait_for(lambda: g.frames >= 2)
+        with g.acquire() as cur:
+            seq0 = cur.seq
+        t_before = time.time()
+        lease = g.wait_for_frame(seq0, timeout=1.0)
+        assert lease is not None and lease.seq > seq0
+        assert t_before - 0.5 <= lease.t <= time.time()
+        lease.release()
+    finally:
+        g.stop()
+        g.join(timeout=2)
+
+
+def test_lease_carries_stream_pts_when_the_backend_reports_one(monkeypatch):
+    """user-003: CAP_PROP_POS_MSEC after the read is the frame's PTS; 0 means
+    the backend has none."""
+
+    class _PtsCap(_CountingCap):
+        msec_per_frame = 40.0
+
+        def get(self, prop):
+            assert prop == capture_mod.cv2.CAP_PROP_POS_MSEC
+            return self.msec_per_frame * self.n
+
+    for per_frame, expect in ((40.0, lambda seq: seq * 0.04), (0.0, lambda seq: None)):
+        cap = _PtsCap(limit=3)
+        cap.msec_per_frame = per_frame
+        _patch_cv2(monkeypatch, lambda *a, **k: cap)
+        capture_mod.cv2.CAP_PROP_POS_MSEC = 0
+        g = _run_grabber(FrameGrabber(_cfg()))
+        try:
+            assert _wait_for(lambda: g.frames == 3)
+            with g.acquire() as lease:
+                assert lease.seq == 3 and lease.pts == expect(3)
+        finally:
+            cap.unwedge.set()
+            g.stop()
+            g.join(timeout=2)
+
+
+def test_wait_for_frame_times_out_without_a_new_frame(monkeypatch):
+    """user-002: a stalled stream must not block the loop past its timeout;
+    the already-seen frame is NOT handed back as new."""
+    cap = _CountingCap(limit=2)
+    _patch_cv2(monkeypatch, lambda *a, **k: cap)
+    g = _run_grabber(FrameGrabber(_cfg()))
+    try:
+        assert _wait_for(lambda: g.frames == 2)
+        t0 = time.monotonic()
+        assert g.wait_for_frame(2, timeout=0.05) is None
+        assert time.monotonic() - t0 < 0.5
+        assert g.wait_for_frame(1, timeout=0.05).seq == 2   # newer than 1: immediate
+    finally:
+        cap.unwedge.set()
+        g.stop()
+        g.join(timeout=2)
+
+
+def test_wait_for_frame_wakes_on_disconnect(monkeypatch):
+    gate = threading.Event()
+
+    class _DyingCap(_FakeCap):
+        def read(self, image=None):
+            gate.wait(timeout=5.0)
+            return (False, None)
+
+    _patch_cv2(monkeypatch, lambda *a, **k: _DyingCap())
+    g = FrameGrabber(_cfg(reconnect_sec=5.0))
+    g._slots[0].buf = FRAME.copy()
+    g._slots[0].seq = g._frames = 1
+    g._latest_idx = 0
+    _run_grabber(g)
+    try:
+        threading.Timer(0.05, gate.set).start()
+        t0 = time.monotonic()
+        assert g.wait_for_frame(1, timeout=3.0) is None
+        assert time.monotonic() - t0 < 1.0, "disconnect must wake waiters"
+    finally:
+        g.stop()
+        g.join(timeout=0.1)
+
+
 # ---------------------------------------------------------------------------
 # C1 regression: video dropout must not leave the camera slewing
 # ---------------------------------------------------------------------------
@@ -230,7 +434,7 @@ def test_run_loop_stops_camera_on_none_frames():
     velocity command was active sends exactly one stop pair."""
     pipe = _dropout_pipeline(owner="idle")   # _run claims testbed itself
     pipe.cfg.loop = types.SimpleNamespace(target_fps=30, log_every_sec=10)
-    pipe.grab = types.SimpleNamespace(start=lambda: None, read=lambda: None,
+    pipe.grab = types.SimpleNamespace(start=lambda: None, acquire=lambda: None,
                                       connected=False, stop=lambda: None)
     pipe.ptz_state = types.SimpleNamespace(start=lambda: None, stop=lambda: None,
                                            latest=lambda: (None, None),
@@ -101,3 +101,66 @@ def test_detector_class_label():
     assert class_label(3) == "moto"
     assert class_label(37) == "surfboard"
     assert class_label(63) == "cls63"
+
+
+def test_lut_segmentation_matches_hsv_on_blobs():
+    """user-010: the BGR lookup table finds the same blobs as cvtColor+inRange
+    (incl. the red wrap-around bands) and agrees on nearly every noise pixel."""
+    f = _frame()
+    cv2.rectangle(f, (300, 150), (360, 250), ORANGE, -1)
+    cv2.rectangle(f, (100, 50), (140, 120), (20, 10, 200), -1)       # deep red
+    hsv_blobs, _ = ColorDetector(_cfg()).detect(f)
+    lut_blobs, _ = ColorDetector(_cfg(segmentation="lut")).detect(f)
+    assert [b.bbox for b in lut_blobs] == [b.bbox for b in hsv_blobs]
+    assert len(hsv_blobs) == 2
+
+    noise = np.random.default_rng(1).integers(0, 255, (H, W, 3), dtype=np.uint8)
+    exact = ColorDetector(_cfg())._mask(noise)
+    lut = ColorDetector(_cfg(segmentation="lut"))._mask(noise)
+    assert (exact == lut).mean() > 0.98
+
+
+def test_lut_rebuilt_on_range_change():
+    from wavecam.color_presets import preset_hsv_ranges
+    det = ColorDetector(_cfg(segmentation="lut"))
+    f = _frame()
+    cv2.rectangle(f, (300, 150), (360, 250), (255, 0, 0), -1)       # blue
+    assert det.detect(f)[0] == []
+    det.update_ranges(preset_hsv_ranges("blue"))
+    assert len(det.detect(f)[0]) == 1
+
+
+def test_mask_buffers_are_reused_across_frames():
+    """user-011: steady-state segmentation writes into persistent buffers."""
+    for seg in ("hsv", "lut"):
+        det = ColorDetector(_cfg(segmentation=seg, blur=3))
+        f = _frame()
+        cv2.rectangle(f, (300, 150), (360, 250), ORANGE, -1)
+        _, m1 = det.detect(f)
+        snap = m1.copy()
+        _, m2 = det.detect(_frame())
+        assert m2 is m1 and not m2.any() and snap.any()
+        _, m3 = det.detect(np.zeros((120, 160, 3), np.uint8))   # new size -> new buffers
+        assert m3.shape == (120, 160)
+
+
+def test_connected_components_blobs_match_contours():
+    """user-011: one connectedComponentsWithStats call yields the same blobs
+    (bbox, centre, order) as the contour loop; area is a pixel count."""
+    f = _frame()
+    for i, (x, y) in enumerate([(40, 40), (200, 100), (420, 200), (560, 30)]):
+        cv2.rectangle(f, (x, y), (x + 20 + 10 * i, y + 40 + 10 * i), ORANGE, -1)
+    cv2.rectangle(f, (10, 300), (14, 304), ORANGE, -1)                # below min_area
+    legacy, _ = ColorDetector(_cfg()).detect(f)
+    cc, _ = ColorDetector(_cfg(connected_components=True)).detect(f)
+    assert [(b.bbox, b.cx, b.cy) for b in cc] == [(b.bbox, b.cx, b.cy) for b in legacy]
+    assert len(cc) == 4
+    for b, old in zip(cc, legacy):
+        assert old.area <= b.area <= b.bbox[2] * b.bbox[3] and b.fill > 0.95
+
+
+def test_connected_components_area_filters():
+    f = _frame(ORANGE)
+    blobs, _ = ColorDetector(_cfg(connected_components=True, max_area_frac=0.5)).detect(f)
+    assert blobs == []
+    assert ColorDetector(_cfg(connected_components=True)).detect(_frame())[0] == []
@@ -0,0 +1,102 @@
+"""user-013: pyramid color segmentation with full-resolution refinement."""
+from __future__ import annotations
+
+import types
+
+import cv2
+import numpy as np
+import pytest
+
+from wavecam.color_detector import ColorDetector, _merge_windows, pyramid_level
+from wavecam.config import load_config
+
+W, H = 1280, 720
+ORANGE = (0, 165, 255)
+TEAL = (128, 128, 0)
+
+
+def _det(**kw):
+    base = dict(preset="orange_red", hsv_ranges={}, morph_kernel=5, min_area=400,
+                max_area=200000)
+    base.update(kw)
+    return ColorDetector(types.SimpleNamespace(**base))
+
+
+def _scene():
+    f = np.full((H, W, 3), TEAL, np.uint8)
+    cv2.rectangle(f, (601, 303), (660, 421), ORANGE, -1)       # big subject
+    cv2.circle(f, (200, 500), 30, ORANGE, -1)
+    cv2.rectangle(f, (1000, 100), (1010, 110), ORANGE, -1)     # 121 px < min_area
+    return f
+
+
+@pytest.mark.parametrize("level", [1, 2])
+@pytest.mark.parametrize("kw", [{}, {"connected_components": True}])
+def test_pyramid_refines_to_full_resolution_blobs(level, kw):
+    f = _scene()
+    ref, _ = _det(**kw).detect(f)
+    got, mask = _det(**kw).detect(f, level=level)
+    assert [(b.bbox, b.area, b.fill) for b in got] == [(b.bbox, b.area, b.fill) for b in ref]
+    assert len(got) == 2
+    assert mask.shape == (H, W) and mask[360, 630] and not mask[105, 1005]
+
+
+def test_level_kernels_are_built_once_and_follow_morph_kernel():
+    det = _det(morph_kernel=9)
+    det.detect(_scene(), level=2)
+    k2 = det._level_kernels[2]
+    det.detect(_scene(), level=2)
+    assert det._level_kernels[2] is k2 and k2.shape == (2, 2)
+    det.cfg.morph_kernel = 17
+    det.update_kernel()
+    assert list(det._level_kernels) == [0]
+    assert det._level_kernel(2).shape == (4, 4)
+
+
+def test_nearby_candidates_merge_into_one_window():
+    assert _merge_windows([(0, 0, 50, 50), (40, 40, 90, 90), (200, 200, 220, 220)],
+                          300, 300) == [(0, 0, 90, 90), (200, 200, 220, 220)]
+    assert _merge_windows([(-20, -20, 10, 10), (400, 0, 420, 20)], 300, 300) == [(0, 0, 10, 10)]
+
+
+def test_grown_window_absorbs_one_neither_member_touched():
+    # (0,0,50,10) and (40,0,50,60) union to (0,0,50,60), which now meets
+    # (0,40,20,60) — a second pass merges it
+    assert _merge_windows([(0, 0, 50, 10), (40, 0, 50, 60), (0, 40, 20, 60)],
+                          300, 300) == [(0, 0, 50, 60)]
+
+
+def test_many_windows_merge_to_disjoint_groups():
+    rng = np.random.default_rng(3)
+    xy = rng.integers(0, 1200, size=(400, 2))
+    out = _merge_windows([(x, y, x + 40, y + 40) for x, y in xy], 1280, 1280)
+    for i, a in enumerate(out):
+        for b in out[i + 1:]:
+            assert not (a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3])
+    covered = np.zeros((1280, 1280), bool)
+    for x1, y1, x2, y2 in out:
+        covered[y1:y2, x1:x2] = True
+    assert all(covered[y:y + 40, x:x + 40].all() for x, y in xy)
+
+
+def test_empty_scene_at_level():
+    blobs, mask = _det().detect(np.full((H, W, 3), TEAL, np.uint8), level=2)
+    assert blobs == [] and not mask.any()
+
+
+def test_level_from_zoom_table():
+    table = [[0, 0], [8000, 1], [12000, 2]]
+    assert pyramid_level(table, 0) == 0
+    assert pyramid_level(table, 9000) == 1
+    assert pyramid_level(table, 16384) == 2
+    assert pyramid_level(table, None) == 0
+    assert pyramid_level([], 16384) == 0
+
+
+def test_invalid_table_resets(tmp_path, capsys):
+    p = tmp_path / "c.yaml"
+    p.write_text("color:\n  pyramid_zoom: [[0, 9]]\n")
+    assert load_config(str(p)).color.pyramid_zoom == []
+    assert "INVALID color.pyramid_zoom" in capsys.readouterr().out
+    p.write_text("color:\n  pyramid_zoom: [[0, 0], [9000, 2]]\n")
+    assert load_config(str(p)).color.pyramid_zoom == [[0, 0], [9000, 2]]
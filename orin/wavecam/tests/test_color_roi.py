@@ -0,0 +1,75 @@
+"""user-012: ROI-first color detection around the tracked target."""
+from __future__ import annotations
+
+import types
+
+import cv2
+import numpy as np
+import pytest
+
+from wavecam.color_detector import ColorDetector
+from wavecam.color_roi import ColorRoi
+from wavecam.control_snapshots import build_tracking
+from wavecam.fusion import FusionResult
+
+W, H = 1280, 720
+ORANGE = (0, 165, 255)
+
+
+def _roi(**kw):
+    base = dict(roi_tracking=True, roi_scale=3.0, roi_motion_gain=2.0,
+                roi_min_px=160, roi_sweep_every=10)
+    base.update(kw)
+    return ColorRoi(types.SimpleNamespace(**base))
+
+
+def _fr(bbox, state="TRACKING"):
+    return FusionResult(target_xy=(0.0, 0.0), bbox=bbox, state=state, locked=True)
+
+
+def _det(**kw):
+    base = dict(preset="orange_red", hsv_ranges={}, morph_kernel=5, min_area=60,
+                max_area=200000)
+    base.update(kw)
+    return ColorDetector(types.SimpleNamespace(**base))
+
+
+def test_window_sized_from_bbox_and_led_by_motion():
+    r = _roi()
+    assert r.plan(_fr((600, 300, 40, 80)), W, H) == (500, 220, 740, 460)   # 3 x 80 px
+    win = r.plan(_fr((630, 300, 40, 80)), W, H)                            # moved +30 px
+    assert win == (500, 160, 860, 520)                                     # led + widened
+    assert r.window == win
+
+
+def test_full_frame_when_not_tracking_and_on_periodic_sweeps():
+    r = _roi(roi_sweep_every=3)
+    assert r.plan(None, W, H) is None
+    assert r.plan(_fr((600, 300, 40, 80), state="COASTING"), W, H) is None
+    plans = [r.plan(_fr((600, 300, 40, 80)), W, H) for _ in range(6)]
+    assert [p is None for p in plans] == [False, False, True, False, False, True]
+    assert _roi(roi_tracking=False).plan(_fr((600, 300, 40, 80)), W, H) is None
+
+
+def test_min_size_and_frame_clamp():
+    r = _roi()
+    assert r.plan(_fr((0, 0, 10, 10)), W, H) == (0, 0, 85, 85)
+
+
+@pytest.mark.parametrize("kw", [{}, {"segmentation": "lut"}, {"connected_components": True}])
+def test_roi_blobs_are_in_full_frame_coords(kw):
+    f = np.zeros((H, W, 3), np.uint8)
+    cv2.rectangle(f, (600, 300), (640, 380), ORANGE, -1)
+    cv2.rectangle(f, (100, 100), (140, 180), ORANGE, -1)       # outside the window
+    full, _ = _det(**kw).detect(f)
+    det = _det(**kw)
+    roi_blobs, mask = det.detect(f, roi=(500, 220, 740, 460))
+    assert [b.bbox for b in roi_blobs] == [b.bbox for b in full if b.bbox[0] > 500]
+    assert mask.shape == (H, W) and not mask[:220].any() and mask[340, 620]
+    blobs, mask = det.detect(f)                                # back to full frame
+    assert len(blobs) == 2 and mask[140, 120]
+
+
+def test_status_exposes_window():
+    assert build_tracking({"color_roi": (1, 2, 3, 4)})["color_roi"] == (1, 2, 3, 4)
+    assert build_tracking({})["color_roi"] is None
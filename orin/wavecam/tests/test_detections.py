@@ -0,0 +1,107 @@
+"""user-016: array-backed detection batches and their dataclass compatibility view."""
+from __future__ import annotations
+
+import random
+import types
+
+import cv2
+import numpy as np
+
+from wavecam.box_tracker import BoxTracker
+from wavecam.color_detector import ColorDetector, component_blobs
+from wavecam.detections import Blob, BlobBatch, BoxBatch, PersonBox, blob_rects, box_rows
+from wavecam.detector import offset_boxes
+from wavecam.fusion import Fusion
+
+
+def _legacy_contour_blobs(mask, min_area, max_area):
+    """The per-contour Blob loop color_detector ran before user-016."""
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    blobs = []
+    for c in contours:
+        area = cv2.contourArea(c)
+        if area < min_area or area > max_area:
+            continue
+        x, y, bw, bh = cv2.boundingRect(c)
+        fill = round(area / float(bw * bh), 3) if bw * bh else 0.0
+        blobs.append(Blob(x + bw / 2.0, y + bh / 2.0, area, (x, y, bw, bh), fill))
+    blobs.sort(key=lambda b: b.area, reverse=True)
+    return blobs
+
+
+def _speckle(seed=0, n=80):
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((360, 640), np.uint8)
+    for _ in range(n):
+        x, y = int(rng.integers(0, 620)), int(rng.integers(0, 340))
+        cv2.ellipse(mask, (x, y), (int(rng.integers(2, 20)), int(rng.integers(2, 15))),
+                    float(rng.integers(0, 180)), 0, 360, 255, -1)
+    return mask
+
+
+def test_box_batch_views_match_personbox():
+    b = BoxBatch.from_arrays(np.array([[10.5, 20, 50.25, 80]]), np.array([0.5]), np.array([7]))
+    (p,) = b
+    assert p == PersonBox(10.5, 20.0, 50.25, 80.0, 0.5, track_id=7)
+    assert b.xywh().tolist() == [list(p.xywh)]
+    assert b.centers().tolist() == [list(p.center)]
+    assert BoxBatch.from_arrays(np.zeros((1, 4)), np.ones(1))[0].track_id is None
+    assert BoxBatch() == [] and not BoxBatch()
+
+
+def test_offset_batch_is_one_array_op():
+    b = BoxBatch.from_arrays(np.array([[10, 20, 50, 80], [0, 0, 4, 4]]), np.array([0.5, 0.25]))
+    out = offset_boxes(b, 100, 200)
+    assert isinstance(out, BoxBatch)
+    assert out == offset_boxes(list(b), 100, 200)
+    assert b.xyxy[0].tolist() == [10, 20, 50, 80]           # source untouched
+
+
+def test_contour_blobs_equal_the_legacy_loop():
+    mask = _speckle()
+    det = ColorDetector(types.SimpleNamespace(hsv_ranges={"a_low": [0, 0, 0],
+                                                          "a_high": [1, 1, 1]},
+                                              morph_kernel=1, min_area=20, max_area=5000))
+    got = det._blobs(mask.copy(), det._buffers(np.zeros((360, 640, 3), np.uint8)),
+                     0, 0, 20, 5000)
+    assert isinstance(got, BlobBatch)
+    assert got == _legacy_contour_blobs(mask, 20, 5000)
+
+
+def test_component_blobs_are_a_batch_with_derived_fill():
+    mask = _speckle(1)
+    blobs = component_blobs(mask, 10, 1e9)
+    assert isinstance(blobs, BlobBatch)
+    assert list(blobs.area) == sorted(blobs.area, reverse=True)
+    b = blobs[0]
+    assert b.fill == round(b.area / (b.bbox[2] * b.bbox[3]), 3)
+    assert blob_rects(blobs) == [tuple(x.bbox) for x in blobs]
+
+
+def test_fusion_agrees_for_batch_and_list_inputs():
+    cfg = types.SimpleNamespace(lock_threshold=0.6, unlock_threshold=0.35,
+                                require_person=False, match_dist=120, match_dist_scale=False,
+                                person_aim_x=0.5, person_aim_y=0.3, ema_alpha=0.5,
+                                lost_grace_sec=0.8, gps_boost=0.2)
+    rng = random.Random(5)
+    as_list, as_batch = Fusion(cfg), Fusion(cfg)
+    for _ in range(60):
+        nb, np_ = rng.randint(0, 12), rng.randint(0, 5)
+        blobs = BlobBatch.from_rects(
+            [rng.randint(60, 900) for _ in range(nb)],
+            [[rng.randint(0, 1200), rng.randint(0, 650), rng.randint(4, 40), rng.randint(4, 40)]
+             for _ in range(nb)])
+        xy = [(rng.randint(0, 1200), rng.randint(0, 500)) for _ in range(np_)]
+        persons = BoxBatch.from_arrays(
+            [[x, y, x + rng.randint(20, 80), y + rng.randint(40, 300)] for x, y in xy],
+            [rng.choice([0.25, 0.5, 0.75]) for _ in range(np_)],
+            [rng.randint(1, 3) for _ in range(np_)])
+        assert as_list.update(list(blobs), list(persons)) == as_batch.update(blobs, persons)
+
+
+def test_tracker_and_overlay_take_batches():
+    tr = BoxTracker()
+    out = tr.update(BoxBatch.from_arrays(np.array([[10, 10, 50, 90]]), np.array([0.75])), 0.0)
+    assert isinstance(out, BoxBatch) and out[0].track_id == 1
+    assert box_rows(out) == [(10, 10, 40, 80, 0.75)]
+    assert box_rows([PersonBox(10, 10, 50, 90, 0.75)]) == [(10, 10, 40, 80, 0.75)]
@@ -0,0 +1,208 @@
+"""user-017: batched multi-ROI detection — crop planning, cross-crop NMS and
+the batched backends. user-019: color-blob proposal crops."""
+from __future__ import annotations
+
+import types
+
+import numpy as np
+
+from wavecam.config import load_config
+from wavecam.detections import BlobBatch, BoxBatch
+from wavecam.detector_crops import (blob_crops, detect_crops, merge_boxes, plan_crops,
+                                    target_crop)
+from wavecam.detector_onnx import OnnxPersonDetector
+from wavecam.detector_worker import DetectorWorker
+from wavecam.fusion import Fusion
+from wavecam.pipeline import Pipeline
+
+W, H = 1280, 720
+
+
+class _Session:
+    """Scripted InferenceSession (as in test_detector_onnx) with a settable
+    batch axis."""
+
+    def __init__(self, out, shape=(1, 3, 64, 64)):
+        self.out, self.shape, self.fed = out, shape, None
+
+    def get_inputs(self):
+        return [types.SimpleNamespace(name="images", shape=list(self.shape))]
+
+    def get_outputs(self):
+        return [types.SimpleNamespace(name="output0")]
+
+    def run(self, names, feeds):
+        self.fed = feeds["images"].copy()
+        return [self.out]
+
+
+def _cfg():
+    return types.SimpleNamespace(model="m.onnx", imgsz=64, conf=0.5, person_class=0,
+                                 tracker=None, backend="onnx")
+
+
+def _boxes(*rows):
+    return BoxBatch.from_arrays(np.array([r[:4] for r in rows], float).reshape(-1, 4),
+                                np.array([r[4] for r in rows], float))
+
+
+def test_target_crop_is_a_clamped_square():
+    assert target_crop((600, 300, 20, 60), W, H, 4.0, 256) == (482, 202, 738, 458)
+    assert target_crop((0, 0, 10, 10), W, H, 4.0, 256) == (0, 0, 256, 256)
+    assert target_crop((1270, 700, 10, 20), W, H, 4.0, 256) == (1024, 464, 1280, 720)
+    assert target_crop((600, 300, 400, 400), W, H, 4.0, 256) == (440, 0, 1160, 720)
+
+
+def test_plan_orders_gps_target_full_and_dedups():
+    gps = (100, 100, 420, 420)
+    assert plan_crops(W, H, gps, (600, 300, 20, 60), 4.0, 256) == \
+        [gps, (482, 202, 738, 458), None]
+    assert plan_crops(W, H, None, None, 4.0, 256) == [None]
+    assert plan_crops(W, H, (482, 202, 738, 458), (600, 300, 20, 60), 4.0, 256) == \
+        [(482, 202, 738, 458), None]
+
+
+def test_cross_crop_nms_keeps_the_stronger_duplicate():
+    crop_view = _boxes((600, 300, 620, 360, 0.8))
+    full_view = _boxes((601, 302, 621, 361, 0.4), (100, 100, 140, 200, 0.6))
+    merged = merge_boxes([crop_view, full_view], 0.5)
+    assert [round(b.conf, 2) for b in merged] == [0.8, 0.6]
+    assert merge_boxes([], 0.5) == []
+
+
+def test_detect_crops_offsets_each_crop_and_batches_once():
+    frame = np.zeros((H, W, 3), np.uint8)
+    calls = []
+
+    def batch(images):
+        calls.append([im.shape[:2] for im in images])
+        return [_boxes((10, 20, 30, 80, 0.9)), _boxes((610, 320, 630, 380, 0.5))]
+
+    out = detect_crops(None, frame, [(600, 300, 856, 556), None], 0.5, batch)
+    assert calls == [[(256, 256), (720, 1280)]]
+    assert [(b.x1, b.y1, b.x2, b.y2) for b in out] == [(610.0, 320.0, 630.0, 380.0)]
+    seq = detect_crops(lambda im: _boxes((10, 20, 30, 80, 0.9)), frame,
+                       [(600, 300, 856, 556), None], 0.5)
+    assert [(b.x1, b.y1) for b in seq] == [(610.0, 320.0), (10.0, 20.0)]
+
+
+def test_onnx_detect_batch_runs_once_with_a_dynamic_batch_axis():
+    out = np.zeros((2, 5, 1), np.float32)
+    out[0, :, 0] = [32, 32, 16, 8, 0.9]
+    out[1, :, 0] = [16, 16, 8, 8, 0.8]
+    sess = _Session(out, shape=("batch", 3, 64, 64))
+    det = OnnxPersonDetector(_cfg(), session=sess)
+    a, b = det.detect_batch([np.zeros((32, 64, 3), np.uint8), np.zeros((64, 64, 3), np.uint8)])
+    assert sess.fed.shape == (2, 3, 64, 64)
+    assert [(p.x1, p.y1, p.x2, p.y2) for p in a] == [(24.0, 12.0, 40.0, 20.0)]
+    assert [(p.x1, p.y1, p.x2, p.y2) for p in b] == [(12.0, 12.0, 20.0, 20.0)]
+
+
+def test_onnx_static_export_detects_crops_in_turn():
+    out = np.zeros((1, 5, 1), np.float32)
+    out[0, :, 0] = [32, 32, 16, 8, 0.9]
+    sess = _Session(out)
+    det = OnnxPersonDetector(_cfg(), session=sess)
+    res = det.detect_batch([np.zeros((64, 64, 3), np.uint8)] * 3)
+    assert len(res) == 3 and sess.fed.shape == (1, 3, 64, 64)
+
+
+def test_worker_runs_a_crop_list_through_detect_batch():
+    lease = types.SimpleNamespace(image=np.zeros((H, W, 3), np.uint8), seq=1, t=1.0,
+                                  release=lambda: None)
+    batches = []
+
+    def batch(images):
+        batches.append(len(images))
+        return [_boxes((1, 2, 3, 4, 0.9)) for _ in images]
+
+    w = DetectorWorker(lambda im: BoxBatch(), detect_batch=batch)
+    w._infer(lease, [(100, 100, 356, 356), None])
+    assert batches == [2]
+    assert [(b.x1, b.y1) for b in w.latest().boxes] == [(101.0, 102.0), (1.0, 2.0)]
+
+
+def test_pipeline_plans_crops_only_with_the_flag_and_a_target():
+    p = Pipeline.__new__(Pipeline)
+    p.cfg = types.SimpleNamespace(detector=types.SimpleNamespace(
+        multi_crop=False, crop_scale=4.0, crop_min_px=256))
+    tracking = types.SimpleNamespace(state="TRACKING", bbox=(600, 300, 20, 60))
+    assert p._detector_crops(None, tracking, W, H) is None
+    p.cfg.detector.multi_crop = True
+    assert p._detector_crops(None, tracking, W, H) == [(482, 202, 738, 458), None]
+    assert p._detector_crops(None, types.SimpleNamespace(state="SEARCHING", bbox=None),
+                             W, H) is None
+    assert p._detector_crops((0, 0, 320, 320), None, W, H) == [(0, 0, 320, 320), None]
+
+
+def _blobs():
+    return BlobBatch.from_rects([100, 400, 50],
+                                [[100, 100, 10, 20], [600, 300, 20, 30], [1000, 50, 8, 8]])
+
+
+def test_blob_crops_take_the_largest_k_blobs_at_person_scale():
+    assert blob_crops(_blobs(), W, H, 2, 6.0, 128) == [(520, 225, 700, 405),
+                                                         (41, 46, 169, 174)]
+    assert blob_crops(list(_blobs()), W, H, 1, 6.0, 128) == [(520, 225, 700, 405)]
+    assert blob_crops(BlobBatch(), W, H, 3, 6.0, 128) == []
+
+
+def test_proposal_boxes_confirm_the_blob_in_fusion():
+    frame = np.zeros((H, W, 3), np.uint8)
+    blobs = _blobs()[:1]
+    crops = blob_crops(blobs, W, H, 3, 6.0, 128)
+    shapes = []
+
+    def batch(images):
+        shapes.extend(im.shape[:2] for im in images)
+        return [_boxes((80, 10, 100, 150, 0.9))]          # person around the vest
+
+    persons = detect_crops(None, frame, crops, 0.5, batch)
+    assert shapes == [(180, 180)]
+    cfg = types.SimpleNamespace(lock_threshold=0.6, unlock_threshold=0.35,
+                                require_person=False, match_dist=120, person_aim_x=0.5,
+                                person_aim_y=0.3, ema_alpha=0.5, lost_grace_sec=0.8,
+                                gps_boost=0.2)
+    fr = Fusion(cfg).update(blobs, persons)
+    assert fr.matched and fr.state == "TRACKING"
+
+
+def test_pipeline_proposes_only_with_the_flag_and_blobs():
+    p = Pipeline.__new__(Pipeline)
+    p.cfg = types.SimpleNamespace(detector=types.SimpleNamespace(
+        proposals=False, proposal_k=3, proposal_scale=6.0, proposal_min_px=128,
+        proposal_full_every=3))
+    assert p._proposal_crops(_blobs(), W, H) is None
+    p.cfg.detector.proposals = True
+    assert p._proposal_crops([], W, H) is None
+    assert len(p._proposal_crops(_blobs(), W, H)) == 3
+
+
+def test_proposals_keep_the_gps_roi_and_a_periodic_full_frame():
+    p = Pipeline.__new__(Pipeline)
+    p.cfg = types.SimpleNamespace(detector=types.SimpleNamespace(
+        proposals=True, proposal_k=3, proposal_scale=6.0, proposal_min_px=128,
+        proposal_full_every=3))
+    roi = (400, 100, 880, 460)
+    runs = [p._proposal_crops(_blobs(), W, H, roi) for _ in range(6)]
+    assert all(r[3] == roi for r in runs)
+    assert [None in r for r in runs] == [False, False, True, False, False, True]
+
+
+def test_invalid_proposal_settings_reset(tmp_path, capsys):
+    path = tmp_path / "c.yaml"
+    path.write_text("detector:\n  proposal_k: 0\n  proposal_full_every: 0\n")
+    cfg = load_config(str(path))
+    assert (cfg.detector.proposal_k, cfg.detector.proposal_full_every) == (3, 4)
+    out = capsys.readouterr().out
+    assert "INVALID detector.proposal_full_every" in out
+
+
+def test_crop_modes_with_a_tracker_enable_the_box_tracker(tmp_path, capsys):
+    path = tmp_path / "c.yaml"
+    path.write_text("detector: {multi_crop: true, tracker: bytetrack.yaml}\n")
+    cfg = load_config(str(path))
+    assert cfg.detector.box_tracker is True
+    assert "enabling detector.box_tracker" in capsys.readouterr().out
+    path.write_text("detector: {multi_crop: true}\n")
+    assert load_config(str(path)).detector.box_tracker is False
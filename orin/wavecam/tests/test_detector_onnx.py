@@ -0,0 +1,119 @@
+"""user-006: ONNX Runtime detector backend — pre/post-processing is pure NumPy
+and runs here against a scripted session (onnxruntime itself is optional)."""
+from __future__ import annotations
+
+import types
+
+import numpy as np
+import pytest
+
+import wavecam.detector_onnx as onnx_mod
+from wavecam.config import load_config
+from wavecam.detector import PersonDetector, make_detector
+from wavecam.detector_onnx import Letterbox, OnnxPersonDetector, decode_output, nms
+
+
+class _Session:
+    """Scripted InferenceSession: records the input tensor, returns `out`."""
+
+    def __init__(self, out, shape=(1, 3, 64, 64)):
+        self.out = out
+        self.shape = shape
+        self.fed = None
+
+    def get_inputs(self):
+        return [types.SimpleNamespace(name="images", shape=list(self.shape))]
+
+    def get_outputs(self):
+        return [types.SimpleNamespace(name="output0")]
+
+    def run(self, names, feeds):
+        assert names == ["output0"]
+        self.fed = feeds["images"].copy()
+        return [self.out]
+
+
+def _cfg(**kw):
+    base = dict(model="m.onnx", imgsz=64, conf=0.5, person_class=0, tracker=None,
+                backend="onnx")
+    base.update(kw)
+    return types.SimpleNamespace(**base)
+
+
+def test_nms_keeps_highest_and_drops_overlaps():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [20, 20, 30, 30]], np.float32)
+    keep = nms(boxes, np.array([0.6, 0.9, 0.5], np.float32), iou=0.5)
+    assert keep.tolist() == [1, 2]
+    assert nms(np.empty((0, 4)), np.empty(0)).size == 0
+
+
+def test_letterbox_pads_and_normalizes_in_place():
+    lb = Letterbox(64)
+    buf = lb.input
+    frame = np.zeros((32, 64, 3), np.uint8)
+    frame[..., 2] = 255                              # pure red in BGR
+    r, px, py = lb.fill(frame)
+    assert (r, px, py) == (1.0, 0, 16)
+    assert lb.input is buf                           # preallocated, reused
+    assert np.allclose(lb.input[0, :, 30, 30], [1.0, 0.0, 0.0])   # RGB order
+    assert np.allclose(lb.input[0, :, 5, 5], 114 / 255.0)          # pad band
+
+
+def test_decode_raw_layout_filters_class_and_conf_then_nms():
+    # (4 + nc, N) with nc=2: two overlapping persons, one weak, one other-class
+    out = np.zeros((1, 6, 4), np.float32)
+    out[0, :4, 0] = [20, 20, 10, 10]; out[0, 4, 0] = 0.9
+    out[0, :4, 1] = [21, 21, 10, 10]; out[0, 4, 1] = 0.8     # suppressed by 0
+    out[0, :4, 2] = [50, 50, 10, 10]; out[0, 4, 2] = 0.3     # below conf
+    out[0, :4, 3] = [40, 40, 10, 10]; out[0, 5, 3] = 0.95    # class 1
+    boxes, scores = decode_output(out, person_class=0, conf=0.5)
+    assert boxes.tolist() == [[15, 15, 25, 25]] and scores.tolist() == [pytest.approx(0.9)]
+
+
+def test_decode_end2end_layout():
+    out = np.zeros((1, 300, 6), np.float32)
+    out[0, 0] = [1, 2, 3, 4, 0.9, 0]
+    out[0, 1] = [5, 6, 7, 8, 0.9, 2]
+    boxes, scores = decode_output(out, person_class=0, conf=0.5)
+    assert boxes.tolist() == [[1, 2, 3, 4]]
+
+
+def test_detect_maps_boxes_back_to_frame_pixels():
+    out = np.zeros((1, 5, 1), np.float32)
+    out[0, :, 0] = [32, 32, 16, 8, 0.9]            # letterbox px
+    det = OnnxPersonDetector(_cfg(), session=_Session(out))
+    (b,) = det.detect(np.zeros((32, 64, 3), np.uint8))   # scale 1, pad_y 16
+    assert (b.x1, b.y1, b.x2, b.y2) == (24.0, 12.0, 40.0, 20.0)
+    assert b.conf == pytest.approx(0.9) and b.track_id is None
+    assert det.session.fed.shape == (1, 3, 64, 64)
+
+
+def test_static_export_size_overrides_cfg_imgsz():
+    det = OnnxPersonDetector(_cfg(imgsz=640), session=_Session(np.zeros((1, 5, 0)),
+                                                              shape=(1, 3, 320, 320)))
+    assert det._lb.imgsz == 320
+    dyn = OnnxPersonDetector(_cfg(imgsz=480), session=_Session(np.zeros((1, 5, 0)),
+                                                              shape=(1, 3, "h", "w")))
+    assert dyn._lb.imgsz == 480
+
+
+def test_make_detector_dispatches_on_backend(monkeypatch):
+    built = []
+    monkeypatch.setattr(onnx_mod.OnnxPersonDetector, "__init__",
+                        lambda self, cfg: built.append(cfg.backend))
+    assert isinstance(make_detector(_cfg(backend="tensorrt")), OnnxPersonDetector)
+    assert built == ["tensorrt"]
+    monkeypatch.setattr(PersonDetector, "__init__", lambda self, cfg: None)
+    assert isinstance(make_detector(_cfg(backend="ultralytics")), PersonDetector)
+
+
+def test_invalid_backend_resets_to_ultralytics(tmp_path, capsys):
+    p = tmp_path / "c.yaml"
+    p.write_text("detector:\n  backend: openvino\n")
+    assert load_config(str(p)).detector.backend == "ultralytics"
+    assert "INVALID detector.backend" in capsys.readouterr().out
+
+
+def test_missing_onnx_model_fails_fast():
+    with pytest.raises(FileNotFoundError):
+        OnnxPersonDetector(_cfg(model="/nonexistent/model.onnx"))
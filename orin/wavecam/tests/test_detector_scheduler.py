@@ -0,0 +1,113 @@
+"""user-007: adaptive detector scheduling. user-020: scene-motion gate."""
+from __future__ import annotations
+
+import types
+
+import numpy as np
+import pytest
+
+from wavecam.config import load_config
+from wavecam.control_snapshots import build_tracking
+from wavecam.detector_scheduler import DetectorScheduler, MotionGate
+
+
+def _sched(**kw):
+    base = dict(every_n=3, schedule="adaptive", budget_frac=0.5,
+                tracking_interval_sec=0.15, locked_interval_sec=0.5)
+    base.update(kw)
+    return DetectorScheduler(types.SimpleNamespace(**base))
+
+
+def _runs(s, times, **state):
+    return [t for i, t in enumerate(times, 1) if s.should_run(t, i, **state)]
+
+
+FRAMES = [i / 35.0 for i in range(1, 71)]          # 2 s at 35 fps
+
+
+def test_fixed_schedule_is_every_n():
+    s = _sched(schedule="fixed")
+    assert [i for i in range(1, 10) if s.should_run(0.0, i)] == [3, 6, 9]
+    assert s.reason == "fixed"
+
+
+def test_searching_coasting_and_gps_handoff_run_every_frame():
+    for state in (dict(state="SEARCHING"), dict(state="COASTING"),
+                  dict(state="TRACKING", matched=True, owner="gps_tracker")):
+        s = _sched()
+        assert len(_runs(s, FRAMES, **state)) == len(FRAMES)
+    assert s.reason == "gps_handoff"
+
+
+def test_matched_still_lock_backs_off_to_locked_interval():
+    s = _sched()
+    runs = _runs(s, FRAMES, state="TRACKING", matched=True)
+    assert s.reason == "locked"
+    assert 4 <= len(runs) <= 5                         # ~2 Hz over 2 s
+    assert s.rate_hz(FRAMES[-1]) == pytest.approx(2.0, rel=0.2)
+
+
+def test_motion_or_mismatch_uses_tracking_interval():
+    for kw, reason in ((dict(moving=True, matched=True), "moving"),
+                       (dict(matched=False), "unmatched")):
+        s = _sched()
+        runs = _runs(s, FRAMES, state="TRACKING", **kw)
+        assert s.reason == reason
+        assert 11 <= len(runs) <= 14                   # ~6.7 Hz
+
+
+def test_budget_caps_rate_from_measured_latency():
+    s = _sched(budget_frac=0.25)
+    s.observe_latency(0.02)                            # 20 ms / 0.25 -> 80 ms spacing
+    runs = _runs(s, FRAMES, state="SEARCHING")
+    assert s.budget_interval() == pytest.approx(0.08)
+    assert s.reason == "searching/budget"
+    assert 20 <= len(runs) <= 25
+
+
+def test_rate_decays_once_runs_stop():
+    s = _sched()
+    _runs(s, FRAMES, state="SEARCHING")
+    assert s.rate_hz(FRAMES[-1]) == pytest.approx(35.0, rel=0.05)
+    assert s.rate_hz(FRAMES[-1] + 1.0) == pytest.approx(1.0)
+
+
+def test_status_exposes_rate_and_reason():
+    t = build_tracking({"det_hz": 6.7, "det_reason": "moving"})
+    assert (t["detector_hz"], t["detector_reason"]) == (6.7, "moving")
+
+
+def test_invalid_schedule_resets_to_fixed(tmp_path, capsys):
+    p = tmp_path / "c.yaml"
+    p.write_text("detector:\n  schedule: sometimes\n")
+    assert load_config(str(p)).detector.schedule == "fixed"
+    assert "INVALID detector.schedule" in capsys.readouterr().out
+
+
+def test_static_searching_scene_drops_to_the_minimum_rate():
+    for schedule in ("fixed", "adaptive"):
+        s = _sched(schedule=schedule, motion_min_hz=1.0)
+        runs = _runs(s, FRAMES, state="SEARCHING", static=True)
+        assert len(runs) == 2 and runs[1] - runs[0] >= 1.0   # 1 Hz over 2 s
+    assert s.reason == "static"
+
+
+def test_static_gate_never_skips_tracking_moving_or_handoff():
+    for state in (dict(state="TRACKING", matched=False), dict(moving=True),
+                  dict(owner="gps_tracker")):
+        gated, plain = _sched(), _sched()
+        assert _runs(gated, FRAMES, static=True, **state) == _runs(plain, FRAMES, **state)
+
+
+def test_motion_gate_measures_change_since_the_last_inference():
+    gate = MotionGate(threshold=2.0)
+    sea = np.random.default_rng(0).integers(0, 255, (360, 640, 3), dtype=np.uint8)
+    gate.update(sea)
+    assert not gate.static                              # no reference yet
+    gate.mark()
+    assert gate.update(sea.copy()) == 0.0 and gate.static
+    walker = sea.copy()
+    for x in range(0, 200, 20):                         # slow entry, 20 px / frame
+        walker[100:300, x:x + 20] = 255
+        gate.update(walker)
+    assert not gate.static                              # accumulated vs the marked frame
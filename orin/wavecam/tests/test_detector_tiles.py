@@ -0,0 +1,151 @@
+"""user-018: tiled far-subject sweep — tile grid, round-robin, stitching and
+the range-gated activation."""
+from __future__ import annotations
+
+import types
+
+import numpy as np
+
+from wavecam.config import load_config
+from wavecam.detections import BoxBatch
+from wavecam.detector_crops import TileSweep, tile_grid
+from wavecam.detector_worker import DetectorWorker
+from wavecam.pipeline import Pipeline
+
+
+def _boxes(*rows):
+    return BoxBatch.from_arrays(np.array([r[:4] for r in rows], float).reshape(-1, 4),
+                                np.array([r[4] for r in rows], float))
+
+
+def test_tile_grid_overlaps_and_covers_the_frame():
+    grid = tile_grid(640, 360, 320, 0.25)
+    assert grid == [(0, 0, 320, 320), (240, 0, 560, 320), (320, 0, 640, 320),
+                    (0, 40, 320, 360), (240, 40, 560, 360), (320, 40, 640, 360)]
+    cover = np.zeros((360, 640), bool)
+    for x1, y1, x2, y2 in grid:
+        cover[y1:y2, x1:x2] = True
+    assert cover.all()
+    assert tile_grid(200, 100, 320, 0.25) == [(0, 0, 100, 100), (75, 0, 175, 100),
+                                              (100, 0, 200, 100)]
+
+
+def test_sweep_round_robins_tiles_per_run():
+    sweep = TileSweep(320, 0.25, per_run=4)
+    seen = [sweep.next(640, 360) for _ in range(3)]
+    assert [len(s) for s in seen] == [4, 4, 4]
+    assert seen[1][:2] == tile_grid(640, 360, 320, 0.25)[4:]
+    assert seen[1][2:] == seen[0][:2]                       # wrapped around
+
+
+def test_stitch_keeps_recent_tiles_and_suppresses_overlap_duplicates():
+    sweep = TileSweep(max_age_sec=0.5, iou=0.5)
+    sweep.stitch(_boxes((300, 100, 310, 130, 0.6)), 0.0)
+    out = sweep.stitch(_boxes((301, 101, 311, 131, 0.8), (10, 10, 20, 40, 0.5)), 0.2)
+    assert [round(b.conf, 2) for b in out] == [0.8, 0.5]
+    out = sweep.stitch(BoxBatch(), 0.9)                     # first two aged out
+    assert out == []
+
+
+def _pipe(dist_m, person_bbox=None):
+    p = Pipeline.__new__(Pipeline)
+    p.cfg = types.SimpleNamespace(
+        detector=types.SimpleNamespace(tiling=True, tile_px=320, tile_overlap=0.25,
+                                       tiles_per_run=2, tile_range_m=150.0,
+                                       tile_max_age_sec=0.5, crop_nms_iou=0.5,
+                                       crop_scale=4.0),
+        gps=types.SimpleNamespace(drive_stale_sec=8.0))
+    p.estimator = types.SimpleNamespace(
+        predict_output=lambda now: None if dist_m is None
+        else types.SimpleNamespace(dist_m=dist_m))
+    p.gps = None
+    return p, types.SimpleNamespace(has_person=person_bbox is not None,
+                                    person_bbox=person_bbox)
+
+
+def test_tiling_activates_only_far():
+    p, fr = _pipe(250.0)
+    assert p._tile_crops(fr, 640, 360, 0.0) == [(0, 0, 320, 320), (240, 0, 560, 320)]
+    assert p._tiling and not p._tile_focus
+    p, fr = _pipe(80.0)
+    assert p._tile_crops(fr, 640, 360, 0.0) is None
+    p, fr = _pipe(None)
+    assert p._tile_crops(fr, 640, 360, 0.0) is None and not p._tiling
+    p.cfg.detector.tiling = False
+    p.estimator = types.SimpleNamespace(predict_output=lambda now: 1 / 0)
+    assert p._tile_crops(fr, 640, 360, 0.0) is None          # flag off: never asks
+
+
+def test_found_subject_keeps_a_crop_instead_of_the_full_frame():
+    p, fr = _pipe(250.0)
+    tiles = p._tile_crops(fr, 1280, 720, 0.0)
+    fr.has_person, fr.person_bbox = True, (500, 100, 12, 30)     # seen in a tile
+    assert p._tile_crops(fr, 1280, 720, 0.1) == [(346, 0, 666, 320)]
+    assert p._tiling and p._tile_focus
+    fr.has_person, fr.person_bbox = False, None                  # lost: sweep resumes
+    assert p._tile_crops(fr, 1280, 720, 0.2) == tile_grid(1280, 720, 320, 0.25)[2:4]
+    assert tiles == tile_grid(1280, 720, 320, 0.25)[:2]
+
+
+def test_only_sweep_runs_are_stitched():
+    p, _ = _pipe(250.0)
+    p._tile_sweep = TileSweep(max_age_sec=0.5)
+    p._tile_sweep.stitch(_boxes((300, 100, 310, 130, 0.6)), 0.0)
+    full = _boxes((10, 10, 20, 40, 0.5))
+    assert p._stitch_tiles(full, 0.1, tiled=False) is full        # e.g. submitted before
+    assert len(p._stitch_tiles(full, 0.1, tiled=True)) == 2       # the mode flipped
+
+
+def test_earlier_tiles_are_dropped_past_one_sweep_or_an_unknown_move():
+    sweep = TileSweep(320, 0.25, per_run=2, max_age_sec=5.0)
+    sweep.next(640, 360)                                    # 6 tiles: 3 runs a sweep
+    for i in range(4):
+        out = sweep.stitch(_boxes((100 * i, 0, 100 * i + 10, 30, 0.6)), 0.1 * i)
+    assert sorted(b.x1 for b in out) == [100, 200, 300]     # the first run is superseded
+    out = sweep.stitch(_boxes((500, 0, 510, 30, 0.6)), 0.5, pose=(100, 0, 0))
+    assert [b.x1 for b in out] == [500]                     # moved, no way to map them
+
+
+def test_sweep_tiles_are_moved_into_the_current_image():
+    p, _ = _pipe(250.0)
+    p.cfg.ptz = types.SimpleNamespace(enabled=True)
+    p.cfg.detector.motion_comp_half_life_sec = 0.3
+    p._store = types.SimpleNamespace(fov_curve=[(0, 64.0), (16384, 32.0)])   # 10 px/deg
+    p.pose = types.SimpleNamespace(pan_enc_per_deg=10.0, tilt_enc_per_deg=10.0)
+    p._tile_sweep = TileSweep(max_age_sec=0.5)
+    p._tile_sweep.next(640, 360)
+    p._stitch_tiles(_boxes((300, 100, 310, 130, 0.8)), 0.0, True, (0, 0, 0))
+    out = p._stitch_tiles(BoxBatch(), 0.3, True, (100, 0, 0))   # panned 10 deg right
+    (b,) = out
+    assert (round(b.x1), round(b.x2)) == (200, 210)
+    assert round(b.conf, 2) == 0.4                              # one half-life old
+    assert len(p._stitch_tiles(BoxBatch(), 0.35, True, None)) == 0   # no encoders
+
+
+def test_worker_result_carries_the_submission_tiled_marker():
+    lease = types.SimpleNamespace(image=np.zeros((40, 60, 3), np.uint8), seq=1, t=1.0)
+    w = DetectorWorker(lambda img: [])
+    w._infer(lease, [(0, 0, 20, 20)], tiled=True)
+    assert w.latest().tiled
+    w._infer(lease, None)
+    assert not w.latest().tiled
+
+
+def test_range_falls_back_to_a_fresh_gps_fix():
+    p, fr = _pipe(None)
+    p.pose = types.SimpleNamespace(has_base=True, lat=50.0, lon=-5.0)
+    fix = types.SimpleNamespace(lat=50.002, lon=-5.0, age_sec=1.0)
+    p.gps = types.SimpleNamespace(get_fix=lambda: fix)
+    assert abs(p._subject_range_m(0.0) - 222.4) < 1.0
+    assert p._tile_crops(fr, 640, 360, 0.0) is not None
+    fix.age_sec = 9.0
+    assert p._subject_range_m(0.0) is None
+
+
+def test_invalid_tiles_per_run_resets(tmp_path, capsys):
+    path = tmp_path / "c.yaml"
+    path.write_text("detector:\n  tiles_per_run: 0\n  tile_overlap: 0.95\n")
+    cfg = load_config(str(path))
+    assert (cfg.detector.tiles_per_run, cfg.detector.tile_overlap) == (2, 0.25)
+    out = capsys.readouterr().out
+    assert "INVALID detector.tiles_per_run" in out and "INVALID detector.tile_overlap" in out
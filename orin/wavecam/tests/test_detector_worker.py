@@ -0,0 +1,117 @@
+"""user-005: async detector worker over a latest-frame mailbox."""
+from __future__ import annotations
+
+import threading
+import time
+import types
+
+import numpy as np
+
+from wavecam.capture import FrameLease
+from wavecam.detector import PersonBox
+from wavecam.detector_worker import DetectorWorker
+from wavecam.perf import PerfRegistry
+
+FRAME = np.zeros((40, 60, 3), dtype=np.uint8)
+
+
+class _Lease(FrameLease):
+    def __init__(self, seq, t=0.0):
+        super().__init__(FRAME, seq=seq, t=t)
+        self.released = 0
+
+    def release(self):
+        self.released += 1
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cond():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_result_is_tagged_with_source_frame_and_lease_released():
+    perf, stages = PerfRegistry(), PerfRegistry()
+    w = DetectorWorker(lambda img: [PersonBox(1, 2, 3, 4, 0.9)], perf=perf, stages=stages)
+    w.start()
+    try:
+        lease = _Lease(seq=7, t=time.time() - 0.05)
+        w.submit(lease)
+        assert _wait_for(lambda: w.latest() is not None)
+        res = w.latest()
+        assert res.seq == 7 and res.t == lease.t and res.done_t >= lease.t
+        assert [b.xywh for b in res.boxes] == [(1, 2, 2, 2)]
+        assert _wait_for(lambda: lease.released == 1)
+        assert perf.snapshot()["frame_to_boxes"]["p50_ms"] >= 50.0
+        assert stages.snapshot()["yolo_infer"]["count"] == 1
+    finally:
+        w.stop()
+        w.join(timeout=2)
+
+
+def test_busy_worker_keeps_only_the_newest_submission():
+    gate = threading.Event()
+    seen = []
+
+    def slow_detect(img):
+        seen.append(img)
+        gate.wait(timeout=5.0)
+        return []
+
+    w = DetectorWorker(slow_detect)
+    w.start()
+    try:
+        first = _Lease(seq=1)
+        w.submit(first)
+        assert _wait_for(lambda: len(seen) == 1)   # worker is now busy on seq 1
+        stale, newest = _Lease(seq=2), _Lease(seq=3)
+        w.submit(stale)
+        w.submit(newest)
+        assert stale.released == 1                 # replaced in the mailbox, never inferred
+        gate.set()
+        assert _wait_for(lambda: w.latest() is not None and w.latest().seq == 3)
+        assert len(seen) == 2
+        assert first.released == 1 and newest.released == 1
+        assert w.stats()["dropped"] == 1 and w.stats()["submitted"] == 3
+    finally:
+        gate.set()
+        w.stop()
+        w.join(timeout=2)
+
+
+def test_crop_boxes_are_mapped_back_to_full_frame():
+    shapes = []
+
+    def detect(img):
+        shapes.append(img.shape[:2])
+        return [PersonBox(0, 0, 10, 20, 0.8, track_id=4)]
+
+    w = DetectorWorker(detect)
+    w.start()
+    try:
+        w.submit(_Lease(seq=1), crop=(10, 5, 50, 35))
+        assert _wait_for(lambda: w.latest() is not None)
+        b = w.latest().boxes[0]
+        assert shapes == [(30, 40)]
+        assert (b.x1, b.y1, b.x2, b.y2, b.track_id) == (10, 5, 20, 25, 4)
+    finally:
+        w.stop()
+        w.join(timeout=2)
+
+
+def test_stop_releases_a_frame_still_waiting():
+    gate = threading.Event()
+    w = DetectorWorker(lambda img: gate.wait(timeout=5.0) and [])
+    w.start()
+    waiting = _Lease(seq=2)
+    w.submit(_Lease(seq=1))
+    assert _wait_for(lambda: w.stats()["busy"])
+    w.submit(waiting)
+    w.stop()
+    gate.set()
+    w.join(timeout=2)
+    assert not w.is_alive()
+    assert waiting.released == 1
@@ -236,3 +236,12 @@ def test_bearing_std_present_in_output():
     est.update_gps(_fix(), now=1000.0)
     out = est.predict_output(now=1000.0)
     assert out.bearing_std_deg >= 0.0
+
+
+def test_observation_older_than_the_last_update_does_not_rewind_the_clock():
+    """user-024: a vision bearing stamped with the frame's decode time can
+    predate the GPS update fused earlier in the same tick."""
+    est = _make_est()
+    est.update_gps(_fix(), now=1000.0)
+    est.update_vision(pan_enc=0, pixel_cx=320.0, frame_w=640.0, zoom_enc=0, now=999.9)
+    assert est._t_last == 1000.0
@@ -0,0 +1,80 @@
+"""user-014: vectorized fusion association agrees with the per-pair scalar
+rules it replaced, on random crowded scenes."""
+from __future__ import annotations
+
+import math
+import random
+import types
+
+import pytest
+
+from wavecam.fusion import Fusion, _effective_match_dist
+
+
+def _cfg(scale):
+    return types.SimpleNamespace(lock_threshold=0.6, unlock_threshold=0.35,
+                                 require_person=False, match_dist=120,
+                                 match_dist_scale=scale,
+                                 person_aim_x=0.5, person_aim_y=0.3, ema_alpha=0.5,
+                                 lost_grace_sec=0.8, gps_boost=0.2)
+
+
+def _scene(rng, n_blobs, n_persons):
+    blobs = [types.SimpleNamespace(cx=rng.uniform(0, 1280), cy=rng.uniform(0, 720),
+                                   bbox=(0, 0, 10, 10)) for _ in range(n_blobs)]
+    persons = []
+    for _ in range(n_persons):
+        x, y = rng.randint(0, 1200), rng.randint(0, 600)
+        w, h = rng.randint(20, 80), rng.randint(40, 300)
+        persons.append(types.SimpleNamespace(x1=x, y1=y, x2=x + w, y2=y + h,
+                                             conf=rng.random(), track_id=None))
+    return blobs, persons
+
+
+@pytest.mark.parametrize("scale", [False, True])
+def test_confirmed_matches_scalar_rule(scale):
+    rng = random.Random(7)
+    f = Fusion(_cfg(scale))
+    for _ in range(50):
+        blobs, persons = _scene(rng, rng.randint(0, 60), rng.randint(0, 6))
+        expected = [p for p in persons if any(
+            math.hypot(b.cx - (p.x1 + p.x2) / 2, b.cy - (p.y1 + p.y2) / 2)
+            <= _effective_match_dist(f.cfg, p.y2 - p.y1) for b in blobs)]
+        assert f._confirmed(blobs, persons) == expected
+
+
+def test_selection_follows_nearest_to_ema_like_the_scalar_scan():
+    rng = random.Random(3)
+    for _ in range(50):
+        f = Fusion(_cfg(False))
+        f._ema = (rng.uniform(0, 1280), rng.uniform(0, 720))
+        blobs, _ = _scene(rng, rng.randint(1, 80), 0)
+        want = min(blobs, key=lambda b: math.hypot(b.cx - f._ema[0], b.cy - f._ema[1]))
+        raw_xy, *_ = f._select(blobs, [])
+        assert raw_xy == (want.cx, want.cy)
+
+
+def test_equal_distances_keep_the_first_candidate():
+    f = Fusion(_cfg(False))
+    f._ema = (100.0, 100.0)
+    a = types.SimpleNamespace(cx=90.0, cy=100.0, bbox=(0, 0, 1, 1))
+    b = types.SimpleNamespace(cx=110.0, cy=100.0, bbox=(0, 0, 1, 1))
+    assert f._select([a, b], [])[0] == (90.0, 100.0)
+    assert f._select([b, a], [])[0] == (110.0, 100.0)
+
+
+@pytest.mark.parametrize("scale", [False, True])
+def test_small_scene_scalar_path_matches_the_vectorized_one(scale, monkeypatch):
+    import wavecam.fusion as fusion
+    rng = random.Random(5)
+    for _ in range(200):
+        blobs, persons = _scene(rng, rng.randint(0, 4), rng.randint(0, 3))
+        ema = (rng.uniform(0, 1280), rng.uniform(0, 720)) if rng.random() > 0.3 else None
+        cue = (640.0, 360.0, 200.0) if rng.random() > 0.5 else None
+        out = []
+        for limit in (fusion.SCALAR_MAX_PAIRS, 0):
+            monkeypatch.setattr(fusion, "SCALAR_MAX_PAIRS", limit)
+            f = Fusion(_cfg(scale))
+            f._ema = ema
+            out.append(f._select(blobs, persons, cue))
+        assert out[0] == out[1]
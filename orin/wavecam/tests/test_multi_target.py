@@ -0,0 +1,177 @@
+"""user-015: multi-target fusion — global assignment and a selectable subject."""
+from __future__ import annotations
+
+import itertools
+import random
+import types
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from wavecam.config import load_config
+from wavecam.fusion import Fusion
+from wavecam.multi_target import Candidate, MultiTargetTracker, linear_assignment
+from wavecam.web import build_app
+
+from test_control_api import DummyPipeline
+
+
+def _cfg(**kw):
+    base = dict(lock_threshold=0.6, unlock_threshold=0.35, require_person=False,
+                match_dist=120, person_aim_x=0.5, person_aim_y=0.5, ema_alpha=0.5,
+                lost_grace_sec=0.8, gps_boost=0.2, multi_target=True, max_targets=4)
+    base.update(kw)
+    return types.SimpleNamespace(**base)
+
+
+def _blob(x, y):
+    return types.SimpleNamespace(cx=float(x), cy=float(y), bbox=(int(x) - 5, int(y) - 5, 10, 10))
+
+
+def _person(x, y, conf=0.8, track_id=None):
+    return types.SimpleNamespace(x1=x - 20, y1=y - 60, x2=x + 20, y2=y + 60,
+                                 conf=conf, track_id=track_id)
+
+
+def test_linear_assignment_is_optimal():
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        n, m = (int(v) for v in rng.integers(1, 6, 2))
+        cost = rng.random((n, m)) * 100
+        pairs = linear_assignment(cost)
+        k = min(n, m)
+        best = min(sum(cost[r, c] for r, c in zip(rows, cols))
+                   for rows in itertools.combinations(range(n), k)
+                   for cols in itertools.permutations(range(m), k))
+        assert len(pairs) == k
+        assert sum(cost[r, c] for r, c in pairs) == best
+
+
+def test_global_assignment_keeps_both_tracks_where_greedy_drops_one():
+    # Tracks at x=0 and x=100 both move +60 px. Greedy would pair track 2
+    # with the nearer candidate (40 px) and leave track 1 out of gate.
+    mt = MultiTargetTracker(_cfg())
+    mt.update([Candidate((0.0, 0.0), blob=_blob(0, 0)),
+               Candidate((100.0, 0.0), blob=_blob(100, 0))], 0.0)
+    mt.update([Candidate((60.0, 0.0), blob=_blob(60, 0)),
+               Candidate((160.0, 0.0), blob=_blob(160, 0))], 0.1)
+    assert [(tr.id, tr.xy[0]) for tr in mt.tracks] == [(1, 60.0), (2, 160.0)]
+
+
+def test_subject_is_kept_when_two_foilers_share_a_break():
+    f = Fusion(_cfg())
+    a, b = [300.0, 300.0], [420.0, 300.0]
+    xs = []
+    for _ in range(6):
+        persons = [_person(*a), _person(*b)]
+        fr = f.update([_blob(*a), _blob(*b)], persons)
+        xs.append(fr.target_xy[0] if fr.target_xy else None)
+        a[0] += 15.0
+        b[0] -= 15.0          # converging to 30 px apart
+    assert fr.subject_id == 1 and fr.state == "TRACKING" and fr.matched
+    assert xs[-1] < 390.0     # still on the left foiler, not averaged onto the other
+
+
+def test_operator_pin_and_release():
+    f = Fusion(_cfg())
+    scene = ([_blob(200, 300), _blob(900, 300)], [_person(200, 300), _person(900, 300)])
+    for _ in range(2):
+        fr = f.update(*scene)
+    assert fr.subject_id == 1
+    assert not f.select_subject(9)
+    assert f.select_subject(2)
+    for _ in range(2):
+        fr = f.update(*scene)
+    assert fr.subject_id == 2 and fr.target_xy[0] > 600
+    assert f.select_subject(None) and f.targets.pinned_id is None
+    fr = f.update(*scene)
+    assert fr.subject_id == 2                      # automatic keeps the live subject
+    snap = f.targets.snapshot(0.0)
+    assert [s["subject"] for s in snap] == [False, True]
+
+
+def test_expired_pin_is_reported_once_without_printing(capsys):
+    mt = MultiTargetTracker(_cfg())
+    mt.update([Candidate((0.0, 0.0), blob=_blob(0, 0)),
+               Candidate((300.0, 0.0), blob=_blob(300, 0))], 0.0)
+    assert mt.pin(2)
+    for t in (0.5, 1.0, 1.1):                      # track 2 expires after grace
+        mt.update([Candidate((0.0, 0.0), blob=_blob(0, 0))], t)
+    assert mt.pinned_id is None and mt.subject_id == 1
+    assert mt.take_pin_lost() == 2 and mt.take_pin_lost() is None
+    assert capsys.readouterr().out == ""
+
+
+def test_gps_cue_chooses_the_track_inside_its_radius():
+    f = Fusion(_cfg())
+    blobs = [_blob(200, 300), _blob(640, 360)]
+    f.update(blobs, [])
+    assert f.targets.subject_id == 1
+    fr = f.update(blobs, [], gps_cue_px=(640.0, 360.0, 100.0))
+    assert fr.subject_id == 2 and fr.bbox == blobs[1].bbox
+
+
+def test_person_without_color_never_spawns_a_track():
+    mt = MultiTargetTracker(_cfg())
+    assert mt.update([Candidate((10.0, 10.0), person=_person(10, 10))], 0.0) is None
+    assert mt.tracks == []
+
+
+def test_tracks_are_capped_and_expire_after_grace():
+    mt = MultiTargetTracker(_cfg(max_targets=2))
+    cands = [Candidate((x, 0.0), blob=_blob(x, 0)) for x in (0.0, 300.0, 600.0)]
+    mt.update(cands, 0.0)
+    assert len(mt.tracks) == 2
+    mt.update([], 0.5)
+    assert len(mt.tracks) == 2 and mt.subject_id == 1
+    mt.update([], 1.0)
+    assert mt.tracks == [] and mt.subject_id is None
+
+
+def test_static_distractors_yield_their_slot_to_a_confirmed_subject():
+    f = Fusion(_cfg())
+    buoys = [_blob(x, y) for x, y in ((100, 100), (1100, 100), (100, 600), (1100, 600))]
+    for _ in range(3):
+        f.update(buoys, [])
+    assert [tr.id for tr in f.targets.tracks] == [1, 2, 3, 4]
+    for _ in range(3):
+        fr = f.update(buoys + [_blob(640, 300)], [_person(640, 300)])
+    assert fr.state == "TRACKING" and fr.matched and fr.target_xy == (640.0, 300.0)
+    assert fr.subject_id == 5 and len(f.targets.tracks) == 4
+    # the then-subject (1) was spared; the first spare buoy gave up its slot
+    assert [tr.id for tr in f.targets.tracks] == [1, 3, 4, 5]
+
+
+def test_single_target_contract_is_unchanged_for_one_subject():
+    rng = random.Random(11)
+    legacy = Fusion(_cfg(multi_target=False))
+    multi = Fusion(_cfg())
+    x = 400.0
+    for _ in range(30):
+        x += rng.uniform(-20, 20)
+        present = rng.random() > 0.2
+        blobs = [_blob(x, 300)] if present else []
+        persons = [_person(x, 300, track_id=5)] if present and rng.random() > 0.3 else []
+        a, b = legacy.update(blobs, persons), multi.update(blobs, persons)
+        assert (a.target_xy, a.bbox, a.conf, a.state, a.matched, a.track_id) == \
+               (b.target_xy, b.bbox, b.conf, b.state, b.matched, b.track_id)
+
+
+def test_subject_route():
+    pipe = DummyPipeline()
+    client = TestClient(build_app(pipe))
+    assert client.post("/api/v1/tracking/subject", json={"track_id": 1}).json()["code"] \
+        == "multi_target_off"
+    pipe.fusion = Fusion(_cfg())
+    pipe.fusion.update([_blob(200, 300), _blob(900, 300)], [])
+    r = client.post("/api/v1/tracking/subject", json={"track_id": 7})
+    assert r.status_code == 404 and r.json()["code"] == "unknown_subject"
+    assert client.post("/api/v1/tracking/subject", json={"track_id": 2}).json()["ok"]
+    assert pipe.fusion.targets.pinned_id == 2
+
+
+def test_invalid_max_targets_resets(tmp_path, capsys):
+    p = tmp_path / "c.yaml"
+    p.write_text("fusion:\n  max_targets: 0\n")
+    assert load_config(str(p)).fusion.max_targets == 4
+    assert "INVALID fusion.max_targets" in capsys.readouterr().out
@@ -0,0 +1,111 @@
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import time
+import types
+
+from fastapi.testclient import TestClient
+from test_control_api import DummyPipeline
+from wavecam.config import FusionCfg, PtzCfg
+from wavecam.controller import STOP_CMD, VisualServo
+from wavecam.fusion import Fusion
+import wavecam.perf as perf_mod
+from wavecam.perf import LatencyHistogram, PerfRegistry, PtsLag, StageClock, hud_line
+from wavecam.pipeline import Pipeline
+from wavecam.web import build_app
+
+
+def test_histogram_percentiles_over_rolling_window():
+    h = LatencyHistogram(window=100)
+    for _ in range(100):
+        h.observe(1.0)                 # evicted by the next 100
+    for i in range(1, 101):
+        h.observe(i / 1000.0)
+    s = h.summary()
+    assert s["count"] == 200 and s["window"] == 100
+    assert 49.0 <= s["p50_ms"] <= 52.0
+    assert 94.0 <= s["p95_ms"] <= 96.0
+    assert s["max_ms"] == 100.0 and s["last_ms"] == 100.0
+
+
+def test_registry_drops_missing_and_negative_samples():
+    reg = PerfRegistry()
+    reg.observe("a", None)
+    reg.observe("a", -0.5)
+    reg.since("b", None, 10.0)
+    assert reg.snapshot() == {}
+    reg.since("b", 9.75, 10.0)
+    assert reg.snapshot()["b"]["p50_ms"] == 250.0
+
+
+def test_pts_lag_is_excess_over_best_seen_and_rebases_on_restart():
+    lag = PtsLag()
+    assert lag.update(100.0, None) is None
+    assert lag.update(100.0, 1.0) == 0.0
+    assert abs(lag.update(101.05, 2.0) - 0.05) < 1e-9     # 50 ms of extra buffering
+    assert lag.update(200.0, 0.5) == 0.0                   # PTS stepped back: re-based
+
+
+def test_stage_clock_laps_marks_and_totals(monkeypatch):
+    ticks = iter([-1.0, 0.0, 0.002, 0.0025, 0.010, 0.011])
+    monkeypatch.setattr(perf_mod.time, "perf_counter", lambda: next(ticks))
+    reg = PerfRegistry()
+    clock = StageClock(reg)            # -1.0, superseded by start()
+    clock.start()                      # 0.0
+    clock.lap("grab")                  # 2 ms
+    clock.mark()                       # skipped stage
+    clock.lap("yolo")                  # 7.5 ms
+    clock.total("loop")                # 11 ms since start
+    snap = reg.snapshot()
+    assert snap["grab"]["last_ms"] == 2.0
+    assert snap["yolo"]["last_ms"] == 7.5
+    assert snap["loop"]["last_ms"] == 11.0
+
+
+def test_hud_line_lists_costliest_stages_first():
+    reg = PerfRegistry()
+    for name, sec in (("yolo", 0.014), ("color", 0.003), ("fusion", 0.0004), ("loop", 0.02)):
+        reg.observe(name, sec)
+    assert hud_line(reg.snapshot(), top=2) == "p95ms yolo 14.0  color 3.0"
+    assert hud_line({}) == ""
+
+
+def test_frame_time_propagates_through_fusion_and_servo():
+    fr = Fusion(FusionCfg()).update([], None, frame_t=123.5)
+    assert fr.frame_t == 123.5
+    servo = VisualServo(PtzCfg())
+    cmd = servo.compute((600.0, 180.0), (640, 360), frame_t=123.5)
+    assert cmd.frame_t == 123.5 and not cmd.is_stop
+    stop = servo.compute(None, (640, 360), frame_t=123.5)
+    assert stop.frame_t == 123.5 and stop == STOP_CMD
+    assert STOP_CMD.frame_t is None                        # singleton untouched
+
+
+def test_send_cmd_records_glass_to_visca_only_on_an_actual_send():
+    sent = []
+    pipe = Pipeline.__new__(Pipeline)
+    pipe.cfg = types.SimpleNamespace(ptz=types.SimpleNamespace(
+        enabled=True, command_min_interval=10.0, stop_resend_interval=10.0))
+    pipe.ptz = types.SimpleNamespace(pan_tilt=lambda *a: sent.append(a), stop=lambda: None)
+    pipe.owner = types.SimpleNamespace(killed=False)
+    pipe._last_cmd_key = None
+    pipe._last_cmd_time = 0.0
+    pipe.perf = PerfRegistry()
+    cmd = VisualServo(PtzCfg()).compute((600.0, 180.0), (640, 360), frame_t=time.time() - 0.2)
+    pipe._send_cmd(cmd)
+    pipe._send_cmd(cmd)                # de-duped: never reached the camera
+    s = pipe.perf.snapshot()["glass_to_visca"]
+    assert len(sent) == 1 and s["count"] == 1
+    assert 200.0 <= s["p50_ms"] < 1000.0
+
+
+def test_perf_endpoint_serves_pipeline_registry():
+    pl = DummyPipeline()
+    pl.perf = PerfRegistry()
+    pl.perf.observe("glass_to_visca", 0.08)
+    body = TestClient(build_app(pl)).get("/api/v1/perf").json()
+    assert body["segments"]["glass_to_visca"]["p99_ms"] == 80.0
+    # a pipeline without a registry still answers
+    assert TestClient(build_app(DummyPipeline())).get("/api/v1/perf").json() == \
+        {"segments": {}, "stages": {}}
@@ -0,0 +1,110 @@
+"""Review fix for the performance backlog (user-005/006/010/011/020-025): every
+new config key is either restart-required or hot, so presets and /config
+accept and list it; the hot ones rebuild the LUT / motion gate on apply."""
+from types import SimpleNamespace
+
+import pytest
+
+from wavecam.color_detector import ColorDetector
+from wavecam.config import ColorCfg, DetectorCfg
+from wavecam.control_config import ConfigManager
+from wavecam.control_utils import HOT_CONFIG_KEYS, RESTART_REQUIRED_KEYS
+from wavecam.detector_scheduler import MotionGate
+
+
+def _mgr():
+    color_cfg = ColorCfg()
+
+    class FakeCfg:
+        color = color_cfg
+        detector = DetectorCfg()
+        ptz = SimpleNamespace()
+        web = SimpleNamespace()
+
+    class FakePipeline:
+        cfg = FakeCfg()
+        color = ColorDetector(color_cfg)
+        state = SimpleNamespace()
+
+    class FakeApi:
+        def refusal(self, code, msg, status=422):
+            return {"error": code, "message": msg}
+
+    pipe = FakePipeline()
+    return ConfigManager(pipe, FakeApi()), pipe
+
+
+@pytest.mark.parametrize("key", [
+    "camera.frame_ring", "detector.async_worker", "detector.backend",
+    "ptz.scheduler", "ptz.send_min_gap_sec", "ptz.async_rx", "ptz.poll_hz",
+    "ptz.pipelined_poll", "ptz.adaptive_poll", "ptz.idle_poll_hz",
+    "loop.pacing",
+    "detector.motion_comp", "detector.motion_comp_half_life_sec",
+    "detector.box_tracker", "detector.tracker_iou", "detector.tracker_max_age_sec",
+    "color.roi_tracking", "color.roi_scale", "color.roi_motion_gain", "color.roi_min_px", "color.roi_sweep_every",
+    "color.pyramid_zoom",
+    "fusion.multi_target", "fusion.max_targets",
+    "detector.multi_crop", "detector.crop_scale", "detector.crop_min_px", "detector.crop_nms_iou",
+    "detector.tiling", "detector.tile_px", "detector.tile_overlap", "detector.tiles_per_run", "detector.tile_range_m", "detector.tile_max_age_sec",
+    "detector.proposals", "detector.proposal_k", "detector.proposal_scale", "detector.proposal_min_px", "detector.proposal_full_every",
+    "ptz.align_encoders",
+])
+def test_startup_only_keys_are_restart_required(key):
+    assert key in RESTART_REQUIRED_KEYS and key not in HOT_CONFIG_KEYS
+
+
+def test_segmentation_hot_switch_builds_and_drops_the_lut():
+    mgr, pipe = _mgr()
+    assert pipe.color._lut is None
+    assert mgr.apply_hot_key("color.segmentation", "lut", dry_run=True) is None
+    assert pipe.color._lut is None
+    assert mgr.apply_hot_key("color.segmentation", "lut") is None
+    assert pipe.cfg.color.segmentation == "lut" and pipe.color._lut is not None
+    assert mgr.apply_hot_key("color.segmentation", "hsv") is None
+    assert pipe.color._lut is None
+    assert mgr.apply_hot_key("color.segmentation", "yuv") is not None
+
+
+def test_motion_gate_hot_toggle_rebuilds_the_gate():
+    mgr, pipe = _mgr()
+    assert mgr.apply_hot_key("detector.motion_gate", True) is None
+    assert isinstance(pipe._motion_gate, MotionGate) and pipe._motion_gate.threshold == 2.0
+    assert mgr.apply_hot_key("detector.motion_threshold", 5.5) is None
+    assert pipe._motion_gate.threshold == 5.5
+    assert mgr.apply_hot_key("detector.motion_threshold", 0.0) is not None
+    assert mgr.apply_hot_key("detector.motion_gate", False) is None
+    assert pipe._motion_gate is None
+
+
+def test_motion_min_hz_is_hot_and_bounds_the_static_skip():
+    from wavecam.detector_scheduler import DetectorScheduler
+    mgr, pipe = _mgr()
+    assert "detector.motion_min_hz" in HOT_CONFIG_KEYS
+    assert "detector.motion_min_hz" not in RESTART_REQUIRED_KEYS
+    sched = DetectorScheduler(pipe.cfg.detector)
+    sched.should_run(10.0, 0)
+    assert not sched.should_run(10.6, 0, static=True)      # 1 Hz floor: skip
+    assert mgr.apply_hot_key("detector.motion_min_hz", 2.0) is None
+    assert sched.should_run(10.6, 0, static=True)          # 2 Hz floor: due
+    assert mgr.apply_hot_key("detector.motion_min_hz", 0.0) is not None
+
+
+def test_scheduler_tuning_is_hot_and_read_on_the_next_frame():
+    from wavecam.detector_scheduler import DetectorScheduler
+    mgr, pipe = _mgr()
+    sched = DetectorScheduler(pipe.cfg.detector)
+    for key in ("detector.schedule", "detector.budget_frac",
+                "detector.tracking_interval_sec", "detector.locked_interval_sec"):
+        assert key in HOT_CONFIG_KEYS and key not in RESTART_REQUIRED_KEYS
+    assert mgr.apply_hot_key("detector.schedule", "adaptive") is None
+    assert sched.adaptive
+    assert mgr.apply_hot_key("detector.locked_interval_sec", 1.5) is None
+    sched.should_run(10.0, 0, state="TRACKING", matched=True)
+    assert not sched.should_run(11.0, 1, state="TRACKING", matched=True)
+    assert sched.should_run(11.6, 2, state="TRACKING", matched=True)
+    assert mgr.apply_hot_key("detector.budget_frac", 0.25) is None
+    sched.observe_latency(0.1)
+    assert abs(sched.budget_interval() - 0.4) < 1e-9
+    assert mgr.apply_hot_key("detector.schedule", "burst") is not None
+    assert mgr.apply_hot_key("detector.budget_frac", 0.0) is not None
+    assert mgr.apply_hot_key("detector.tracking_interval_sec", -1) is not None
@@ -106,7 +106,7 @@ class _CrashingGrab:
     def start(self):
         pass
 
-    def read(self):
+    def acquire(self):
         raise RuntimeError("frame source exploded")
 
     def stop(self):
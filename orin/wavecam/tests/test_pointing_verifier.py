@@ -135,3 +135,16 @@ def test_block_flipping_true_before_resend_suppresses_move():
     v.tick()
     assert ptz._calls == []
     assert blk.calls >= 2
+
+
+def test_new_target_and_resend_wake_the_poller():
+    """user-025: an adaptive poller samples the settle for the verify read."""
+    ptz = _mock_ptz()
+    wakes = []
+    ps = types.SimpleNamespace(latest=lambda: ((500, -100), 0.01),
+                               note_motion=lambda immediate=False: wakes.append(immediate))
+    v = PointingVerifier(ptz, ps, _mock_events())
+    v.record_move(pan_enc=1000, tilt_enc=-100, t=time.time() - VERIFY_DELAY_SEC - 0.1)
+    v.record_move(pan_enc=1000, tilt_enc=-100)           # keepalive: same target
+    v.tick()                                             # miss -> one resend
+    assert wakes == [True, True]
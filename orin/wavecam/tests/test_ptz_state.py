@@ -82,3 +82,305 @@ def test_zoom_polled_every_nth_cycle_and_cached():
             ps._poll_zoom_once()
     z, age = ps.latest_zoom()
     assert z == 4100 and age is not None and age < 1.0
+
+
+def test_pipelined_poll_refreshes_zoom_every_cycle():
+    calls = []
+
+    def position():
+        calls.append(1)
+        return (100 + len(calls), 0), 4000 + len(calls)
+
+    ptz = types.SimpleNamespace(inquire_pan_tilt=lambda: None, inquire_zoom=lambda: None,
+                                inquire_position=position)
+    ps = PtzState(ptz, poll_hz=200, pipelined=True)
+    ps.start()
+    time.sleep(0.1)
+    ps.stop()
+    assert len(calls) >= 5
+    enc, _ = ps.latest()
+    z, _ = ps.latest_zoom()
+    assert (enc[0] - 100, z - 4000) == (len(calls), len(calls))   # same cycle
+
+
+def test_pipelined_flag_falls_back_without_inquire_position():
+    ptz = _make_fake_ptz([(5, 6)] * 100)
+    ps = PtzState(ptz, poll_hz=200, pipelined=True)
+    ps.start()
+    time.sleep(0.05)
+    ps.stop()
+    assert ps.latest()[0] == (5, 6)
+
+
+def test_visca_inquire_position_demuxes_replies_by_length():
+    import socket
+
+    from wavecam.ptz_visca import ViscaIP
+
+    cam = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    cam.bind(("127.0.0.1", 0))
+    cam.settimeout(1.0)
+    v = ViscaIP("127.0.0.1", cam.getsockname()[1], timeout=0.5)
+    out = {}
+    t = threading.Thread(target=lambda: out.update(r=v.inquire_position()))
+    t.start()
+    (q1, addr), (q2, _) = cam.recvfrom(64), cam.recvfrom(64)
+    assert (q1[2], q2[2]) == (0x06, 0x04)                  # both sent back-to-back
+    for frame in ([0x90, 0x50, 0x01, 0x00, 0x00, 0x00, 0xFF],        # zoom first
+                  [0x90, 0x41, 0xFF],                                # stray ACK
+                  [0x90, 0x50, 0, 0, 0x01, 0x02, 0, 0, 0, 0x03, 0xFF]):
+        cam.sendto(bytes(frame), addr)
+    t.join(1.0)
+    v.close()
+    cam.close()
+    assert out["r"] == ((0x12, 0x03), 0x1000)
+
+
+def _with_history(pt_rows, zoom_rows=()):
+    ps = PtzState(_make_fake_ptz([]), poll_hz=100)
+    ps._hist.extend(pt_rows)
+    ps._zoom_hist.extend(zoom_rows)
+    return ps
+
+
+def test_at_interpolates_between_samples():
+    ps = _with_history([(10.0, 0.0, 100.0), (10.1, 200.0, 100.0)],
+                       [(10.0, 1000.0), (10.2, 2000.0)])
+    s = ps.at(10.025)
+    assert [round(v, 6) for v in (s.pan, s.tilt, s.zoom)] == [50.0, 100.0, 1125.0]
+    assert abs(s.gap_sec - 0.025) < 1e-9 and not s.extrapolated
+    assert ps.at(10.1).pan == 200.0 and ps.at(10.1).gap_sec == 0.0
+
+
+def test_at_extrapolates_capped_and_holds_before_first():
+    ps = _with_history([(10.0, 0.0, 0.0), (10.1, 100.0, 0.0)])
+    s = ps.at(10.15)
+    assert s.extrapolated and abs(s.pan - 150.0) < 1e-6 and s.zoom is None
+    far = ps.at(11.1)                                    # capped at MAX_EXTRAPOLATE_SEC
+    assert abs(far.pan - 300.0) < 1e-6 and abs(far.gap_sec - 1.0) < 1e-9
+    early = ps.at(9.0)
+    assert early.pan == 0.0 and early.extrapolated
+    assert PtzState(_make_fake_ptz([]), poll_hz=100).at(10.0) is None
+
+
+def test_at_copies_only_the_neighbouring_rows():
+    from wavecam.ptz_state import _neighbours
+    hist = [(10.0 + 0.1 * i, float(i)) for i in range(100)]
+    assert _neighbours(hist, 12.05) == [hist[20], hist[21]]
+    assert _neighbours(hist, 12.0) == [hist[20]]
+    assert _neighbours(hist, 9.0) == [hist[0]]
+    assert _neighbours(hist, 30.0) == [hist[-2], hist[-1]]
+
+
+def test_clock_step_stamps_neither_divide_by_zero_nor_unsort_the_history():
+    from wavecam.ptz_state import _interp
+    same = [(10.0, 0.0), (10.0, 100.0)]                          # equal stamps
+    assert _interp(same, 10.0) == ((0.0,), 0.0, False)
+    assert _interp(same, 9.9)[0] == (0.0,) and abs(_interp(same, 10.1)[1] - 0.1) < 1e-9
+    assert _interp([(10.1, 0.0), (10.0, 100.0)], 10.08)[0] == (0.0,)   # out of order: nearer
+    ps = PtzState(_make_fake_ptz([]), poll_hz=100)
+    ps._accept_pan_tilt((100, 0), sample_t=10.0)
+    ps._accept_pan_tilt((101, 0), sample_t=9.0)                  # wall clock stepped back
+    ps._accept_zoom(50, sample_t=10.0)
+    ps._accept_zoom(51, sample_t=9.5)
+    assert [r[0] for r in ps._hist] == [10.0] and [r[0] for r in ps._zoom_hist] == [10.0]
+    assert ps.latest()[0] == (101, 0) and ps.latest_zoom()[0] == 51
+
+
+def test_accepted_samples_enter_the_history():
+    ps = PtzState(_make_fake_ptz([(1000, -200)]), poll_hz=100)
+    ps._poll_once()
+    ps._accept_zoom(4096)
+    s = ps.at(time.time())
+    assert (round(s.pan), round(s.tilt), round(s.zoom)) == (1000, -200, 4096)
+
+
+def test_pipeline_pairs_encoders_with_the_capture_time():
+    from wavecam.pipeline import Pipeline, _aligned_sample
+    p = Pipeline.__new__(Pipeline)
+    p.cfg = types.SimpleNamespace(ptz=types.SimpleNamespace(align_encoders=True))
+    now = time.time()
+    p.ptz_state = _with_history([(now - 0.1, 0.0, 0.0), (now, 400.0, 0.0)],
+                                [(now - 0.1, 5000.0)])
+    assert p._enc_pose(_aligned_sample(p.cfg, p.ptz_state, now - 0.05)) == (200, 0, 5000)
+    p.cfg.ptz.align_encoders = False                     # newest sample, as before
+    p.ptz_state._enc, p.ptz_state._ts = (400, 0), now
+    p.ptz_state._zoom, p.ptz_state._zoom_ts = 5000, now
+    assert _aligned_sample(p.cfg, p.ptz_state, now - 0.05) is None
+    assert p._enc_pose() == (400, 0, 5000)
+
+
+def test_adaptive_rate_bursts_on_motion_and_decays_to_idle():
+    from wavecam.ptz_state import BURST_HOLD_SEC, IDLE_DECAY_HALF_SEC
+    ps = PtzState(_make_fake_ptz([]), poll_hz=10, idle_hz=2.5)
+    assert ps.current_hz() == 2.5                        # never moved
+    ps.note_motion()
+    t = ps._motion_t
+    assert ps.current_hz(t + BURST_HOLD_SEC) == 10
+    assert ps.current_hz(t + BURST_HOLD_SEC + IDLE_DECAY_HALF_SEC) == 5
+    assert ps.current_hz(t + BURST_HOLD_SEC + 10) == 2.5
+    assert PtzState(_make_fake_ptz([]), poll_hz=10).current_hz() == 10   # fixed rate
+
+
+def test_parked_stop_resends_let_the_pipeline_poller_decay_to_idle():
+    from wavecam.controller import STOP_CMD, PtzCommand
+    from wavecam.pipeline import Pipeline
+    sent = []
+    pipe = Pipeline.__new__(Pipeline)
+    pipe.cfg = types.SimpleNamespace(ptz=types.SimpleNamespace(
+        enabled=True, command_min_interval=0.0, stop_resend_interval=0.0))
+    pipe.ptz = types.SimpleNamespace(pan_tilt=lambda *a: sent.append("move"),
+                                     stop=lambda: sent.append("stop"),
+                                     zoom=lambda d, s: sent.append(d))
+    pipe.owner = types.SimpleNamespace(killed=False)
+    pipe._last_cmd_key = None
+    pipe._last_cmd_time = 0.0
+    pipe.ptz_state = ps = PtzState(_make_fake_ptz([]), poll_hz=10, idle_hz=2.5)
+    pipe._send_cmd(PtzCommand(8, 0, 1, 3))
+    pipe._send_zoom("tele", 3)
+    assert ps.current_hz() == 10
+    ps._motion_t -= 5.0                                  # the move was 5 s ago
+    for _ in range(20):                                  # parked: STOP resent every pass
+        pipe._send_cmd(STOP_CMD)
+        pipe._send_zoom("stop")
+    assert sent.count("stop") == 40 and ps.current_hz() == 2.5
+
+
+def test_encoder_change_counts_as_motion_but_jitter_does_not():
+    ps = PtzState(_make_fake_ptz([(1000, 0), (1001, 1), (1100, 0)]), poll_hz=10, idle_hz=2.5)
+    ps._poll_once()
+    first = ps._motion_t
+    time.sleep(0.01)
+    ps._poll_once()                                      # within the deadband
+    assert ps._motion_t == first
+    ps._poll_once()
+    assert ps._motion_t > first
+    ps._accept_zoom(100)
+    moved = ps._motion_t
+    time.sleep(0.01)
+    ps._accept_zoom(101)
+    assert ps._motion_t == moved
+
+
+def test_absolute_move_polls_immediately_while_idle():
+    calls = []
+    ptz = types.SimpleNamespace(inquire_pan_tilt=lambda: calls.append(time.time()) or (0, 0),
+                                inquire_zoom=lambda: 0)
+    ps = PtzState(ptz, poll_hz=10, idle_hz=0.2)          # 5 s idle period
+    ps.start()
+    try:
+        deadline = time.time() + 1.0
+        while not calls and time.time() < deadline:
+            time.sleep(0.005)
+        n = len(calls)
+        t0 = time.time()
+        ps.note_motion(immediate=True)
+        while len(calls) == n and time.time() < deadline + 1.0:
+            time.sleep(0.005)
+        assert len(calls) > n and calls[n] - t0 < 0.2
+    finally:
+        ps.stop()
+    assert not ps.is_alive()
+
+
+def test_invalid_idle_poll_hz_resets(tmp_path, capsys):
+    from wavecam.config import load_config
+    path = tmp_path / "c.yaml"
+    path.write_text("ptz:\n  poll_hz: 2.0\n  idle_poll_hz: 5.0\n")
+    cfg = load_config(str(path))
+    assert cfg.ptz.idle_poll_hz == 2.0
+    assert "INVALID ptz.idle_poll_hz" in capsys.readouterr().out
+
+
+def test_idle_poll_hz_below_the_freshness_floor_resets(tmp_path, capsys):
+    from wavecam.config import load_config
+    from wavecam.ptz_state import MIN_IDLE_POLL_HZ
+    path = tmp_path / "c.yaml"
+    path.write_text("ptz:\n  idle_poll_hz: 1.0\n")
+    cfg = load_config(str(path))
+    assert cfg.ptz.idle_poll_hz == 3.0 >= MIN_IDLE_POLL_HZ
+    assert "INVALID ptz.idle_poll_hz" in capsys.readouterr().out
+
+
+def test_parked_pipeline_at_the_minimum_idle_rate_keeps_encoders_fresh():
+    from wavecam.pipeline import Pipeline
+    from wavecam.ptz_state import MIN_IDLE_POLL_HZ, REPLY_LATENCY_P95_MS
+
+    def slow_reply(value):
+        def inquire():
+            time.sleep(REPLY_LATENCY_P95_MS / 1000.0)
+            return value
+        return inquire
+
+    ptz = types.SimpleNamespace(inquire_pan_tilt=slow_reply((1000, -200)),
+                                inquire_zoom=slow_reply(4096))
+    p = Pipeline.__new__(Pipeline)
+    p.cfg = types.SimpleNamespace(ptz=types.SimpleNamespace(align_encoders=False))
+    p.ptz_state = ps = PtzState(ptz, poll_hz=10, idle_hz=MIN_IDLE_POLL_HZ)
+    assert ps.current_hz() == MIN_IDLE_POLL_HZ           # never moved: parked
+    ps.start()
+    try:
+        deadline = time.time() + 1.0
+        while p._enc_pose() is None and time.time() < deadline:
+            time.sleep(0.005)
+        end = time.time() + 4.0 / MIN_IDLE_POLL_HZ       # several idle periods
+        while time.time() < end:
+            assert p._enc_pose() == (1000, -200, 4096)
+            time.sleep(0.01)
+    finally:
+        ps.stop()
+
+
+def test_history_is_stamped_mid_round_trip_not_at_return():
+    """user-024 review: the pipelined call returns after BOTH replies; each
+    sample is stamped halfway between send and its own reply's arrival."""
+    reply_t = {}
+
+    def inquire_position():
+        time.sleep(0.02)
+        reply_t["pan_tilt"] = time.time()
+        time.sleep(0.06)                                  # zoom reply much later
+        reply_t["zoom"] = time.time()
+        return (500, 0), 4000
+
+    ptz = types.SimpleNamespace(inquire_pan_tilt=lambda: None, inquire_zoom=lambda: None,
+                                inquire_position=inquire_position, reply_t=reply_t)
+    ps = PtzState(ptz, poll_hz=10, pipelined=True)
+    t_send = time.time()
+    ps._poll_both_once()
+    t_pt, t_zoom = ps._hist[-1][0], ps._zoom_hist[-1][0]
+    assert abs(t_pt - (t_send + 0.01)) < 0.008
+    assert abs(t_zoom - (t_send + 0.04)) < 0.015
+    assert ps._ts - t_pt > 0.06                           # latest() age unchanged
+
+
+def test_history_falls_back_to_the_call_midpoint_without_reply_times():
+    def slow():
+        time.sleep(0.04)
+        return (1, 2)
+    ps = PtzState(types.SimpleNamespace(inquire_pan_tilt=slow, inquire_zoom=lambda: None),
+                  poll_hz=10)
+    t_send = time.time()
+    ps._poll_once()
+    assert abs(ps._hist[-1][0] - (t_send + 0.02)) < 0.008
+
+
+def test_vision_observation_is_fused_at_the_frame_time():
+    from wavecam.pipeline import Pipeline, _aligned_sample
+    calls = []
+    now = time.time()
+    ps = _with_history([(now - 0.2, 100.0, 0.0), (now, 300.0, 0.0)],
+                       [(now - 0.2, 8192.0)])
+    p = types.SimpleNamespace(
+        cfg=types.SimpleNamespace(
+            estimator=types.SimpleNamespace(log_every_n=1000, use_vision_range=False),
+            ptz=types.SimpleNamespace(align_encoders=True)),
+        estimator=types.SimpleNamespace(update_vision=lambda **k: calls.append(k),
+                                        predict_output=lambda **k: None),
+        _shadow_writer=None, _est_active_shadow=True, _est_tick=0,
+        gps=types.SimpleNamespace(get_fix=lambda: None), ptz_state=ps)
+    fr = types.SimpleNamespace(locked=True, target_xy=(320.0, 180.0), person_bbox=None,
+                               frame_t=now - 0.1)
+    Pipeline._estimator_shadow_tick(p, fr, 640, now,
+                                    enc=_aligned_sample(p.cfg, ps, fr.frame_t))
+    assert calls[0]["now"] == now - 0.1 and round(calls[0]["pan_enc"]) == 200
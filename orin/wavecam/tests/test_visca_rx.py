@@ -0,0 +1,186 @@
+"""user-022: reply-correlated asynchronous VISCA receive, against a loopback
+"camera" socket."""
+from __future__ import annotations
+
+import socket
+import threading
+
+import pytest
+
+from wavecam.ptz_visca import ViscaIP, parse_frame
+from wavecam.visca_scheduler import ViscaScheduler
+
+PT_REPLY = bytes([0x90, 0x50, 0x0F, 0x0F, 0x0F, 0x06, 0x00, 0x00, 0x01, 0x02, 0xFF])  # -10, 18
+ZOOM_REPLY = bytes([0x90, 0x50, 0x02, 0x00, 0x00, 0x00, 0xFF])                          # 0x2000
+
+
+class _Camera:
+    """Loopback camera: receives the client's datagrams, sends scripted replies."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.5)
+        self.port = self.sock.getsockname()[1]
+
+    def recv(self):
+        data, addr = self.sock.recvfrom(64)
+        return data, addr
+
+    def reply(self, addr, *frames):
+        for f in frames:
+            self.sock.sendto(f, addr)
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture
+def rig():
+    cam = _Camera()
+    v = ViscaIP("127.0.0.1", cam.port, timeout=0.5, async_rx=True)
+    yield cam, v
+    v.close()
+    cam.close()
+
+
+def test_parse_frame_classifies_every_reply_type():
+    assert parse_frame(PT_REPLY) == ("pan_tilt", (-10, 18))
+    assert parse_frame(ZOOM_REPLY) == ("zoom", 0x2000)
+    assert parse_frame(bytes([0x90, 0x41, 0xFF])) == ("ack", 1)
+    assert parse_frame(bytes([0x90, 0x52, 0xFF])) == ("done", 2)
+    assert parse_frame(bytes([0x90, 0x61, 0x41, 0xFF])) == ("error", (1, 0x41))
+    assert parse_frame(b"\x00\x01") is None
+
+
+def test_concurrent_inquiries_get_their_own_reply_type(rig):
+    cam, v = rig
+    out = {}
+    threads = [threading.Thread(target=lambda: out.__setitem__("pt", v.inquire_pan_tilt())),
+               threading.Thread(target=lambda: out.__setitem__("z", v.inquire_zoom()))]
+    for t in threads:
+        t.start()
+    (_, addr), _ = cam.recv(), cam.recv()
+    # zoom reply first, with an ACK for somebody else's command in between
+    cam.reply(addr, ZOOM_REPLY, bytes([0x90, 0x41, 0xFF]), PT_REPLY)
+    for t in threads:
+        t.join(1.0)
+    assert out == {"pt": (-10, 18), "z": 0x2000}
+    rtt = v.stats()["rtt"]
+    assert rtt["inq_pan_tilt"]["count"] == 1 and rtt["inq_zoom"]["count"] == 1
+
+
+def test_command_ack_and_completion_round_trips_are_recorded(rig):
+    cam, v = rig
+    v.pan_tilt_absolute(100, 0)
+    _, addr = cam.recv()
+    cam.reply(addr, bytes([0x90, 0x41, 0xFF]), bytes([0x90, 0x51, 0xFF]))
+    v.zoom("tele", 3)
+    cam.recv()
+    cam.reply(addr, bytes([0x90, 0x60, 0x03, 0xFF]))          # buffer full, no ACK
+    for _ in range(50):
+        stats = v.stats()
+        if stats["errors"] and "done_pan_tilt_absolute" in stats["rtt"]:
+            break
+        threading.Event().wait(0.01)
+    assert stats["rtt"]["ack_pan_tilt_absolute"]["count"] == 1
+    assert stats["rtt"]["done_pan_tilt_absolute"]["count"] == 1
+    assert stats["errors"] == {"0x03": 1}
+
+
+def test_unanswered_inquiry_times_out_and_a_late_reply_is_dropped(rig):
+    cam, v = rig
+    v.timeout = 0.05
+    assert v.inquire_zoom() is None
+    _, addr = cam.recv()
+    cam.reply(addr, ZOOM_REPLY)
+    for _ in range(50):
+        if v.unsolicited:
+            break
+        threading.Event().wait(0.01)
+    assert v.unsolicited == 1
+
+
+def test_pipelined_position_inquiry_on_the_receive_thread(rig):
+    cam, v = rig
+    out = {}
+    t = threading.Thread(target=lambda: out.update(r=v.inquire_position()))
+    t.start()
+    (_, addr), _ = cam.recv(), cam.recv()
+    cam.reply(addr, ZOOM_REPLY, PT_REPLY)
+    t.join(1.0)
+    assert out["r"] == ((-10, 18), 0x2000)
+
+
+def _pt_reply(pan):
+    return bytes([0x90, 0x50, (pan >> 12) & 0xF, (pan >> 8) & 0xF, (pan >> 4) & 0xF,
+                  pan & 0xF, 0, 0, 0, 0, 0xFF])
+
+
+def test_late_reply_is_not_handed_to_the_next_inquiry(rig):
+    cam, v = rig
+    v.timeout = 0.05
+    assert v.inquire_pan_tilt() is None                      # A times out
+    _, addr = cam.recv()
+    v.timeout = 0.5
+    out = {}
+    t = threading.Thread(target=lambda: out.update(b=v.inquire_pan_tilt()))
+    t.start()
+    cam.recv()                                               # B's inquiry
+    cam.reply(addr, _pt_reply(100), _pt_reply(200))          # A's late reply, then B's
+    t.join(1.0)
+    assert out["b"] == (200, 0) and v.unsolicited == 1
+
+
+def test_late_marker_expires_when_the_reply_was_lost(rig):
+    cam, v = rig
+    v.timeout = 0.05
+    assert v.inquire_zoom() is None                          # reply lost
+    _, addr = cam.recv()
+    threading.Event().wait(0.2)                              # > 3 timeouts
+    v.timeout = 0.5
+    out = {}
+    t = threading.Thread(target=lambda: out.update(z=v.inquire_zoom()))
+    t.start()
+    cam.recv()
+    cam.reply(addr, ZOOM_REPLY)
+    t.join(1.0)
+    assert out["z"] == 0x2000 and v.unsolicited == 0
+
+
+def test_one_lost_reply_costs_one_inquiry_not_every_later_one(rig):
+    cam, v = rig
+    v.timeout = 0.05                                         # marker window 0.15 s
+    served = []
+
+    def camera():                                            # answers all but the 2nd
+        for i in range(8):
+            _, addr = cam.recv()
+            if i != 1:
+                cam.reply(addr, _pt_reply(16 + i))
+            served.append(i)
+
+    t = threading.Thread(target=camera)
+    t.start()
+    got = [v.inquire_pan_tilt() for _ in range(8)]           # polled back to back
+    t.join(1.0)
+    assert got[0] == (16, 0) and got[1] is None
+    assert [g[0] for g in got[2:]] == [18, 19, 20, 21, 22, 23]
+
+
+def test_scheduler_sends_inquiries_from_its_writer_thread(rig):
+    cam, v = rig
+    s = ViscaScheduler(v)
+    sent_by = []
+    real = v.send_inquiry
+    v.send_inquiry = lambda payload: (sent_by.append(threading.current_thread()), real(payload))
+    s.start()
+    out = {}
+    t = threading.Thread(target=lambda: out.update(z=s.inquire_zoom()))
+    t.start()
+    _, addr = cam.recv()
+    cam.reply(addr, ZOOM_REPLY)
+    t.join(1.0)
+    s.close()
+    assert out["z"] == 0x2000
+    assert [th.name for th in sent_by] == ["visca-writer"]
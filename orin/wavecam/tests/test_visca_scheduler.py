@@ -0,0 +1,207 @@
+"""user-021: single-writer VISCA scheduler — coalescing, stop preemption,
+send shaping and the perf counters."""
+from __future__ import annotations
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from wavecam.perf import PerfRegistry
+from wavecam.visca_scheduler import ViscaScheduler
+from wavecam.web import build_app
+
+from test_control_api import DummyPipeline
+
+
+class _Transport:
+    def __init__(self):
+        self.calls = []
+        self.sent = threading.Event()
+        self.closed = False
+
+    def __getattr__(self, name):
+        def call(*args):
+            self.calls.append((name,) + args)
+            self.sent.set()
+        return call
+
+    def inquire_pan_tilt(self):
+        return (1, 2)
+
+    def inquire_zoom(self):
+        return 3
+
+    def close(self):
+        self.closed = True
+
+
+def _drain(s, now=1e9):
+    out = []
+    while True:
+        intent, _ = s._next(now)
+        if intent is None:
+            return out
+        s._send(intent)
+        out.append(intent.method)
+
+
+def test_same_axis_intents_coalesce_to_the_newest():
+    tr = _Transport()
+    s = ViscaScheduler(tr)
+    for speed in (3, 5, 8):
+        s.pan_tilt(speed, 1, 2, 3)
+    s.zoom("tele", 2)
+    s.zoom_absolute(0x2000)
+    _drain(s)
+    assert tr.calls == [("pan_tilt", 8, 1, 2, 3), ("zoom_absolute", 0x2000)]
+    assert (s.sent, s.coalesced) == (2, 3)
+
+
+def test_stop_preempts_pending_moves_and_keeps_order_with_later_ones():
+    tr = _Transport()
+    s = ViscaScheduler(tr)
+    s.pan_tilt(8, 1, 2, 3)
+    s.zoom("tele", 2)
+    s.stop()
+    s.zoom("stop")
+    s.stop()                                  # KILL + deadman: one stop on the wire
+    s.pan_tilt(4, 1, 1, 3)                    # enqueued after the stop
+    assert _drain(s) == ["stop", "zoom", "pan_tilt"]
+    assert tr.calls[1] == ("zoom", "stop", 0)
+    assert s.preempted == 2
+
+
+def test_sends_are_spaced_by_min_gap_but_urgent_ignores_it():
+    s = ViscaScheduler(_Transport(), min_gap_sec=0.05)
+    s.pan_tilt(8, 1, 2, 3)
+    s._send(s._next(0.0)[0])
+    s._last_send = 10.0
+    s.zoom("tele", 2)
+    intent, wait = s._next(10.01)
+    assert intent is None and abs(wait - 0.04) < 1e-9
+    s.stop()
+    assert s._next(10.01)[0].method == "stop"
+    assert s._next(10.06)[0].method == "zoom"
+
+
+def test_writer_thread_sends_and_records_queue_latency():
+    tr = _Transport()
+    s = ViscaScheduler(tr)
+    s.start()
+    s.pan_tilt_absolute(100, -50)
+    assert tr.sent.wait(1.0)
+    deadline = time.time() + 1.0
+    while s.stats()["sent"] < 1 and time.time() < deadline:
+        time.sleep(0.005)
+    stats = s.stats()
+    assert stats["queue"]["visca_queue_pt"]["count"] == 1 and stats["pending"] == 0
+    assert s.inquire_pan_tilt() == (1, 2) and s.inquire_zoom() == 3
+    s.stop()
+    s.close()
+    assert tr.closed and tr.calls[-1] == ("stop",)
+
+
+class _AsyncTransport(_Transport):
+    async_rx = True
+    inquiry_sender = None
+
+
+def test_async_inquiry_bytes_queue_behind_the_writer_and_its_gap():
+    tr = _AsyncTransport()
+    s = ViscaScheduler(tr, min_gap_sec=0.05)
+    assert tr.inquiry_sender == s._enqueue_inquiry
+    plain = _Transport()
+    ViscaScheduler(plain)
+    assert "inquiry_sender" not in vars(plain)   # legacy sync inquiries untouched
+    s.pan_tilt(8, 1, 2, 3)
+    tr.inquiry_sender(b"\x81\x09\x06\x12\xff")
+    tr.inquiry_sender(b"\x81\x09\x04\x47\xff")
+    assert tr.calls == []                      # nothing left the calling thread
+    s._send(s._next(0.0)[0])
+    s._last_send = 10.0
+    intent, wait = s._next(10.01)
+    assert intent is None and abs(wait - 0.04) < 1e-9
+    _drain(s)
+    assert [c[0] for c in tr.calls] == ["pan_tilt", "send_inquiry", "send_inquiry"]
+    assert tr.calls[1][1] == b"\x81\x09\x06\x12\xff"   # FIFO, never coalesced
+    assert s.stats()["queue"]["visca_queue_inq"]["count"] == 2
+
+
+def test_glass_to_visca_lands_at_the_send_not_the_enqueue():
+    perf = PerfRegistry()
+    s = ViscaScheduler(_Transport())
+    s.trace(time.time() - 0.5, perf)
+    s.pan_tilt(8, 1, 2, 3)
+    s.pan_tilt(9, 1, 2, 3)                     # untraced; coalesces the traced one away
+    _drain(s)
+    assert "glass_to_visca" not in perf.snapshot()
+    s.trace(time.time() - 0.5, perf)
+    s.pan_tilt(8, 1, 2, 3)
+    assert "glass_to_visca" not in perf.snapshot()
+    _drain(s)
+    assert perf.snapshot()["glass_to_visca"]["count"] == 1
+    assert perf.snapshot()["glass_to_visca"]["max_ms"] >= 500.0
+
+
+def test_close_never_sends_beside_a_busy_writer(monkeypatch):
+    import wavecam.visca_scheduler as vs
+    monkeypatch.setattr(vs, "CLOSE_JOIN_SEC", 0.05)
+    release = threading.Event()
+    callers = []
+
+    class Slow(_Transport):
+        def pan_tilt(self, *args):
+            callers.append(("pan_tilt", threading.current_thread().name))
+            release.wait(1.0)
+
+        def stop(self):
+            callers.append(("stop", threading.current_thread().name))
+
+        def close(self):
+            callers.append(("close", threading.current_thread().name))
+
+    s = ViscaScheduler(Slow())
+    s.start()
+    s.pan_tilt(8, 1, 2, 3)
+    while not callers:
+        time.sleep(0.005)
+    s.stop()
+    s.close()                                  # join gives up: writer is mid-send
+    assert callers == [("pan_tilt", "visca-writer")]
+    release.set()
+    s._thread.join(1.0)
+    assert callers == [("pan_tilt", "visca-writer"), ("stop", "visca-writer"),
+                       ("close", "visca-writer")]
+
+
+def test_close_drains_intents_still_inside_the_send_gap():
+    tr = _AsyncTransport()
+    s = ViscaScheduler(tr, min_gap_sec=0.05)
+    s.start()
+    s.home()
+    assert tr.sent.wait(1.0)
+    s.pan_tilt(8, 1, 2, 3)                     # lands inside the gap of the home
+    tr.inquiry_sender(b"\x81\x09\x06\x12\xff")
+    s.close()
+    assert [c[0] for c in tr.calls] == ["home", "pan_tilt", "send_inquiry"]
+    assert tr.closed and s.stats()["pending"] == 0
+
+
+def test_close_without_a_writer_sends_the_final_stop_itself():
+    tr = _Transport()
+    s = ViscaScheduler(tr)
+    s.pan_tilt(8, 1, 2, 3)
+    s.stop()
+    s.close()
+    assert tr.calls == [("stop",)] and tr.closed
+
+
+def test_perf_route_serves_writer_stats():
+    pipe = DummyPipeline()
+    pipe.ptz = ViscaScheduler(_Transport())
+    pipe.ptz.home()
+    _drain(pipe.ptz)
+    body = TestClient(build_app(pipe)).get("/api/v1/perf").json()
+    assert body["visca"]["sent"] == 1
+    assert body["visca"]["queue"]["visca_queue_pt"]["count"] == 1
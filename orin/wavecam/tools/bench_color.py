@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Color-segmentation bench tool. Run ON the rig; not executed in CI.
+
+Times ColorDetector._mask (segmentation + open/close morphology) for the two
+color.segmentation paths at one or more frame sizes:
+
+  hsv   cvtColor to HSV + one inRange per band, OR-ed   (exact reference)
+  lut   quantized BGR -> mask table compiled from the same bands
+
+and reports the fraction of mask pixels on which the two agree.
+
+Frames come from --image (resized to each size) or are synthetic noise with
+orange patches. The first --warmup calls are discarded.
+
+Usage:
+  python3 tools/bench_color.py
+  python3 tools/bench_color.py --sizes 1280x720 --preset blue --frames 500
+  python3 tools/bench_color.py --image beach.jpg
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import types
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PATHS = ("hsv", "lut")
+
+
+def _size(text: str) -> Tuple[int, int]:
+    try:
+        w, h = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WxH, got {text!r}")
+    return w, h
+
+
+def _frame(image: str | None, w: int, h: int):
+    import cv2
+    import numpy as np
+    if image:
+        img = cv2.imread(image)
+        if img is None:
+            raise RuntimeError(f"could not read image {image}")
+        return cv2.resize(img, (w, h))
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+    pw, ph = max(1, w // 16), max(1, h // 4)         # 40x80 at 640x360
+    for _ in range(8):
+        x, y = int(rng.integers(0, w - pw + 1)), int(rng.integers(0, h - ph + 1))
+        frame[y:y + ph, x:x + pw] = (0, 120, 240)
+    return frame
+
+
+def _detector(path: str, preset: str):
+    from wavecam.color_detector import ColorDetector
+    cfg = types.SimpleNamespace(preset=preset, hsv_ranges={}, morph_kernel=5,
+                                min_area=60, max_area=200000, segmentation=path)
+    return ColorDetector(cfg)
+
+
+def _time_mask(det, frame, n_frames: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        det._mask(frame)
+    times: List[float] = []
+    for _ in range(n_frames):
+        t0 = time.perf_counter()
+        det._mask(frame)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def _report(label: str, times: List[float]) -> None:
+    s = sorted(times)
+    mean_ms = statistics.mean(times) * 1000
+    print(f"  {label:<10s} mean {mean_ms:6.2f} ms  "
+          f"p50 {s[len(s) // 2] * 1000:6.2f}  "
+          f"p95 {s[int(len(s) * 0.95)] * 1000:6.2f}")
+
+
+def run_bench(sizes: List[Tuple[int, int]], paths: List[str], n_frames: int = 200,
+              warmup: int = 10, image: str | None = None,
+              preset: str = "orange_red") -> None:
+    for w, h in sizes:
+        frame = _frame(image, w, h)
+        print(f"\n{'=' * 60}\n  {w}x{h}  preset {preset}  ({n_frames} frames)\n{'=' * 60}")
+        masks = {}
+        for path in paths:
+            det = _detector(path, preset)
+            _report(path, _time_mask(det, frame, n_frames, warmup))
+            masks[path] = det._mask(frame)
+        if len(masks) == 2:
+            agree = float((masks["hsv"] == masks["lut"]).mean())
+            print(f"  mask agreement {agree * 100:.2f}%")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        description="Color-segmentation bench: HSV inRange vs BGR lookup table.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    p.add_argument("--sizes", type=_size, nargs="+", default=[(640, 360), (1280, 720)],
+                   help="Frame sizes WxH (default: 640x360 1280x720)")
+    p.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS),
+                   help="Segmentation paths to time (default: hsv lut)")
+    p.add_argument("--preset", default="orange_red", help="Color preset (default: orange_red)")
+    p.add_argument("--frames", type=int, default=200,
+                   help="Timed calls per path and size (default: 200)")
+    p.add_argument("--warmup", type=int, default=10,
+                   help="Untimed warm-up calls (default: 10)")
+    p.add_argument("--image", default=None,
+                   help="Bench on this image instead of synthetic frames")
+    return p
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    run_bench(args.sizes, args.paths, n_frames=args.frames, warmup=args.warmup,
+              image=args.image, preset=args.preset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Detector-latency bench tool. Run ON the rig (or any Linux box for the CPU
+ONNX path); not executed in CI.
+
+Measures per-frame detect() latency for the detector backends at one or more
+input sizes:
+
+  (u) ultralytics  YOLO.predict on a .pt / .engine      (detector.backend: ultralytics)
+  (o) onnx         ONNX Runtime on an exported .onnx    (detector.backend: onnx)
+  (t) tensorrt     ORT TensorRT provider on the .onnx   (detector.backend: tensorrt)
+
+Export the .onnx once per imgsz with Ultralytics, e.g.
+  yolo export model=yolo11n.pt format=onnx imgsz=480
+
+Frames come from --image (resized to 1280x720 like the RTSP sub-stream) or are
+synthetic noise. The first --warmup calls are discarded (engine build, CUDA
+context, allocator warm-up).
+
+Usage:
+  python3 tools/bench_detector.py --pt yolo11n.pt --onnx yolo11n.onnx
+  python3 tools/bench_detector.py --onnx yolo11n.onnx --backends o --imgsz 320
+  python3 tools/bench_detector.py --pt yolo11n.engine --onnx yolo11n.onnx --backends u t
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import types
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKENDS = {"u": "ultralytics", "o": "onnx", "t": "tensorrt"}
+
+
+def _frame(image: str | None):
+    import cv2
+    import numpy as np
+    if image:
+        img = cv2.imread(image)
+        if img is None:
+            raise RuntimeError(f"could not read image {image}")
+        return cv2.resize(img, (1280, 720))
+    return np.random.default_rng(0).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+
+
+def _detector(backend: str, model: str, imgsz: int, conf: float):
+    from wavecam.detector import make_detector
+    cfg = types.SimpleNamespace(model=model, imgsz=imgsz, conf=conf, person_class=0,
+                                tracker=None, backend=backend)
+    return make_detector(cfg)
+
+
+def _time_detect(det, frame, n_frames: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        det.detect(frame)
+    times: List[float] = []
+    for _ in range(n_frames):
+        t0 = time.perf_counter()
+        det.detect(frame)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def _report(label: str, times: List[float]) -> None:
+    if not times:
+        print(f"\n[{label}] no samples")
+        return
+    s = sorted(times)
+    mean_ms = statistics.mean(times) * 1000
+    print(f"  {label:<28s} mean {mean_ms:6.1f} ms  "
+          f"p50 {s[len(s) // 2] * 1000:6.1f}  "
+          f"p95 {s[int(len(s) * 0.95)] * 1000:6.1f}  "
+          f"p99 {s[min(len(s) - 1, int(len(s) * 0.99))] * 1000:6.1f}  "
+          f"({1000.0 / mean_ms:.0f} fps)")
+
+
+def run_bench(pt: str | None, onnx: str | None, sizes: List[int], backends: List[str],
+              n_frames: int = 200, warmup: int = 10, image: str | None = None,
+              conf: float = 0.35) -> None:
+    """Bench every requested backend x imgsz; a backend that fails to load is
+    reported and skipped, never fatal."""
+    frame = _frame(image)
+    for imgsz in sizes:
+        print(f"\n{'=' * 72}\n  imgsz {imgsz}  ({n_frames} frames, {warmup} warm-up)\n{'=' * 72}")
+        for key in backends:
+            backend = BACKENDS[key]
+            model = pt if backend == "ultralytics" else onnx
+            label = f"{backend} ({os.path.basename(model) if model else '-'})"
+            if not model:
+                print(f"  {label:<28s} SKIPPED (no {'--pt' if key == 'u' else '--onnx'} model)")
+                continue
+            try:
+                det = _detector(backend, model, imgsz, conf)
+                _report(label, _time_detect(det, frame, n_frames, warmup))
+            except Exception as exc:
+                print(f"  {label:<28s} ERROR: {exc}", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        description="Detector-latency bench: Ultralytics vs ONNX Runtime / TensorRT backends.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    p.add_argument("--pt", default=None,
+                   help="Ultralytics weights/engine for the ultralytics backend")
+    p.add_argument("--onnx", default=None,
+                   help="Exported .onnx for the onnx/tensorrt backends")
+    p.add_argument("--imgsz", type=int, nargs="+", default=[320, 480, 640],
+                   help="Input sizes to bench (default: 320 480 640)")
+    p.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=["u", "o"],
+                   help="u=ultralytics, o=onnx, t=tensorrt (default: u o)")
+    p.add_argument("--frames", type=int, default=200,
+                   help="Timed detect() calls per backend and size (default: 200)")
+    p.add_argument("--warmup", type=int, default=10,
+                   help="Untimed warm-up calls (default: 10)")
+    p.add_argument("--image", default=None,
+                   help="Bench on this image instead of synthetic noise")
+    return p
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    run_bench(args.pt, args.onnx, args.imgsz, args.backends,
+              n_frames=args.frames, warmup=args.warmup, image=args.image)
+
+
+if __name__ == "__main__":
+    main()
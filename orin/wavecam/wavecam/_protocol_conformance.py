@@ -13,14 +13,20 @@ if TYPE_CHECKING:
     from .camera_pose import CameraPose
     from .events import EventRing
     from .protocols import (EventsLike, PoseLike, PtzAbsoluteLike,
-                            PtzInquiryLike, PtzStateLike)
+                            PtzInquiryLike, PtzPositionLike, PtzStateLike)
     from .ptz_state import PtzState
     from .ptz_visca import ViscaIP
+    from .visca_scheduler import ViscaScheduler
 
     def _conformance(pose: CameraPose, visca: ViscaIP,
-                     state: PtzState, ring: EventRing) -> None:
+                     state: PtzState, ring: EventRing,
+                     writer: ViscaScheduler) -> None:
         _pose: PoseLike = pose
         _abs: PtzAbsoluteLike = visca
         _inq: PtzInquiryLike = visca
+        _wabs: PtzAbsoluteLike = writer
+        _winq: PtzInquiryLike = writer
+        _pos: PtzPositionLike = visca
+        _wpos: PtzPositionLike = writer
         _st: PtzStateLike = state
         _ev: EventsLike = ring
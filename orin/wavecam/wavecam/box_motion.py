@@ -0,0 +1,68 @@
+"""Encoder motion compensation for cached YOLO boxes. Pure helper, no I/O (user-008).
+
+M5/R4 discard cached boxes once any pan/tilt move has gone out since they were
+captured, so every slew tracks on color alone until the next YOLO frame. With
+detector.motion_comp the pipeline instead records the PTZ encoder pose that each
+box set was captured at and, on reuse, maps the boxes into the current image:
+
+  dx = -(d_pan_enc  / pan_enc_per_deg)  * px_per_deg     (pan right -> scene moves left)
+  dy = +(d_tilt_enc / tilt_enc_per_deg) * px_per_deg     (tilt up   -> scene moves down)
+  px_per_deg = frame_w / hfov(zoom_now)                  (square pixels, small angles)
+
+A zoom change between the two poses scales the boxes about the frame centre by
+hfov_then / hfov_now. Box confidence decays with age (half-life), so a shifted
+box supports fusion less than a fresh one. A box whose centre leaves the frame
+is dropped. Any missing input — no encoder, no FOV curve — returns None and the
+caller falls back to the M5 skip. The mapping is one array op over the
+BoxBatch (user-016).
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .camera_pose import PRISUAL_PAN_ENC_PER_DEG, PRISUAL_TILT_ENC_PER_DEG
+from .detections import BoxBatch
+from .gps_bearing_cue import fov_at_zoom
+
+# (pan_enc, tilt_enc, zoom_enc) as read from PtzState.
+EncPose = Tuple[int, int, int]
+
+
+def conf_decay(age_sec: float, half_life_sec: float) -> float:
+    """Multiplier applied to a cached box's confidence after `age_sec`."""
+    if half_life_sec <= 0:
+        return 1.0
+    return 0.5 ** (max(0.0, age_sec) / half_life_sec)
+
+
+def compensate_boxes(boxes, then: Optional[EncPose],
+                     now: Optional[EncPose], fov_curve: list,
+                     frame_w: int, frame_h: int,
+                     pan_enc_per_deg: float = 0.0, tilt_enc_per_deg: float = 0.0,
+                     conf_scale: float = 1.0) -> Optional[BoxBatch]:
+    """Map `boxes` captured at encoder pose `then` into the image at pose `now`.
+
+    pan/tilt_enc_per_deg come from the calibrated CameraPose (signed); 0 means
+    uncalibrated and falls back to the measured Prisual scale."""
+    if then is None or now is None or not fov_curve or frame_w <= 0 or frame_h <= 0:
+        return None
+    hfov_then = fov_at_zoom(fov_curve, int(then[2]))
+    hfov_now = fov_at_zoom(fov_curve, int(now[2]))
+    if hfov_then <= 0 or hfov_now <= 0:
+        return None
+    pan_scale = pan_enc_per_deg or PRISUAL_PAN_ENC_PER_DEG
+    tilt_scale = tilt_enc_per_deg or PRISUAL_TILT_ENC_PER_DEG
+    px_per_deg = frame_w / hfov_now
+    dx = -((now[0] - then[0]) / pan_scale) * px_per_deg
+    dy = ((now[1] - then[1]) / tilt_scale) * px_per_deg
+    zoom = hfov_then / hfov_now
+    cx0, cy0 = frame_w / 2.0, frame_h / 2.0
+
+    data = BoxBatch.of(boxes).data.astype(np.float64)
+    data[:, [0, 2]] = cx0 + (data[:, [0, 2]] - cx0) * zoom + dx
+    data[:, [1, 3]] = cy0 + (data[:, [1, 3]] - cy0) * zoom + dy
+    data[:, 4] *= conf_scale
+    cx, cy = (data[:, 0] + data[:, 2]) / 2.0, (data[:, 1] + data[:, 3]) / 2.0
+    return BoxBatch(data[(cx >= 0) & (cx < frame_w) & (cy >= 0) & (cy < frame_h)])
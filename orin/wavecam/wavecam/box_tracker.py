@@ -0,0 +1,183 @@
+"""
+Between-detection person-box tracker (user-009). Independent of Ultralytics'
+model.track: a constant-velocity Kalman filter per box over
+[cx, cy, w, h, vx, vy, vw, vh], with every track stepped in one batched
+NumPy operation.
+
+  update(boxes, t)  YOLO result for the frame decoded at t: propagate every
+                    track to t, associate (IoU, then a centroid fallback for
+                    fast movers whose boxes no longer overlap), correct the
+                    matched tracks, spawn new ones and expire tracks not seen
+                    for max_age_sec.
+  predict(t)        per-loop-frame boxes extrapolated to t. Read-only, so an
+                    async result for an OLDER frame can still be applied with
+                    update() afterwards.
+
+Output boxes carry persistent track_ids, which is what Fusion._prefer_track_id
+keys on when the ByteTrack path is off. Input and output are BoxBatch arrays
+(user-016); a PersonBox list is accepted too.
+"""
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+from .detections import BoxBatch
+
+_DIM = 8
+_H = np.eye(4, _DIM)                       # measure [cx, cy, w, h]
+_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4, 1e4])   # unknown velocity
+_R = np.diag([16.0, 16.0, 64.0, 64.0])     # px^2: YOLO box jitter
+_Q_POS = 4.0                               # px^2/s position process noise
+_Q_VEL = 400.0                             # (px/s)^2/s velocity process noise
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, 4) x (M, 4) xyxy -> (N, M) IoU."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def _greedy(score: np.ndarray, ok: np.ndarray, higher_better: bool) -> List[tuple]:
+    """Greedy one-to-one assignment over the `ok` cells of `score`."""
+    rows, cols = np.nonzero(ok)
+    if len(rows) == 0:
+        return []
+    vals = score[rows, cols]
+    order = np.argsort(-vals if higher_better else vals, kind="stable")
+    used_r, used_c, out = set(), set(), []
+    for k in order:
+        r, c = int(rows[k]), int(cols[k])
+        if r in used_r or c in used_c:
+            continue
+        used_r.add(r)
+        used_c.add(c)
+        out.append((r, c))
+    return out
+
+
+def _unused(n: int, used: List[int]) -> np.ndarray:
+    mask = np.ones(n, bool)
+    mask[used] = False
+    return np.nonzero(mask)[0]
+
+
+def _to_xyxy(x: np.ndarray) -> np.ndarray:
+    half_w, half_h = np.abs(x[:, 2]) / 2.0, np.abs(x[:, 3]) / 2.0
+    return np.stack([x[:, 0] - half_w, x[:, 1] - half_h,
+                     x[:, 0] + half_w, x[:, 1] + half_h], axis=1)
+
+
+class BoxTracker:
+    def __init__(self, iou_thresh: float = 0.3, max_age_sec: float = 0.6,
+                 centroid_gate: float = 1.0) -> None:
+        self.iou_thresh = iou_thresh
+        self.max_age_sec = max_age_sec
+        # centroid fallback: match when the detection centre is within
+        # centroid_gate x the predicted box's larger side
+        self.centroid_gate = centroid_gate
+        self._x = np.zeros((0, _DIM))            # state per track
+        self._p = np.zeros((0, _DIM, _DIM))      # covariance per track
+        self._t = np.zeros(0)                    # time the state refers to
+        self._seen = np.zeros(0)                 # last matched detection time
+        self._conf = np.zeros(0)
+        self._ids = np.zeros(0, np.int64)
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _propagate(self, t: float) -> None:
+        dt = np.maximum(t - self._t, 0.0)
+        n = len(dt)
+        f = np.broadcast_to(np.eye(_DIM), (n, _DIM, _DIM)).copy()
+        f[:, np.arange(4), np.arange(4) + 4] = dt[:, None]
+        q = np.zeros((n, _DIM, _DIM))
+        q[:, np.arange(4), np.arange(4)] = _Q_POS * dt[:, None]
+        q[:, np.arange(4, _DIM), np.arange(4, _DIM)] = _Q_VEL * dt[:, None]
+        self._x = np.einsum("nij,nj->ni", f, self._x)
+        self._p = f @ self._p @ f.transpose(0, 2, 1) + q
+        self._t = np.maximum(self._t, t)
+
+    def _extrapolate(self, t: float) -> np.ndarray:
+        dt = np.maximum(t - self._t, 0.0)[:, None]
+        return self._x[:, :4] + self._x[:, 4:] * dt
+
+    def update(self, boxes, t: float) -> BoxBatch:
+        """Correct with one YOLO result from the frame decoded at `t`; returns
+        the tracked boxes at `t`."""
+        if len(self._ids):
+            self._propagate(t)
+        batch = BoxBatch.of(boxes)
+        det = batch.xyxy.astype(np.float64)
+        conf = batch.conf.astype(np.float64)
+        pred = _to_xyxy(self._x[:, :4])
+
+        iou = iou_matrix(pred, det)
+        pairs = _greedy(iou, iou >= self.iou_thresh, higher_better=True)
+        free_r = _unused(len(pred), [r for r, _ in pairs])
+        free_c = _unused(len(det), [c for _, c in pairs])
+        if len(free_r) and len(free_c):
+            pc = (pred[free_r, :2] + pred[free_r, 2:]) / 2.0
+            dc = (det[free_c, :2] + det[free_c, 2:]) / 2.0
+            dist = np.linalg.norm(pc[:, None, :] - dc[None, :, :], axis=2)
+            side = np.maximum(pred[free_r, 2] - pred[free_r, 0],
+                              pred[free_r, 3] - pred[free_r, 1])
+            extra = _greedy(dist, dist <= self.centroid_gate * side[:, None],
+                            higher_better=False)
+            pairs += [(int(free_r[r]), int(free_c[c])) for r, c in extra]
+
+        if pairs:
+            r = np.array([p[0] for p in pairs])
+            c = np.array([p[1] for p in pairs])
+            z = np.concatenate([(det[c, :2] + det[c, 2:]) / 2.0, det[c, 2:] - det[c, :2]], axis=1)
+            p = self._p[r]
+            s = _H @ p @ _H.T + _R
+            k = p @ _H.T @ np.linalg.inv(s)
+            y = z - self._x[r, :4]
+            self._x[r] = self._x[r] + np.einsum("nij,nj->ni", k, y)
+            self._p[r] = (np.eye(_DIM) - k @ _H) @ p
+            self._seen[r] = t
+            self._conf[r] = conf[c]
+
+        new = _unused(len(det), [c for _, c in pairs])
+        if len(new):
+            x = np.zeros((len(new), _DIM))
+            x[:, :2] = (det[new, :2] + det[new, 2:]) / 2.0
+            x[:, 2:4] = det[new, 2:] - det[new, :2]
+            self._x = np.concatenate([self._x, x])
+            self._p = np.concatenate([self._p, np.broadcast_to(_P0, (len(new), _DIM, _DIM))])
+            self._t = np.concatenate([self._t, np.full(len(new), t)])
+            self._seen = np.concatenate([self._seen, np.full(len(new), t)])
+            self._conf = np.concatenate([self._conf, conf[new]])
+            self._ids = np.concatenate([self._ids, np.arange(self._next_id,
+                                                             self._next_id + len(new))])
+            self._next_id += len(new)
+
+        self._expire(t)
+        return self.predict(t)
+
+    def _expire(self, t: float) -> None:
+        keep = (t - self._seen) <= self.max_age_sec
+        if keep.all():
+            return
+        self._x, self._p, self._t = self._x[keep], self._p[keep], self._t[keep]
+        self._seen, self._conf, self._ids = self._seen[keep], self._conf[keep], self._ids[keep]
+
+    def predict(self, t: float) -> BoxBatch:
+        """Boxes of the live tracks extrapolated to `t` (read-only); tracks
+        unseen for more than max_age_sec at `t` are omitted."""
+        if not len(self._ids):
+            return BoxBatch()
+        live = (t - self._seen) <= self.max_age_sec
+        xyxy = _to_xyxy(self._extrapolate(t))
+        return BoxBatch.from_arrays(xyxy[live], self._conf[live], self._ids[live])
@@ -2,15 +2,31 @@
 Frame grabber. Runs capture in a thread and always hands back the LATEST frame
 (drops stale frames) — essential so the servo loop isn't chasing buffered lag.
 Handles RTSP dropouts with reconnect.
+
+Frames are decoded into a small preallocated ring of buffers and handed out as
+read-only leases (acquire() -> FrameLease) instead of a full-frame copy per
+read(). A leased slot is never a decode target, so the decoder cannot overwrite
+pixels the loop is still using; release() returns the slot to the ring. Each
+lease carries the grabber's frame sequence number (its generation stamp) and
+the wall-clock time it was decoded, plus the stream PTS when the backend
+reports one (user-003) — the start of the glass-to-VISCA latency budget.
+
+wait_for_frame(after_seq) blocks on a condition variable until a frame newer
+than after_seq is published, so a consumer can run exactly once per decoded
+frame instead of polling (user-002).
 """
 from __future__ import annotations
 import threading
 import time
-from typing import Optional
+from typing import List, Optional
 
 import cv2
 import numpy as np
 
+# latest + the loop's lease + the decode target + one spare, so a consumer that
+# briefly holds two leases never starves the decoder (user-001).
+DEFAULT_FRAME_RING = 4
+
 
 def _gst_pipeline(url: str, codec: str) -> str:
     depay = "rtph265depay ! h265parse" if codec == "h265" else "rtph264depay ! h264parse"
@@ -21,17 +37,93 @@ def _gst_pipeline(url: str, codec: str) -> str:
     )
 
 
+class _Slot:
+    __slots__ = ("buf", "seq", "t", "pts", "refs")
+
+    def __init__(self) -> None:
+        self.buf: Optional[np.ndarray] = None
+        self.seq = 0
+        self.t = 0.0
+        self.pts: Optional[float] = None
+        self.refs = 0
+
+
+def _stream_pts(cap) -> Optional[float]:
+    """Presentation timestamp (seconds) of the frame cap.read() just returned,
+    or None when the backend has none. GStreamer/ffmpeg report the RTP-derived
+    PTS via CAP_PROP_POS_MSEC; 0 / negative means "unknown"."""
+    try:
+        ms = float(cap.get(cv2.CAP_PROP_POS_MSEC))
+    except Exception:
+        return None
+    return ms / 1000.0 if ms > 0 else None
+
+
+class FrameLease:
+    """A read-only view of one decoded frame, pinned in the grabber's ring
+    until release(). `image` must not be used after release — the slot may be
+    re-decoded into. A lease built without a grabber (tests, replay) wraps a
+    plain array and release() is a no-op."""
+
+    __slots__ = ("image", "seq", "t", "pts", "_grabber", "_slot")
+
+    def __init__(self, image: np.ndarray, seq: int = 0, t: float = 0.0,
+                 grabber: Optional["FrameGrabber"] = None, slot: int = -1,
+                 pts: Optional[float] = None) -> None:
+        self.image = image
+        self.seq = seq
+        self.t = t                     # time.time() when the frame was decoded
+        self.pts = pts                 # stream PTS (s), None if the backend has none
+        self._grabber = grabber
+        self._slot = slot
+
+    def release(self) -> None:
+        g, self._grabber = self._grabber, None
+        if g is not None:
+            g._release(self._slot)
+
+    def share(self) -> "FrameLease":
+        """A second, independently released lease on the same frame — for
+        handing the frame to another thread (the async detector) without a
+        copy. Only valid while this lease is still held."""
+        g = self._grabber
+        if g is None:
+            return FrameLease(self.image, self.seq, self.t, pts=self.pts)
+        return g._share(self)
+
+    @property
+    def valid(self) -> bool:
+        """True while the slot still holds this lease's generation."""
+        if self._grabber is None:
+            return self._slot < 0
+        return self._grabber._slot_seq(self._slot) == self.seq
+
+    def __enter__(self) -> "FrameLease":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
 class FrameGrabber(threading.Thread):
-    def __init__(self, cfg):
+    def __init__(self, cfg, ring_size: Optional[int] = None):
         super().__init__(daemon=True)
         self.cfg = cfg
-        self._latest: Optional[np.ndarray] = None
+        n = ring_size if ring_size is not None else getattr(cfg, "frame_ring", DEFAULT_FRAME_RING)
+        self._slots: List[_Slot] = [_Slot() for _ in range(max(3, int(n)))]
+        self._latest_idx = -1          # slot holding the newest frame, -1 = none
         self._lock = threading.Lock()
+        # Signalled on every publish AND on disconnect, so waiters never sleep
+        # through a dropout until their timeout.
+        self._new_frame = threading.Condition(self._lock)
         # NOT named _stop: that would shadow threading.Thread._stop() and make
         # Thread.join() raise TypeError (found by test_capture.py, M22).
         self._stop_evt = threading.Event()
         self._connected = False
         self._frames = 0
+        # Frames decoded while every slot was leased out (consumer holding too
+        # many leases) — decoded into scratch and dropped, never over a lease.
+        self._dropped_no_slot = 0
 
     def _open(self) -> Optional[cv2.VideoCapture]:
         src = self.cfg.source
@@ -49,6 +141,14 @@ class FrameGrabber(threading.Thread):
             return None
         return cap
 
+    def _free_slot(self) -> int:
+        """Index of a slot that is neither leased nor the latest, or -1.
+        Caller holds self._lock."""
+        for i, s in enumerate(self._slots):
+            if s.refs == 0 and i != self._latest_idx:
+                return i
+        return -1
+
     def run(self) -> None:
         cap = None
         while not self._stop_evt.is_set():
@@ -59,27 +159,104 @@ class FrameGrabber(threading.Thread):
                     time.sleep(self.cfg.reconnect_sec)
                     continue
                 self._connected = True
-            ok, frame = cap.read()
+            with self._lock:
+                idx = self._free_slot()
+                buf = self._slots[idx].buf if idx >= 0 else None
+            # Decode in place when the slot already has a buffer of the stream's
+            # shape; cv2 returns a fresh array on first use or a size change and
+            # the slot adopts it. The slot is unleased and not latest, so no
+            # reader can observe the partial write.
+            ok, frame = cap.read(buf) if buf is not None else cap.read()
             if not ok or frame is None:
                 self._connected = False
-                # Drop the stale frame so read() returns None on disconnect; the pipeline's
-                # `if frame is None` guard then goes NO_VIDEO instead of running YOLO +
-                # tracking on a frozen frame until RTSP reconnects (CAP-1).
+                # Drop the stale frame so acquire() returns None on disconnect; the
+                # pipeline's `if frame is None` guard then goes NO_VIDEO instead of
+                # running YOLO + tracking on a frozen frame until RTSP reconnects (CAP-1).
                 with self._lock:
-                    self._latest = None
+                    self._latest_idx = -1
+                    self._new_frame.notify_all()
                 cap.release()
                 cap = None
                 time.sleep(self.cfg.reconnect_sec)
                 continue
+            t_dec = time.time()
+            pts = _stream_pts(cap)
             with self._lock:
-                self._latest = frame
+                if idx < 0:
+                    self._dropped_no_slot += 1
+                    continue
+                slot = self._slots[idx]
+                slot.buf = frame
                 self._frames += 1
+                slot.seq = self._frames
+                slot.t = t_dec
+                slot.pts = pts
+                self._latest_idx = idx
+                self._new_frame.notify_all()
         if cap:
             cap.release()
+        with self._lock:
+            self._new_frame.notify_all()
 
-    def read(self) -> Optional[np.ndarray]:
+    def acquire(self) -> Optional[FrameLease]:
+        """Lease the newest frame (read-only, zero-copy), or None with no video.
+        Every lease must be release()d; the decoder skips leased slots."""
+        with self._lock:
+            return self._lease_latest()
+
+    def wait_for_frame(self, after_seq: int, timeout: float) -> Optional[FrameLease]:
+        """Block until a frame with seq > after_seq is published, then lease it.
+        Returns None on timeout, on disconnect, or once the grabber is stopped —
+        the caller decides whether to fall back to acquire() (frozen stream) or
+        treat it as no video."""
+        deadline = time.monotonic() + max(0.0, timeout)
         with self._lock:
-            return None if self._latest is None else self._latest.copy()
+            while True:
+                idx = self._latest_idx
+                if idx >= 0 and self._slots[idx].seq > after_seq:
+                    return self._lease_latest()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_evt.is_set():
+                    return None
+                self._new_frame.wait(remaining)
+                if self._latest_idx < 0:
+                    return None            # disconnect while waiting
+
+    def _lease_latest(self) -> Optional[FrameLease]:
+        """Caller holds self._lock."""
+        idx = self._latest_idx
+        if idx < 0:
+            return None
+        slot = self._slots[idx]
+        slot.refs += 1
+        view = slot.buf.view()
+        view.flags.writeable = False
+        return FrameLease(view, slot.seq, slot.t, self, idx, pts=slot.pts)
+
+    def _share(self, lease: FrameLease) -> FrameLease:
+        with self._lock:
+            self._slots[lease._slot].refs += 1
+        return FrameLease(lease.image, lease.seq, lease.t, self, lease._slot, pts=lease.pts)
+
+    def _release(self, idx: int) -> None:
+        with self._lock:
+            slot = self._slots[idx]
+            slot.refs = max(0, slot.refs - 1)
+
+    def _slot_seq(self, idx: int) -> int:
+        with self._lock:
+            return self._slots[idx].seq
+
+    def read(self) -> Optional[np.ndarray]:
+        """Private, writable copy of the newest frame (or None). Convenience for
+        callers off the hot path; the loop uses acquire()."""
+        lease = self.acquire()
+        if lease is None:
+            return None
+        try:
+            return lease.image.copy()
+        finally:
+            lease.release()
 
     @property
     def connected(self) -> bool:
@@ -88,8 +265,14 @@ class FrameGrabber(threading.Thread):
     @property
     def frames(self) -> int:
         """Total frames captured. A wedged grabber returns the same non-None frame
-        from read() while this stops advancing — the zombie-detection signal."""
+        from acquire() while this stops advancing — the zombie-detection signal."""
         return self._frames
 
+    @property
+    def dropped_no_slot(self) -> int:
+        return self._dropped_no_slot
+
     def stop(self) -> None:
         self._stop_evt.set()
+        with self._lock:
+            self._new_frame.notify_all()
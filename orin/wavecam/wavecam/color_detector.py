@@ -3,15 +3,48 @@
 The default cue is the orange/red rashguard, but the same detector can track other
 high-saturation marker colors by swapping bounded HSV presets. The detector owns
 only pixel segmentation; fusion decides whether the blob is trusted.
+
+color.segmentation: "hsv" (default) converts each frame to HSV and ORs one
+inRange per band. "lut" compiles the bands once (in update_ranges, so preset
+hot-swaps rebuild it) into a table over BGR quantized to LUT_BITS per channel;
+a frame is then three 8-bit channel LUTs summed into a table index plus one
+gather, independent of the number of bands (user-010). Quantization makes the
+LUT mask differ from the HSV one only for pixels whose bin straddles a band
+edge; "hsv" remains the exact reference.
+
+Every intermediate image is a persistent dst= buffer sized to the frame, so
+steady-state segmentation allocates nothing; the returned mask is valid until
+the next detect() call. With color.connected_components the blobs come from
+one connectedComponentsWithStats call filtered in NumPy instead of a Python
+loop over findContours, which is where busy beach scenes (buoys, boards,
+flags: hundreds of contours) spiked the color stage (user-011). Component
+area is a pixel count, not a contour polygon area, so it runs slightly larger
+for small blobs; enclosed holes are not filled.
+
+color.pyramid_zoom picks a pyramid level per zoom encoder: at level L the frame
+is segmented at 1/2**L (areas / kernel scaled to match) only to find candidate
+blobs, whose padded bboxes are then re-segmented at full resolution for the
+exact area limits, centroid and fill (user-013). Worth it at tele, where the
+subject is large; at wide a small subject can vanish in the downscale, so the
+table normally maps wide zoom to level 0.
+
+Blobs come back as one BlobBatch array per frame (detections.py, user-016).
 """
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
 from .color_presets import preset_hsv_ranges
+from .detections import Blob, BlobBatch  # noqa: F401  (Blob re-exported)
+
+LUT_BITS = 5                       # 32 levels per channel -> 32768-entry table
+_Q = 8 - LUT_BITS
+# Per-channel contribution to the packed (b, g, r) table index.
+_LUT_B = ((np.arange(256) >> _Q) << (2 * LUT_BITS)).astype(np.uint16)
+_LUT_G = ((np.arange(256) >> _Q) << LUT_BITS).astype(np.uint16)
+_LUT_R = (np.arange(256) >> _Q).astype(np.uint16)
 
 
 def hsv_range_bands(hsv_ranges: dict) -> list[tuple[np.ndarray, np.ndarray]]:
@@ -32,22 +65,135 @@ def hsv_range_bands(hsv_ranges: dict) -> list[tuple[np.ndarray, np.ndarray]]:
     return bands
 
 
-@dataclass
-class Blob:
-    cx: float
-    cy: float
-    area: float
-    bbox: Tuple[int, int, int, int]   # x, y, w, h
-    fill: float = 1.0                  # blob area / bbox area (solidity, 0..1)
+def build_bgr_lut(bands: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """Classify every quantized BGR bin centre against the HSV bands (via the
+    same cvtColor + inRange as the per-frame path) -> flat uint8 0/255 table."""
+    n = 1 << LUT_BITS
+    centres = (np.arange(n) << _Q) + ((1 << _Q) >> 1)
+    b, g, r = np.meshgrid(centres, centres, centres, indexing="ij")
+    bgr = np.stack([b, g, r], axis=-1).reshape(-1, 1, 3).astype(np.uint8)
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    table = np.zeros((n ** 3, 1), np.uint8)
+    for lo, hi in bands:
+        table |= cv2.inRange(hsv, lo, hi)
+    return table.reshape(-1)
+
+
+class _Work:
+    """Scratch images for one frame size, reused every frame."""
+
+    def __init__(self, h: int, w: int) -> None:
+        self.shape = (h, w)
+        self.img3 = np.empty((h, w, 3), np.uint8)     # HSV, or blurred BGR
+        self.chan = np.empty((h, w), np.uint8)
+        self.idx = np.empty((h, w), np.uint16)
+        self.part = np.empty((h, w), np.uint16)
+        self.band = np.empty((h, w), np.uint8)
+        self.raw = np.empty((h, w), np.uint8)
+        self.opened = np.empty((h, w), np.uint8)
+        self.mask = np.empty((h, w), np.uint8)
+        self.labels = np.empty((h, w), np.int32)
+
+    def crop(self, x1: int, y1: int, x2: int, y2: int) -> "_Work":
+        """Views of every buffer over one window, same offsets (user-012)."""
+        sub = _Work.__new__(_Work)
+        sub.shape = (y2 - y1, x2 - x1)
+        for name, buf in vars(self).items():
+            if name != "shape":
+                setattr(sub, name, buf[y1:y2, x1:x2])
+        return sub
+
+
+def lut_mask(frame_bgr: np.ndarray, table: np.ndarray,
+             work: Optional[_Work] = None) -> np.ndarray:
+    if work is None:
+        work = _Work(*frame_bgr.shape[:2])
+    for ch, lut in enumerate((_LUT_B, _LUT_G, _LUT_R)):
+        cv2.extractChannel(frame_bgr, ch, dst=work.chan)
+        if ch == 0:
+            cv2.LUT(work.chan, lut, dst=work.idx)
+        else:
+            cv2.LUT(work.chan, lut, dst=work.part)
+            cv2.add(work.idx, work.part, dst=work.idx)
+    return np.take(table, work.idx, out=work.raw)
+
+
+def component_blobs(mask: np.ndarray, min_area: float, max_area: float,
+                    labels: Optional[np.ndarray] = None) -> BlobBatch:
+    """Blobs from connectedComponentsWithStats, area filtered in NumPy,
+    largest first."""
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, labels=labels, connectivity=8)
+    stats = stats[1:]                                   # row 0 is the background
+    area = stats[:, cv2.CC_STAT_AREA]
+    keep = (area >= min_area) & (area <= max_area)
+    return BlobBatch.from_rects(area[keep], stats[keep, :4])
+
 
-    @property
-    def conf(self) -> float:
-        return max(0.0, min(1.0, self.fill))
+def pyramid_level(table: list, zoom_enc: Optional[int]) -> int:
+    """Level for `zoom_enc` from [[min_zoom_enc, level], ...]: the entry with
+    the highest threshold not above the zoom. 0 without a table or a zoom."""
+    if not table or zoom_enc is None:
+        return 0
+    level = 0
+    for z, lvl in sorted((int(z), int(lvl)) for z, lvl in table):
+        if zoom_enc >= z:
+            level = lvl
+    return max(0, level)
+
+
+def _merge_windows(wins: List[Tuple[int, int, int, int]], w: int,
+                   h: int) -> List[Tuple[int, int, int, int]]:
+    """Clamp windows to the frame and union overlapping ones, so a blob is
+    never segmented (and reported) twice.
+
+    Each pass finds the overlapping pairs with one sweep over x (sorted by
+    x1, a window only meets those starting before its x2), unions them
+    (union-find) and replaces every group by its bounding box; a grown box
+    can reach a window none of its members did, so passes repeat until
+    nothing merges — in practice one or two. Groups keep the order of their
+    first window."""
+    out = [(max(0, x1), max(0, y1), min(w, x2), min(h, y2)) for x1, y1, x2, y2 in wins]
+    out = [win for win in out if win[2] > win[0] and win[3] > win[1]]
+    while len(out) > 1:
+        parent = list(range(len(out)))
+
+        def root(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        order = sorted(range(len(out)), key=lambda i: out[i][0])
+        merged = False
+        for k, i in enumerate(order):
+            a = out[i]
+            for j in order[k + 1:]:
+                b = out[j]
+                if b[0] >= a[2]:
+                    break
+                if a[1] < b[3] and b[1] < a[3]:
+                    ri, rj = root(i), root(j)
+                    if ri != rj:
+                        parent[max(ri, rj)] = min(ri, rj)
+                        merged = True
+        if not merged:
+            break
+        groups: Dict[int, Tuple[int, int, int, int]] = {}
+        for i, win in enumerate(out):
+            r = root(i)
+            g = groups.get(r)
+            groups[r] = win if g is None else (min(g[0], win[0]), min(g[1], win[1]),
+                                               max(g[2], win[2]), max(g[3], win[3]))
+        out = [groups[r] for r in sorted(groups)]
+    return out
 
 
 class ColorDetector:
     def __init__(self, cfg):
         self.cfg = cfg
+        self._work: Optional[_Work] = None
+        self._work_small: Optional[_Work] = None
+        self._small_bgr: Optional[np.ndarray] = None
         if not cfg.hsv_ranges:
             cfg.hsv_ranges = preset_hsv_ranges(getattr(cfg, "preset", "orange_red"))
         self.update_ranges(cfg.hsv_ranges)
@@ -56,36 +202,118 @@ class ColorDetector:
     def update_kernel(self) -> None:
         k = max(1, int(self.cfg.morph_kernel))
         self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (k, k))
+        self._level_kernels: Dict[int, np.ndarray] = {0: self._kernel}
+
+    def _level_kernel(self, level: int) -> np.ndarray:
+        """The morphology kernel scaled to 1/2**level, built once per level."""
+        kernel = self._level_kernels.get(level)
+        if kernel is None:
+            k = max(1, int(self.cfg.morph_kernel) >> level)
+            kernel = self._level_kernels[level] = cv2.getStructuringElement(
+                cv2.MORPH_ELLIPSE, (k, k))
+        return kernel
 
     def update_ranges(self, hsv_ranges: dict) -> None:
         self._bands = hsv_range_bands(hsv_ranges)
+        self._lut = (build_bgr_lut(self._bands)
+                     if getattr(self.cfg, "segmentation", "hsv") == "lut" else None)
 
-    def _mask(self, frame_bgr: np.ndarray) -> np.ndarray:
-        hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
+    def _buffers(self, frame_bgr: np.ndarray) -> _Work:
+        h, w = frame_bgr.shape[:2]
+        if self._work is None or self._work.shape != (h, w):
+            self._work = _Work(h, w)
+        return self._work
+
+    def _mask(self, frame_bgr: np.ndarray, work: Optional[_Work] = None,
+              kernel: Optional[np.ndarray] = None) -> np.ndarray:
+        if work is None:
+            work = self._buffers(frame_bgr)
+        if kernel is None:
+            kernel = self._kernel
         blur = int(getattr(self.cfg, "blur", 0) or 0)
-        if blur >= 3:
-            hsv = cv2.GaussianBlur(hsv, (blur | 1, blur | 1), 0)
-        mask = None
-        for lo, hi in self._bands:
-            m = cv2.inRange(hsv, lo, hi)
-            mask = m if mask is None else cv2.bitwise_or(mask, m)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._kernel)
-        return mask
-
-    def detect(self, frame_bgr: np.ndarray) -> Tuple[List[Blob], np.ndarray]:
+        if self._lut is not None:
+            # blur in BGR: the table replaces the HSV image entirely
+            if blur >= 3:
+                frame_bgr = cv2.GaussianBlur(frame_bgr, (blur | 1, blur | 1), 0,
+                                             dst=work.img3)
+            mask = lut_mask(frame_bgr, self._lut, work)
+        else:
+            hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV, dst=work.img3)
+            if blur >= 3:
+                hsv = cv2.GaussianBlur(hsv, (blur | 1, blur | 1), 0, dst=hsv)
+            mask = work.raw
+            for i, (lo, hi) in enumerate(self._bands):
+                if i == 0:
+                    cv2.inRange(hsv, lo, hi, dst=mask)
+                else:
+                    cv2.bitwise_or(mask, cv2.inRange(hsv, lo, hi, dst=work.band), dst=mask)
+        cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, dst=work.opened)
+        return cv2.morphologyEx(work.opened, cv2.MORPH_CLOSE, kernel, dst=work.mask)
+
+    def _blobs(self, mask: np.ndarray, work: _Work, x1: int, y1: int,
+               min_area: float, max_area: float) -> BlobBatch:
+        """Blobs of a (window) mask, shifted by the window origin (x1, y1)."""
+        if getattr(self.cfg, "connected_components", False):
+            blobs = component_blobs(mask, min_area, max_area, labels=work.labels)
+            return blobs.offset(x1, y1) if x1 or y1 else blobs
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                       offset=(x1, y1))
+        area = np.array([cv2.contourArea(c) for c in contours], np.float64)
+        keep = np.nonzero((area >= min_area) & (area <= max_area))[0]
+        return BlobBatch.from_rects(area[keep], [cv2.boundingRect(contours[i]) for i in keep])
+
+    def detect(self, frame_bgr: np.ndarray,
+               roi: Optional[Tuple[int, int, int, int]] = None,
+               level: int = 0) -> Tuple[BlobBatch, np.ndarray]:
+        """Blobs in full-frame pixels plus the full-frame mask. With `roi`
+        (x1, y1, x2, y2) only that window is segmented and the mask is zero
+        outside it (user-012); area limits stay relative to the full frame.
+        level > 0 finds candidates on a 1/2**level downscale first (user-013);
+        it is ignored inside an roi, which is already small."""
         h, w = frame_bgr.shape[:2]
-        mask = self._mask(frame_bgr)
         frac = float(getattr(self.cfg, "max_area_frac", 1.0) or 1.0)
         max_area = min(self.cfg.max_area, frac * w * h)
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        blobs: List[Blob] = []
-        for c in contours:
-            area = cv2.contourArea(c)
-            if area < self.cfg.min_area or area > max_area:
-                continue
-            x, y, bw, bh = cv2.boundingRect(c)
-            fill = round(area / float(bw * bh), 3) if bw * bh else 0.0
-            blobs.append(Blob(x + bw / 2.0, y + bh / 2.0, area, (x, y, bw, bh), fill))
-        blobs.sort(key=lambda b: b.area, reverse=True)
-        return blobs, mask
+        full = self._buffers(frame_bgr)
+        if roi is None and level > 0:
+            return self._detect_pyramid(frame_bgr, level, max_area), full.mask
+        if roi is None:
+            mask = self._mask(frame_bgr, full)
+            return self._blobs(mask, full, 0, 0, self.cfg.min_area, max_area), full.mask
+        x1, y1, x2, y2 = roi
+        full.mask.fill(0)
+        work = full.crop(x1, y1, x2, y2)
+        mask = self._mask(frame_bgr[y1:y2, x1:x2], work)
+        return self._blobs(mask, work, x1, y1, self.cfg.min_area, max_area), full.mask
+
+    def _detect_pyramid(self, frame_bgr: np.ndarray, level: int,
+                        max_area: float) -> BlobBatch:
+        """Segment at 1/2**level with areas and kernel scaled down, then
+        re-segment each candidate's padded bbox at full resolution, where the
+        exact area limits, centroid and fill are taken."""
+        h, w = frame_bgr.shape[:2]
+        s = 1 << level
+        sh, sw = max(1, h // s), max(1, w // s)
+        if self._work_small is None or self._work_small.shape != (sh, sw):
+            self._work_small = _Work(sh, sw)
+            self._small_bgr = np.empty((sh, sw, 3), np.uint8)
+        small = self._work_small
+        cv2.resize(frame_bgr, (sw, sh), dst=self._small_bgr, interpolation=cv2.INTER_AREA)
+        kernel = self._level_kernel(level)
+        area_scale = float(s * s)
+        # half the scaled min_area: a blob near the limit can lose pixels to
+        # the downscale; the full-resolution pass applies the exact limit
+        cands = self._blobs(self._mask(self._small_bgr, small, kernel), small, 0, 0,
+                            self.cfg.min_area / area_scale / 2.0, max_area / area_scale * 2.0)
+
+        full = self._buffers(frame_bgr)
+        full.mask.fill(0)
+        pad = 2 * s + int(self.cfg.morph_kernel)
+        x, y, bw, bh = cands.bbox.T
+        blobs: List[BlobBatch] = []
+        for x1, y1, x2, y2 in _merge_windows(
+                list(zip((x * s - pad).tolist(), (y * s - pad).tolist(),
+                         ((x + bw) * s + pad).tolist(), ((y + bh) * s + pad).tolist())), w, h):
+            work = full.crop(x1, y1, x2, y2)
+            mask = self._mask(frame_bgr[y1:y2, x1:x2], work)
+            blobs.append(self._blobs(mask, work, x1, y1, self.cfg.min_area, max_area))
+        return BlobBatch.concat(blobs)
@@ -0,0 +1,63 @@
+"""ROI-first color detection window (user-012).
+
+While Fusion is TRACKING, the color cue only needs to look near the subject.
+With color.roi_tracking the pipeline asks ColorRoi for a window around the
+previous frame's fused bbox before segmenting:
+
+  - centre: the bbox centre plus its last frame-to-frame displacement
+    (one-frame constant-velocity lead);
+  - half-side: roi_scale x the bbox's larger side / 2, plus roi_motion_gain x
+    the displacement, never less than roi_min_px / 2;
+  - None (full frame) when fusion is not TRACKING, has no bbox, or every
+    roi_sweep_every-th frame, so a competing or re-appearing blob elsewhere is
+    still seen and a lost lock is re-acquired at full frame immediately.
+
+Pure bookkeeping on FusionResult fields; the detector does the cropping.
+"""
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+
+class ColorRoi:
+    def __init__(self, cfg) -> None:
+        self.cfg = cfg
+        self._prev_c: Optional[Tuple[float, float]] = None
+        self._since_sweep = 0
+        self.window: Optional[Tuple[int, int, int, int]] = None   # last plan, for status
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(self.cfg, "roi_tracking", False))
+
+    def plan(self, fr, frame_w: int, frame_h: int) -> Optional[Tuple[int, int, int, int]]:
+        """(x1, y1, x2, y2) to segment this frame, or None for the full frame.
+        `fr` is the PREVIOUS frame's FusionResult."""
+        self.window = None
+        if not self.enabled:
+            return None
+        bbox = getattr(fr, "bbox", None)
+        if fr is None or getattr(fr, "state", "SEARCHING") != "TRACKING" or not bbox:
+            self._prev_c = None
+            self._since_sweep = 0
+            return None
+        bx, by, bw, bh = bbox
+        c = (bx + bw / 2.0, by + bh / 2.0)
+        vx, vy = (0.0, 0.0) if self._prev_c is None else \
+            (c[0] - self._prev_c[0], c[1] - self._prev_c[1])
+        self._prev_c = c
+        self._since_sweep += 1
+        if self._since_sweep >= max(1, int(getattr(self.cfg, "roi_sweep_every", 10))):
+            self._since_sweep = 0
+            return None
+        half = max(float(getattr(self.cfg, "roi_scale", 3.0)) * max(bw, bh) / 2.0
+                   + float(getattr(self.cfg, "roi_motion_gain", 2.0)) * math.hypot(vx, vy),
+                   float(getattr(self.cfg, "roi_min_px", 160)) / 2.0)
+        cx, cy = c[0] + vx, c[1] + vy
+        x1, y1 = max(0, int(cx - half)), max(0, int(cy - half))
+        x2, y2 = min(frame_w, int(cx + half)), min(frame_h, int(cy + half))
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            return None
+        self.window = (x1, y1, x2, y2)
+        return self.window
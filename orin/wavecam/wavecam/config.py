@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from typing import Any
 import yaml
 
+from .ptz_state import MIN_IDLE_POLL_HZ
+
 _persist_lock = threading.Lock()
 
 # ---------------------------------------------------------------------------
@@ -45,12 +47,27 @@ def _d(src: dict, key: str, default: Any) -> Any:
     return default if v is None else v
 
 
+
+def _valid_pyramid_zoom(table: Any) -> bool:
+    """user-013: color.pyramid_zoom is a list of [min_zoom_enc, level 0-3] pairs."""
+    if not isinstance(table, list):
+        return False
+    for row in table:
+        if (not isinstance(row, (list, tuple)) or len(row) != 2
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in row)
+                or not 0 <= row[1] <= 3):
+            return False
+    return True
+
 @dataclass
 class CameraCfg:
     source: Any = 0
     use_gstreamer: bool = False
     codec: str = "h264"
     reconnect_sec: float = 2.0
+    # Preallocated decode buffers the grabber leases to the loop (min 3).
+    # Restart-required.
+    frame_ring: int = 4
 
 
 @dataclass
@@ -73,6 +90,36 @@ class PtzCfg:
     zoom_target_frac: float = 0.5
     zoom_deadband: float = 0.06
     zoom_max_speed: int = 5
+    # user-021: one writer thread owns the VISCA socket; callers enqueue,
+    # stop / zoom-stop preempt, same-axis commands coalesce to the newest and
+    # sends are spaced >= send_min_gap_sec. False = direct sends (legacy).
+    # Restart-required.
+    scheduler: bool = False
+    send_min_gap_sec: float = 0.02
+    # user-022: a receive thread parses every VISCA reply and hands inquiry
+    # results to their callers by reply type; command ACK/completion
+    # round-trips are recorded. False = drain-then-send inquiries (legacy).
+    # Restart-required.
+    async_rx: bool = False
+    # user-023: PtzState poll rate, and whether each cycle sends the pan/tilt
+    # and zoom inquiries back-to-back (zoom at the full poll rate) instead of
+    # zoom every 5th cycle. Raise poll_hz only to a bench-verified loss-free
+    # rate. Restart-required.
+    poll_hz: float = 10.0
+    pipelined_poll: bool = False
+    # user-024: pair vision observations (estimator, GPS bearing cue, box
+    # motion compensation) with the encoders interpolated at the frame's
+    # decode time (FrameLease.t; the capture-to-decode PtsLag is not
+    # subtracted) from PtzState's history instead of the newest sample.
+    # Restart-required.
+    align_encoders: bool = False
+    # user-025: poll at poll_hz only while a move command is in force or the
+    # encoders are changing; once stationary, decay to idle_poll_hz. It may
+    # not go below ptz_state.MIN_IDLE_POLL_HZ (~3 Hz), which keeps a parked
+    # sample under the 0.5 s encoder freshness gates. False = fixed poll_hz
+    # (legacy). Restart-required.
+    adaptive_poll: bool = False
+    idle_poll_hz: float = 3.0
 
 
 @dataclass
@@ -95,6 +142,28 @@ class ColorCfg:
     max_area: int = 200000
     hsv_ranges: dict = field(default_factory=dict)
     morph_kernel: int = 5
+    # user-010: "hsv" = cvtColor + one inRange per band (exact, legacy);
+    # "lut" = one lookup in a quantized BGR table compiled from the bands.
+    # Hot: switching rebuilds (or drops) the table.
+    segmentation: str = "hsv"
+    # user-011: blobs from one connectedComponentsWithStats call (pixel-count
+    # area) instead of a Python loop over findContours. False = contours.
+    connected_components: bool = False
+    # user-012: while fusion is TRACKING, segment only a window around the
+    # last fused bbox (roi_scale x its larger side, widened by roi_motion_gain
+    # x its per-frame motion, at least roi_min_px), with a full-frame sweep
+    # every roi_sweep_every frames and on lock loss. False = always full frame.
+    # Restart-required.
+    roi_tracking: bool = False
+    roi_scale: float = 3.0
+    roi_motion_gain: float = 2.0
+    roi_min_px: int = 160
+    roi_sweep_every: int = 10
+    # user-013: [[min_zoom_enc, level], ...] — segment at 1/2**level to find
+    # candidates, refine them at full resolution. The entry with the highest
+    # min_zoom_enc not above the current zoom applies; [] or an unknown zoom
+    # = level 0 (full resolution, legacy). Restart-required.
+    pyramid_zoom: list = field(default_factory=list)
 
 
 @dataclass
@@ -113,6 +182,85 @@ class DetectorCfg:
     # "bytetrack.yaml" | "botsort.yaml" enable YOLO tracking (fail-open if missing).
     # Restart-required (the tracker is bound to the model instance).
     tracker: str | None = None
+    # user-005: run YOLO on a worker thread fed by a latest-frame mailbox so an
+    # inference frame never stalls color + servo. False = inline (legacy).
+    # Restart-required (the worker and grabber ring are sized at startup).
+    async_worker: bool = False
+    # user-006: inference backend. "ultralytics" (legacy YOLO.predict/track),
+    # "onnx" (ONNX Runtime, CPU-capable) or "tensorrt" (ORT's TensorRT provider).
+    # onnx/tensorrt load an exported .onnx from `model` and have no tracker.
+    # Restart-required.
+    backend: str = "ultralytics"
+    # user-007: "fixed" = run every every_n frames (legacy). "adaptive" = run
+    # from fusion state / PTZ motion / arbiter owner: as fast as the budget
+    # allows while searching, coasting or in a GPS handoff; every
+    # tracking_interval_sec while moving or unmatched; every locked_interval_sec
+    # on a matched still lock. budget_frac caps inference at that fraction of
+    # wall time from the measured inference latency. Hot: the scheduler reads
+    # them every frame.
+    schedule: str = "fixed"
+    budget_frac: float = 0.5
+    tracking_interval_sec: float = 0.15
+    locked_interval_sec: float = 0.5
+    # user-020: while searching with the camera stopped, skip a scheduled run
+    # when the frame changed less than motion_threshold (mean grey-level
+    # difference of a 64x36 thumbnail vs the last inference frame), but run at
+    # least motion_min_hz. Applies to both schedules. False = never skip.
+    # motion_gate and motion_threshold are hot (the gate is rebuilt), and so
+    # is motion_min_hz (the scheduler reads it every frame).
+    motion_gate: bool = False
+    motion_threshold: float = 2.0
+    motion_min_hz: float = 1.0
+    # user-008: instead of discarding cached boxes after a pan/tilt/zoom move
+    # (M5/R4), shift them into the current image from the PtzState encoder
+    # delta and the calibrated FOV curve, decaying their confidence with this
+    # half-life. Needs a FOV curve and live encoders; otherwise M5 applies.
+    # False = legacy discard. Restart-required.
+    motion_comp: bool = False
+    motion_comp_half_life_sec: float = 0.3
+    # user-009: constant-velocity Kalman/IoU tracker between YOLO results.
+    # Predicts person boxes (with persistent track_ids) on every loop frame
+    # and is corrected by each detection; tracks unseen for
+    # tracker_max_age_sec are dropped, which replaces box_ttl_sec as the
+    # reuse window. False = raw cached boxes (legacy). Restart-required.
+    box_tracker: bool = False
+    tracker_iou: float = 0.3
+    tracker_max_age_sec: float = 0.6
+    # user-017: each run detects on several regions in one batched call — the
+    # GPS search ROI (with fusion.gps_roi_enabled), a square of crop_scale x
+    # the fused target's larger side (at least crop_min_px) and the full
+    # frame — merged with cross-crop NMS at crop_nms_iou. False = one region.
+    # Crop runs carry no ByteTrack ids, so with `tracker` set, load_config
+    # switches box_tracker on for this, tiling and proposals. Restart-required.
+    multi_crop: bool = False
+    crop_scale: float = 4.0
+    crop_min_px: int = 256
+    crop_nms_iou: float = 0.5
+    # user-018: while the subject is farther than tile_range_m (estimator, else
+    # GPS range) and no person box was found, each run detects on the next
+    # tiles_per_run squares of a tile_px grid overlapping by tile_overlap,
+    # round-robin, stitched with the other tiles' boxes younger than
+    # tile_max_age_sec and one sweep, moved into the current image from the
+    # encoder poses (NMS at crop_nms_iou). False = whole-frame runs.
+    # Restart-required.
+    tiling: bool = False
+    tile_px: int = 320
+    tile_overlap: float = 0.25
+    tiles_per_run: int = 2
+    tile_range_m: float = 150.0
+    tile_max_age_sec: float = 0.5
+    # user-019: when color found blobs, detect only on squares around the
+    # proposal_k largest — proposal_scale x the blob's larger side, at least
+    # proposal_min_px — in one batched call; no blobs = the regions above.
+    # The GPS search ROI (when present) rides along, and every
+    # proposal_full_every-th run adds the full frame, so distractor blobs
+    # can never hide the subject from YOLO for good. False = never.
+    # Restart-required.
+    proposals: bool = False
+    proposal_k: int = 3
+    proposal_scale: float = 6.0
+    proposal_min_px: int = 128
+    proposal_full_every: int = 4
 
 
 @dataclass
@@ -142,6 +290,15 @@ class FusionCfg:
     gps_bearing_cue_enabled: bool = False
     gps_bearing_cue_uncertainty_deg: float = 5.0   # scales the cue radius
     gps_bearing_cue_max_offscreen_deg: float = 10.0  # omit cue past frame edge + this
+    # user-015: keep up to max_targets candidate tracks (color+person), assign
+    # them globally each frame and drive the servo from one subject track —
+    # chosen by the operator (POST /api/v1/tracking/subject), the GPS cue or
+    # continuity. False = single greedy target (legacy).
+    # Only color candidates start a track: a person with no color continues
+    # one but no longer gives the legacy person-only pick (0.2, never locks)
+    # when the subject is off-colour and untracked. Restart-required.
+    multi_target: bool = False
+    max_targets: int = 4
 
 
 @dataclass
@@ -160,6 +317,11 @@ class WebCfg:
 class LoopCfg:
     target_fps: float = 35.0
     log_every_sec: float = 5.0
+    # "timer" = poll the newest frame and sleep out 1/target_fps (legacy).
+    # "frame" = block on the grabber and run exactly once per decoded frame, so
+    # a new frame is never slept past and a duplicate is never reprocessed.
+    # Restart-required.
+    pacing: str = "timer"
 
 
 @dataclass
@@ -361,6 +523,7 @@ def load_config(path: str) -> Config:
             use_gstreamer=bool(_d(cam, "use_gstreamer", False)),
             codec=str(_d(cam, "codec", "h264")),
             reconnect_sec=float(_d(cam, "reconnect_sec", 2.0)),
+            frame_ring=int(_d(cam, "frame_ring", 4)),
         ),
         ptz=PtzCfg(**{**PtzCfg().__dict__, **_d(raw, "ptz", {})}),
         camera_ai=CameraAiCfg(**{**CameraAiCfg().__dict__, **_d(raw, "camera_ai", {})}),
@@ -392,6 +555,85 @@ def load_config(path: str) -> Config:
               f"— resetting to defaults lock={d.lock_threshold:g}/unlock={d.unlock_threshold:g}")
         cfg.fusion.lock_threshold = d.lock_threshold
         cfg.fusion.unlock_threshold = d.unlock_threshold
+    if not isinstance(cfg.fusion.max_targets, int) or cfg.fusion.max_targets < 1:
+        d = FusionCfg()
+        print(f"[config] INVALID fusion.max_targets in {path}: {cfg.fusion.max_targets!r} "
+              f"(expected >= 1) — resetting to {d.max_targets}")
+        cfg.fusion.max_targets = d.max_targets
+    if not _valid_pyramid_zoom(cfg.color.pyramid_zoom):
+        print(f"[config] INVALID color.pyramid_zoom in {path}: {cfg.color.pyramid_zoom!r} "
+              f"(expected [[min_zoom_enc, level 0-3], ...]) — using full resolution")
+        cfg.color.pyramid_zoom = []
+    if cfg.color.segmentation not in ("hsv", "lut"):
+        print(f"[config] INVALID color.segmentation in {path}: {cfg.color.segmentation!r} "
+              f"(expected hsv|lut) — resetting to hsv")
+        cfg.color.segmentation = "hsv"
+    if cfg.detector.backend not in ("ultralytics", "onnx", "tensorrt"):
+        print(f"[config] INVALID detector.backend in {path}: {cfg.detector.backend!r} "
+              "— resetting to 'ultralytics'")
+        cfg.detector.backend = "ultralytics"
+    if cfg.detector.schedule not in ("fixed", "adaptive"):
+        print(f"[config] INVALID detector.schedule in {path}: {cfg.detector.schedule!r} "
+              "— resetting to 'fixed'")
+        cfg.detector.schedule = "fixed"
+    if not cfg.ptz.poll_hz > 0:
+        d = PtzCfg()
+        print(f"[config] INVALID ptz.poll_hz in {path}: {cfg.ptz.poll_hz!r} "
+              f"(expected > 0) — resetting to {d.poll_hz:g}")
+        cfg.ptz.poll_hz = d.poll_hz
+    # user-025: below MIN_IDLE_POLL_HZ a parked camera's encoders age past the
+    # 0.5 s freshness gates and the vision update, bearing cue and box motion
+    # compensation silently switch off.
+    idle_floor = min(MIN_IDLE_POLL_HZ, cfg.ptz.poll_hz)
+    if not idle_floor <= cfg.ptz.idle_poll_hz <= cfg.ptz.poll_hz:
+        d = PtzCfg()
+        idle = min(max(d.idle_poll_hz, MIN_IDLE_POLL_HZ), cfg.ptz.poll_hz)
+        print(f"[config] INVALID ptz.idle_poll_hz in {path}: {cfg.ptz.idle_poll_hz!r} "
+              f"(expected {idle_floor:.2f} <= idle_poll_hz <= poll_hz) — resetting to {idle:g}")
+        cfg.ptz.idle_poll_hz = idle
+    if not cfg.detector.motion_min_hz > 0:
+        d = DetectorCfg()
+        print(f"[config] INVALID detector.motion_min_hz in {path}: "
+              f"{cfg.detector.motion_min_hz!r} (expected > 0) — resetting to "
+              f"{d.motion_min_hz:g}")
+        cfg.detector.motion_min_hz = d.motion_min_hz
+    if not isinstance(cfg.detector.tiles_per_run, int) or cfg.detector.tiles_per_run < 1:
+        d = DetectorCfg()
+        print(f"[config] INVALID detector.tiles_per_run in {path}: "
+              f"{cfg.detector.tiles_per_run!r} (expected >= 1) — resetting to {d.tiles_per_run}")
+        cfg.detector.tiles_per_run = d.tiles_per_run
+    if not isinstance(cfg.detector.proposal_k, int) or cfg.detector.proposal_k < 1:
+        d = DetectorCfg()
+        print(f"[config] INVALID detector.proposal_k in {path}: "
+              f"{cfg.detector.proposal_k!r} (expected >= 1) — resetting to {d.proposal_k}")
+        cfg.detector.proposal_k = d.proposal_k
+    if (not isinstance(cfg.detector.proposal_full_every, int)
+            or cfg.detector.proposal_full_every < 1):
+        d = DetectorCfg()
+        print(f"[config] INVALID detector.proposal_full_every in {path}: "
+              f"{cfg.detector.proposal_full_every!r} (expected >= 1) — resetting to "
+              f"{d.proposal_full_every}")
+        cfg.detector.proposal_full_every = d.proposal_full_every
+    if not 0.0 <= cfg.detector.tile_overlap < 0.9:
+        d = DetectorCfg()
+        print(f"[config] INVALID detector.tile_overlap in {path}: "
+              f"{cfg.detector.tile_overlap!r} (expected 0 <= overlap < 0.9) — resetting to "
+              f"{d.tile_overlap:g}")
+        cfg.detector.tile_overlap = d.tile_overlap
+    # user-017: crop runs go through plain batched predict, which carries no
+    # ByteTrack ids; every run with a crop (any run while locked) would drop
+    # them. box_tracker supplies the persistent ids instead, so switch it on.
+    _crop_modes = [k for k in ("multi_crop", "tiling", "proposals")
+                   if getattr(cfg.detector, k, False)]
+    if _crop_modes and cfg.detector.tracker and not cfg.detector.box_tracker:
+        print(f"[config] detector.{'/'.join(_crop_modes)} with detector.tracker="
+              f"{cfg.detector.tracker!r} in {path}: crop runs carry no ByteTrack ids "
+              "— enabling detector.box_tracker")
+        cfg.detector.box_tracker = True
+    if cfg.loop.pacing not in ("timer", "frame"):
+        print(f"[config] INVALID loop.pacing in {path}: {cfg.loop.pacing!r} "
+              "— resetting to 'timer'")
+        cfg.loop.pacing = "timer"
     if cfg.tracking.mode not in ("auto", "gps_only", "vision_only"):
         print(f"[config] INVALID tracking.mode in {path}: {cfg.tracking.mode!r} "
               "— resetting to 'auto'")
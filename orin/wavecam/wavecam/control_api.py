@@ -108,6 +108,11 @@ class ZoomRequest(BaseModel):
     source: str | None = None
 
 
+class SubjectRequest(BaseModel):
+    track_id: int | None = None     # None = automatic subject selection
+    source: str | None = None
+
+
 class CalibrationBaseRequest(BaseModel):
     requested_owner: str = "manual"
     takeover: bool = False
@@ -278,6 +283,7 @@ def register_control_api(app: FastAPI, pipeline, frames: FrameSource) -> None:
     register_status_routes(app, adapter)
     register_safety_routes(app, adapter)
     register_ptz_routes(app, adapter)
+    register_tracking_routes(app, adapter)
     register_calibration_routes(app, adapter)
     register_media_routes(app, adapter)
     register_preset_routes(app, adapter)
@@ -287,6 +293,7 @@ def register_control_api(app: FastAPI, pipeline, frames: FrameSource) -> None:
     register_agent_routes(app, adapter)
     register_health_routes(app, adapter)
     register_events_routes(app, adapter)
+    register_perf_routes(app, adapter)
     register_sensors_routes(app, adapter)
 
 
@@ -449,6 +456,19 @@ def register_ptz_routes(app: FastAPI, api: "ControlApiAdapter") -> None:
         return api.ok()
 
 
+def register_tracking_routes(app: FastAPI, api: "ControlApiAdapter") -> None:
+    @app.post("/api/v1/tracking/subject", dependencies=[Depends(require(PTZ))])
+    def tracking_subject(req: SubjectRequest):
+        # user-015: pin the multi-target track that drives the servo
+        fusion = getattr(api.pipeline, "fusion", None)
+        if getattr(fusion, "targets", None) is None:
+            return api.refusal("multi_target_off", "fusion.multi_target is disabled.")
+        if not fusion.select_subject(req.track_id):
+            return api.refusal("unknown_subject", f"No live candidate track {req.track_id}.", 404)
+        api.bump_revision()
+        return api.ok()
+
+
 def register_calibration_routes(app: FastAPI, api: "ControlApiAdapter") -> None:
     @app.get("/api/v1/calibration", dependencies=[Depends(require(READ))])
     def calibration_get():
@@ -768,6 +788,24 @@ def register_events_routes(app: FastAPI, api: "ControlApiAdapter") -> None:
         return {"events": items}
 
 
+def register_perf_routes(app: FastAPI, api: "ControlApiAdapter") -> None:
+    """GET /api/v1/perf — rolling p50/p95/p99 latency per loop segment
+    (user-003), all measured from the frame's decode wall-clock, plus the
+    per-stage cost of one loop iteration (user-004), plus the VISCA writer's
+    queue latency and counters when ptz.scheduler is on (user-021) and the
+    transport's reply round-trips with ptz.async_rx (user-022)."""
+    @app.get("/api/v1/perf", dependencies=[Depends(require(READ))])
+    def perf():
+        segs = getattr(api.pipeline, "perf", None)
+        stages = getattr(api.pipeline, "stages", None)
+        visca_stats = getattr(getattr(api.pipeline, "ptz", None), "stats", None)
+        body = {"segments": segs.snapshot() if segs is not None else {},
+                "stages": stages.snapshot() if stages is not None else {}}
+        if callable(visca_stats):
+            body["visca"] = visca_stats()
+        return body
+
+
 def register_sensors_routes(app: FastAPI, api: "ControlApiAdapter") -> None:
     """Phase-3 T3.2: phone-on-tripod sensor ingest.
 
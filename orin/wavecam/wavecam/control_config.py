@@ -18,6 +18,7 @@ from fastapi.responses import JSONResponse
 
 from .color_presets import COLOR_PRESETS, preset_hsv_ranges
 from .control_utils import set_bool, set_float, set_int
+from .detector_scheduler import MotionGate
 
 
 class ConfigManager:
@@ -130,11 +131,30 @@ class ConfigManager:
             "color.min_area": lambda: set_int(cfg.color, "min_area", value, 1, 500000, dry_run=dry_run),
             "color.max_area": lambda: set_int(cfg.color, "max_area", value, 100, 1000000, dry_run=dry_run),
             "color.morph_kernel": lambda: self.apply_morph_kernel(value, dry_run=dry_run),
+            "color.segmentation": lambda: self.apply_color_segmentation(value, dry_run=dry_run),
+            "color.connected_components": lambda: set_bool(cfg.color, "connected_components", value, dry_run=dry_run),
             "detector.conf": lambda: set_float(cfg.detector, "conf", value, 0.05, 0.95, dry_run=dry_run),
             "detector.imgsz": lambda: set_int(cfg.detector, "imgsz", value, 160, 1280, dry_run=dry_run),
             "detector.person_class": lambda: set_int(cfg.detector, "person_class", value, 0, 79, dry_run=dry_run),
             "detector.every_n": lambda: set_int(cfg.detector, "every_n", value, 1, 30, dry_run=dry_run),
             "detector.box_ttl_sec": lambda: set_float(cfg.detector, "box_ttl_sec", value, 0.1, 5.0, dry_run=dry_run),
+            "detector.schedule": lambda: self.apply_detector_schedule(value, dry_run=dry_run),
+            "detector.budget_frac": lambda: set_float(cfg.detector, "budget_frac", value, 0.05, 1.0, dry_run=dry_run),
+            "detector.tracking_interval_sec": lambda: set_float(
+                cfg.detector, "tracking_interval_sec", value, 0.0, 2.0, dry_run=dry_run
+            ),
+            "detector.locked_interval_sec": lambda: set_float(
+                cfg.detector, "locked_interval_sec", value, 0.0, 5.0, dry_run=dry_run
+            ),
+            "detector.motion_gate": lambda: self.apply_motion_gate(
+                set_bool(cfg.detector, "motion_gate", value, dry_run=dry_run), dry_run
+            ),
+            "detector.motion_threshold": lambda: self.apply_motion_gate(
+                set_float(cfg.detector, "motion_threshold", value, 0.1, 50.0, dry_run=dry_run), dry_run
+            ),
+            "detector.motion_min_hz": lambda: set_float(
+                cfg.detector, "motion_min_hz", value, 0.1, 30.0, dry_run=dry_run
+            ),
             "web.show_mask": lambda: self._set_web_bool("show_mask", value, dry_run=dry_run),
             "web.show_hud": lambda: self._set_web_bool("show_hud", value, dry_run=dry_run),
             "web.jpeg_quality": lambda: set_int(cfg.web, "jpeg_quality", value, 30, 95, dry_run=dry_run),
@@ -191,6 +211,40 @@ class ConfigManager:
             color.update_kernel()
         return None
 
+    def apply_color_segmentation(self, value: Any, dry_run: bool = False) -> str | None:
+        """color.segmentation — switching to "lut" compiles the table from the
+        live bands; "hsv" drops it."""
+        if value not in ("hsv", "lut"):
+            return "segmentation must be one of hsv, lut."
+        if dry_run:
+            return None
+        cfg = self.pipeline.cfg.color
+        cfg.segmentation = value
+        color = getattr(self.pipeline, "color", None)
+        if color is not None:
+            color.update_ranges(cfg.hsv_ranges)
+        return None
+
+    def apply_detector_schedule(self, value: Any, dry_run: bool = False) -> str | None:
+        """detector.schedule — DetectorScheduler reads it every frame, so the
+        switch takes effect on the next one."""
+        if value not in ("fixed", "adaptive"):
+            return "schedule must be one of fixed, adaptive."
+        if not dry_run:
+            self.pipeline.cfg.detector.schedule = value
+        return None
+
+    def apply_motion_gate(self, error: str | None, dry_run: bool = False) -> str | None:
+        """detector.motion_gate / motion_threshold — rebuild the loop's gate
+        from cfg.detector once the setter accepted the value. The loop reads
+        pipeline._motion_gate once per frame, so the swap is atomic for it."""
+        if error is not None or dry_run:
+            return error
+        det = self.pipeline.cfg.detector
+        self.pipeline._motion_gate = (MotionGate(float(det.motion_threshold))
+                                      if det.motion_gate else None)
+        return None
+
     # ------------------------------------------------------------------
     # GPS config helpers
     # ------------------------------------------------------------------
@@ -88,6 +88,8 @@ def build_config_snapshot(pipeline, revision: int, calibration: dict | None = No
                 "min_area": cfg.color.min_area,
                 "max_area": getattr(cfg.color, "max_area", 200000),
                 "morph_kernel": getattr(cfg.color, "morph_kernel", 5),
+                "segmentation": getattr(cfg.color, "segmentation", "hsv"),
+                "connected_components": getattr(cfg.color, "connected_components", False),
                 "hsv_ranges": getattr(cfg.color, "hsv_ranges", {}),
             },
             "detector": {
@@ -98,6 +100,13 @@ def build_config_snapshot(pipeline, revision: int, calibration: dict | None = No
                 "person_class": cfg.detector.person_class,
                 "every_n": cfg.detector.every_n,
                 "box_ttl_sec": cfg.detector.box_ttl_sec,
+                "schedule": getattr(cfg.detector, "schedule", "fixed"),
+                "budget_frac": getattr(cfg.detector, "budget_frac", 0.5),
+                "tracking_interval_sec": getattr(cfg.detector, "tracking_interval_sec", 0.15),
+                "locked_interval_sec": getattr(cfg.detector, "locked_interval_sec", 0.5),
+                "motion_gate": getattr(cfg.detector, "motion_gate", False),
+                "motion_threshold": getattr(cfg.detector, "motion_threshold", 2.0),
+                "motion_min_hz": getattr(cfg.detector, "motion_min_hz", 1.0),
             },
             "web": {
                 "show_mask": bool(getattr(pipeline.state, "show_mask", False)),
@@ -264,6 +273,17 @@ def build_tracking(legacy: dict) -> dict:
         "has_person": bool(legacy.get("has_person", False)),
         "matched": bool(legacy.get("matched", False)),
         "track_id": legacy.get("track_id"),
+        # user-007: current inference rate and why the scheduler chose it
+        "detector_hz": legacy.get("det_hz"),
+        "detector_reason": legacy.get("det_reason"),
+        # user-018: detector is sweeping tiles for a far, unboxed subject
+        "detector_tiling": bool(legacy.get("det_tiling", False)),
+        # user-012: color segmentation window (x1, y1, x2, y2); None = full frame
+        "color_roi": legacy.get("color_roi"),
+        # user-015: multi-target subject track driving the servo, and the live
+        # candidate tracks an operator can pick from (None = multi-target off)
+        "subject_id": legacy.get("subject_id"),
+        "subjects": legacy.get("subjects"),
     }
 
 
@@ -63,11 +63,20 @@ HOT_CONFIG_KEYS = (
     "color.min_area",
     "color.max_area",
     "color.morph_kernel",
+    "color.segmentation",
+    "color.connected_components",
     "detector.conf",
     "detector.imgsz",
     "detector.person_class",
     "detector.every_n",
     "detector.box_ttl_sec",
+    "detector.schedule",
+    "detector.budget_frac",
+    "detector.tracking_interval_sec",
+    "detector.locked_interval_sec",
+    "detector.motion_gate",
+    "detector.motion_threshold",
+    "detector.motion_min_hz",
     "web.show_mask",
     "web.show_hud",
     "web.jpeg_quality",
@@ -97,18 +106,58 @@ RESTART_REQUIRED_KEYS = (
     "camera.source",
     "camera.codec",
     "camera.use_gstreamer",
+    "camera.frame_ring",
     "ptz.enabled",
     "ptz.ip",
     "ptz.port",
     "ptz.address",
     "ptz.reset_sequence",
+    "ptz.scheduler",
+    "ptz.send_min_gap_sec",
+    "ptz.async_rx",
+    "ptz.poll_hz",
+    "ptz.pipelined_poll",
+    "ptz.adaptive_poll",
+    "ptz.idle_poll_hz",
+    "ptz.align_encoders",
     "camera_ai.disable_on_start",
     "color.enabled",
+    "color.roi_tracking",
+    "color.roi_scale",
+    "color.roi_motion_gain",
+    "color.roi_min_px",
+    "color.roi_sweep_every",
+    "color.pyramid_zoom",
     "detector.enabled",
     "detector.model",
     "detector.tracker",
+    "detector.async_worker",
+    "detector.backend",
+    "detector.motion_comp",
+    "detector.motion_comp_half_life_sec",
+    "detector.box_tracker",
+    "detector.tracker_iou",
+    "detector.tracker_max_age_sec",
+    "detector.multi_crop",
+    "detector.crop_scale",
+    "detector.crop_min_px",
+    "detector.crop_nms_iou",
+    "detector.tiling",
+    "detector.tile_px",
+    "detector.tile_overlap",
+    "detector.tiles_per_run",
+    "detector.tile_range_m",
+    "detector.tile_max_age_sec",
+    "detector.proposals",
+    "detector.proposal_k",
+    "detector.proposal_scale",
+    "detector.proposal_min_px",
+    "detector.proposal_full_every",
+    "fusion.multi_target",
+    "fusion.max_targets",
     "web.host",
     "web.port",
+    "loop.pacing",
 )
 
 YOLO_CLASSES = (
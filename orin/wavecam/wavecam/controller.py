@@ -10,7 +10,7 @@ holds zoom (stop) on fresh color-only frames, and widens after a prior zoom
 correction loses the person box.
 """
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from typing import Optional, Tuple, TYPE_CHECKING
 
 from .ptz_visca import PAN_LEFT, PAN_RIGHT, PAN_STOP, TILT_UP, TILT_DOWN, TILT_STOP
@@ -25,6 +25,9 @@ class PtzCommand:
     tilt_speed: int
     pan_dir: int
     tilt_dir: int
+    # Decode wall-clock of the frame this command was computed from, for the
+    # glass-to-VISCA latency histogram (user-003). Not part of key()/equality.
+    frame_t: Optional[float] = field(default=None, compare=False)
 
     def key(self) -> Tuple[int, int, int, int]:
         """Quantized identity for de-duping repeat sends."""
@@ -49,6 +52,11 @@ class PtzAbsoluteCommand:
 STOP_CMD = PtzCommand(1, 1, PAN_STOP, TILT_STOP)
 
 
+def _stamped(cmd: PtzCommand, frame_t: Optional[float]) -> PtzCommand:
+    """cmd carrying frame_t; the shared STOP_CMD itself is never mutated."""
+    return cmd if frame_t is None else replace(cmd, frame_t=frame_t)
+
+
 class VisualServo:
     def __init__(self, cfg: "PtzCfg") -> None:
         self.cfg = cfg
@@ -87,7 +95,8 @@ class VisualServo:
     def compute(self, target_xy: Optional[Tuple[float, float]],
                 frame_wh: Tuple[int, int],
                 hfov_deg: Optional[float] = None,
-                hfov_ref_deg: Optional[float] = None) -> PtzCommand:
+                hfov_ref_deg: Optional[float] = None,
+                frame_t: Optional[float] = None) -> PtzCommand:
         """Return the velocity command to center target_xy. None target -> STOP.
 
         H8 FOV gain-scheduling: when hfov_deg/hfov_ref_deg are given (ref = the
@@ -96,10 +105,13 @@ class VisualServo:
         normalized-at-wide, so the same *angular* deadzone covers a larger frame
         fraction at tele (stops the limit-cycle hunt at 20x). At the reference
         FOV (or with either arg None) behavior is identical to the legacy path.
+
+        frame_t (the source frame's decode time) is stamped on the returned
+        command so _send_cmd can measure glass-to-VISCA latency.
         """
         if target_xy is None:
             self._last = None
-            return STOP_CMD
+            return _stamped(STOP_CMD, frame_t)
 
         fov_scale = 1.0
         if hfov_deg is not None and hfov_ref_deg is not None and hfov_ref_deg > 0:
@@ -136,8 +148,8 @@ class VisualServo:
                                          dz=dz, fov_scale=fov_scale)
 
         if pan_dir == PAN_STOP and tilt_dir == TILT_STOP:
-            return STOP_CMD
-        return PtzCommand(pan_speed, tilt_speed, pan_dir, tilt_dir)
+            return _stamped(STOP_CMD, frame_t)
+        return PtzCommand(pan_speed, tilt_speed, pan_dir, tilt_dir, frame_t=frame_t)
 
     def compute_zoom(self, person_bbox: Optional[Tuple[int, int, int, int]],
                      frame_h: int) -> Tuple[str, int]:
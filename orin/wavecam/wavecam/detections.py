@@ -0,0 +1,241 @@
+"""
+Array-backed detection batches (user-016).
+
+Every frame used to build one PersonBox / Blob dataclass per detection (and
+offset_boxes rebuilt them all again for GPS ROI crops), and every consumer
+walked them in Python. The detectors now return one float32 array per frame:
+
+  BoxBatch   (N, 6)  x1, y1, x2, y2, conf, track_id   (track_id NaN = none)
+  BlobBatch  (N, 7)  cx, cy, area, x, y, w, h          (largest area first)
+
+Fusion, the box tracker, motion compensation, the ROI offset and the overlay
+read the columns directly. The batches are also a thin compatibility view of
+the old List[PersonBox] / List[Blob] API: len(), truth value, iteration and
+integer indexing yield the dataclasses (built on demand), and a batch
+compares equal to a list of equal dataclasses, so code and tests written
+against lists keep working. A blob's fill is not stored: it is
+round(area / (w * h), 3), exactly what both segmentation paths computed.
+
+Pure NumPy; importable without cv2 or torch.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+BOX_COLS = 6
+BLOB_COLS = 7
+
+
+@dataclass
+class PersonBox:
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    conf: float
+    track_id: int | None = None
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return ((self.x1 + self.x2) / 2.0, (self.y1 + self.y2) / 2.0)
+
+    @property
+    def xywh(self) -> Tuple[int, int, int, int]:
+        return (int(self.x1), int(self.y1), int(self.x2 - self.x1), int(self.y2 - self.y1))
+
+
+@dataclass
+class Blob:
+    cx: float
+    cy: float
+    area: float
+    bbox: Tuple[int, int, int, int]   # x, y, w, h
+    fill: float = 1.0                  # blob area / bbox area (solidity, 0..1)
+
+    @property
+    def conf(self) -> float:
+        return max(0.0, min(1.0, self.fill))
+
+
+def _fill(area: float, box_area: float) -> float:
+    return round(area / float(box_area), 3) if box_area else 0.0
+
+
+class _Batch(ABC):
+    """Shared sequence behaviour over a (N, cols) float32 array."""
+    __slots__ = ("data",)
+    _cols = 0
+
+    def __init__(self, data: Optional[np.ndarray] = None) -> None:
+        if data is None:
+            self.data = np.zeros((0, self._cols), np.float32)
+        else:
+            self.data = np.asarray(data, np.float32).reshape(-1, self._cols)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator:
+        return (self._item(row) for row in self.data.tolist())
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._item(self.data[key].tolist())
+        return type(self)(self.data[key])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _Batch):
+            return type(other) is type(self) and np.array_equal(self.data, other.data,
+                                                                equal_nan=True)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def tolist(self) -> list:
+        return list(self)
+
+    @abstractmethod
+    def _item(self, row: list):
+        """One row as the batch's item type."""
+
+
+class BoxBatch(_Batch):
+    _cols = BOX_COLS
+
+    @classmethod
+    def from_arrays(cls, xyxy: np.ndarray, conf: np.ndarray,
+                    track_id: Optional[np.ndarray] = None) -> "BoxBatch":
+        xyxy = np.asarray(xyxy, np.float32).reshape(-1, 4)
+        data = np.empty((len(xyxy), BOX_COLS), np.float32)
+        data[:, :4] = xyxy
+        data[:, 4] = np.asarray(conf, np.float32).reshape(-1)
+        data[:, 5] = np.nan if track_id is None else np.asarray(track_id, np.float32).reshape(-1)
+        return cls(data)
+
+    @classmethod
+    def of(cls, boxes: Union["BoxBatch", Iterable]) -> "BoxBatch":
+        """A batch as-is, or any sequence of PersonBox-like items as a batch."""
+        if isinstance(boxes, BoxBatch):
+            return boxes
+        rows = [(b.x1, b.y1, b.x2, b.y2, b.conf,
+                 np.nan if getattr(b, "track_id", None) is None else b.track_id)
+                for b in boxes]
+        return cls(np.array(rows, np.float32).reshape(-1, BOX_COLS))
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        return self.data[:, :4]
+
+    @property
+    def conf(self) -> np.ndarray:
+        return self.data[:, 4]
+
+    @property
+    def track_id(self) -> np.ndarray:
+        return self.data[:, 5]
+
+    def centers(self) -> np.ndarray:
+        """(N, 2) float64 box centres, as PersonBox.center computes them."""
+        d = self.data[:, :4].astype(np.float64)
+        return np.stack([(d[:, 0] + d[:, 2]) / 2.0, (d[:, 1] + d[:, 3]) / 2.0], axis=1)
+
+    def xywh(self) -> np.ndarray:
+        """(N, 4) int64 boxes, truncated as PersonBox.xywh truncates them."""
+        d = self.data[:, :4].astype(np.float64)
+        return np.trunc(np.stack([d[:, 0], d[:, 1], d[:, 2] - d[:, 0], d[:, 3] - d[:, 1]],
+                                 axis=1)).astype(np.int64)
+
+    def offset(self, dx: float, dy: float) -> "BoxBatch":
+        """Shifted copy (crop space -> full-frame space)."""
+        data = self.data.copy()
+        data[:, [0, 2]] += np.float32(dx)
+        data[:, [1, 3]] += np.float32(dy)
+        return BoxBatch(data)
+
+    def _item(self, row: list) -> PersonBox:
+        tid = row[5]
+        return PersonBox(row[0], row[1], row[2], row[3], row[4],
+                         track_id=None if tid != tid else int(tid))
+
+
+class BlobBatch(_Batch):
+    _cols = BLOB_COLS
+
+    @classmethod
+    def from_rects(cls, area: np.ndarray, rects: np.ndarray) -> "BlobBatch":
+        """Blobs from areas and integer (x, y, w, h) bounding rects, sorted
+        largest area first (stable, like list.sort(reverse=True))."""
+        area = np.asarray(area, np.float64).reshape(-1)
+        rects = np.asarray(rects, np.float64).reshape(-1, 4)
+        order = np.argsort(-area, kind="stable")
+        area, rects = area[order], rects[order]
+        data = np.empty((len(area), BLOB_COLS), np.float32)
+        data[:, 0] = rects[:, 0] + rects[:, 2] / 2.0
+        data[:, 1] = rects[:, 1] + rects[:, 3] / 2.0
+        data[:, 2] = area
+        data[:, 3:] = rects
+        return cls(data)
+
+    @classmethod
+    def of(cls, blobs: Union["BlobBatch", Iterable]) -> "BlobBatch":
+        """A batch as-is, or any sequence of Blob-like items as a batch (in
+        the given order)."""
+        if isinstance(blobs, BlobBatch):
+            return blobs
+        rows = [(b.cx, b.cy, b.area) + tuple(b.bbox) for b in blobs]
+        return cls(np.array(rows, np.float32).reshape(-1, BLOB_COLS))
+
+    @classmethod
+    def concat(cls, batches: Sequence["BlobBatch"]) -> "BlobBatch":
+        """Concatenate, then re-sort largest area first."""
+        data = np.concatenate([b.data for b in batches]) if batches else None
+        if data is None or not len(data):
+            return cls()
+        return cls.from_rects(data[:, 2], data[:, 3:])
+
+    def centers(self) -> np.ndarray:
+        """(N, 2) float64 blob centres."""
+        return self.data[:, :2].astype(np.float64)
+
+    @property
+    def area(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    @property
+    def bbox(self) -> np.ndarray:
+        """(N, 4) int64 x, y, w, h."""
+        return self.data[:, 3:].astype(np.int64)
+
+    def offset(self, dx: float, dy: float) -> "BlobBatch":
+        data = self.data.copy()
+        data[:, [0, 3]] += np.float32(dx)
+        data[:, [1, 4]] += np.float32(dy)
+        return BlobBatch(data)
+
+    def _item(self, row: list) -> Blob:
+        x, y, w, h = (int(v) for v in row[3:])
+        return Blob(row[0], row[1], row[2], (x, y, w, h), _fill(row[2], w * h))
+
+
+def box_rows(persons) -> List[Tuple[int, int, int, int, float]]:
+    """(x, y, w, h, conf) per person box, for drawing."""
+    if isinstance(persons, BoxBatch):
+        return [(x, y, w, h, c) for (x, y, w, h), c in zip(persons.xywh().tolist(),
+                                                           persons.conf.tolist())]
+    return [tuple(p.xywh) + (p.conf,) for p in persons]
+
+
+def blob_rects(blobs) -> List[Tuple[int, int, int, int]]:
+    """(x, y, w, h) per blob, for drawing."""
+    if isinstance(blobs, BlobBatch):
+        return [tuple(r) for r in blobs.bbox.tolist()]
+    return [tuple(b.bbox) for b in blobs]
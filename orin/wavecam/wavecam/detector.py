@@ -1,12 +1,14 @@
 """
 YOLO26 person validator (Ultralytics). Loads .pt or a TensorRT .engine.
-Returns person boxes as (x1, y1, x2, y2, conf). Lazy import so the rest of the
-testbed (and the offline self-test) doesn't require torch/ultralytics.
+Returns person boxes as one BoxBatch (x1, y1, x2, y2, conf, track_id rows;
+detections.py, user-016). Lazy import so the rest of the testbed (and the
+offline self-test) doesn't require torch/ultralytics.
 """
 from __future__ import annotations
 import os
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List
+
+from .detections import BoxBatch, PersonBox
 
 
 # Curated COCO class labels for the on-frame box label and UI pickers.
@@ -24,22 +26,16 @@ def class_label(class_id: int) -> str:
     return CLASS_LABELS.get(int(class_id), f"cls{int(class_id)}")
 
 
-@dataclass
-class PersonBox:
-    x1: float
-    y1: float
-    x2: float
-    y2: float
-    conf: float
-    track_id: int | None = None
-
-    @property
-    def center(self) -> Tuple[float, float]:
-        return ((self.x1 + self.x2) / 2.0, (self.y1 + self.y2) / 2.0)
-
-    @property
-    def xywh(self) -> Tuple[int, int, int, int]:
-        return (int(self.x1), int(self.y1), int(self.x2 - self.x1), int(self.y2 - self.y1))
+def offset_boxes(boxes, x1: int, y1: int):
+    """Shift box coordinates from crop space back to full-frame space: one
+    array op for a BoxBatch, a PersonBox list for a list."""
+    if isinstance(boxes, BoxBatch):
+        return boxes.offset(x1, y1)
+    return [
+        PersonBox(b.x1 + x1, b.y1 + y1, b.x2 + x1, b.y2 + y1, b.conf,
+                  track_id=getattr(b, "track_id", None))
+        for b in boxes
+    ]
 
 
 def _check_model_path(model) -> None:
@@ -49,7 +45,7 @@ def _check_model_path(model) -> None:
     download. Without this, a missing model surfaces as an opaque Ultralytics crash
     during pipeline construction — i.e. a zombie rig (API up, vision loop dead)."""
     model_str = str(model)
-    needs_local_file = model_str.endswith(".engine") or os.sep in model_str
+    needs_local_file = model_str.endswith((".engine", ".onnx")) or os.sep in model_str
     if needs_local_file and not os.path.exists(model):
         raise FileNotFoundError(
             f"detector model not found: {model_str!r}. Check detector.model in config "
@@ -64,7 +60,7 @@ class PersonDetector:
         from ultralytics import YOLO  # lazy
         self.model = YOLO(cfg.model)
 
-    def detect(self, frame_bgr) -> List[PersonBox]:
+    def detect(self, frame_bgr) -> BoxBatch:
         # Phase-2 (v3): when a tracker is configured, use YOLO.track for persistent
         # IDs; fail-open to plain predict on any error or when tracker is None so the
         # default path is byte-identical to before. Adapted from Kimi's Phase-B draft.
@@ -76,7 +72,7 @@ class PersonDetector:
                 print(f"[detector] tracker failed ({e}), falling back to predict")
         return self._predict(frame_bgr)
 
-    def _predict(self, frame_bgr) -> List[PersonBox]:
+    def _predict(self, frame_bgr) -> BoxBatch:
         res = self.model.predict(
             frame_bgr,
             conf=self.cfg.conf,
@@ -86,7 +82,20 @@ class PersonDetector:
         )
         return self._boxes_from_result(res)
 
-    def _track(self, frame_bgr, tracker: str) -> List[PersonBox]:
+    def detect_batch(self, images) -> List[BoxBatch]:
+        """One predict() over several crops (user-017). Always plain predict:
+        ByteTrack state is per video stream, so batched crops carry no
+        track_id (detector.box_tracker supplies persistent ids instead)."""
+        res = self.model.predict(
+            list(images),
+            conf=self.cfg.conf,
+            classes=[self.cfg.person_class],
+            imgsz=self.cfg.imgsz,
+            verbose=False,
+        )
+        return [self._boxes_from_result([r]) for r in res]
+
+    def _track(self, frame_bgr, tracker: str) -> BoxBatch:
         res = self.model.track(
             frame_bgr,
             conf=self.cfg.conf,
@@ -98,17 +107,25 @@ class PersonDetector:
         )
         return self._boxes_from_result(res, with_track=True)
 
-    def _boxes_from_result(self, res, with_track: bool = False) -> List[PersonBox]:
-        out: List[PersonBox] = []
+    def _boxes_from_result(self, res, with_track: bool = False) -> BoxBatch:
         if not res:
-            return out
-        r = res[0]
-        if r.boxes is None:
-            return out
-        for b in r.boxes:
-            x1, y1, x2, y2 = b.xyxy[0].tolist()
-            tid = None
-            if with_track and b.id is not None:
-                tid = int(b.id[0])
-            out.append(PersonBox(x1, y1, x2, y2, float(b.conf[0]), track_id=tid))
-        return out
+            return BoxBatch()
+        b = res[0].boxes
+        if b is None or len(b) == 0:
+            return BoxBatch()
+        tid = b.id.cpu().numpy() if with_track and b.id is not None else None
+        return BoxBatch.from_arrays(b.xyxy.cpu().numpy(), b.conf.cpu().numpy(), tid)
+
+
+# detector.backend values. "ultralytics" is YOLO.predict/track (legacy);
+# "onnx"/"tensorrt" run the exported model through detector_onnx (user-006).
+BACKENDS = ("ultralytics", "onnx", "tensorrt")
+
+
+def make_detector(cfg):
+    """Build the detector selected by cfg.backend (lazy backend imports)."""
+    backend = getattr(cfg, "backend", "ultralytics")
+    if backend in ("onnx", "tensorrt"):
+        from .detector_onnx import OnnxPersonDetector
+        return OnnxPersonDetector(cfg)
+    return PersonDetector(cfg)
@@ -0,0 +1,194 @@
+"""
+Batched multi-ROI person detection (user-017).
+
+One inference used to see one region: the arbiter's GPS search ROI when
+fusion.gps_roi_enabled, else the whole frame letterboxed down to
+detector.imgsz, where a distant foiler is a handful of pixels. With
+detector.multi_crop the detector instead gets a list of regions per run:
+
+  - the GPS search ROI (compute_roi_crop of the arbiter's search_roi), when
+    GPS-cued cropping is on and the arbiter emitted one;
+  - a square around the current fused target, crop_scale x the target's
+    larger side (at least crop_min_px), so the subject is seen near native
+    resolution;
+  - the full frame, as the coarse view that still finds anything new.
+
+All of them go through the detector's detect_batch() — one batched
+model call where the backend supports it, else one detect() per crop — and
+the boxes are offset back to frame pixels and merged with cross-crop NMS, so a
+person seen by two crops yields one box (the higher-confidence one).
+
+Tiled sweep (user-018): a foiler at 250 m on the wide sub-stream is a few
+dozen pixels tall, below what YOLO resolves after the frame is letterboxed
+to imgsz. With detector.tiling, while the subject is far (estimator or GPS
+range >= tile_range_m) and no person box was found, each run instead detects
+on the next tiles_per_run overlapping tile_px squares of tile_grid(),
+round-robin, and TileSweep stitches them with the other tiles' boxes younger
+than tile_max_age_sec (same NMS), so one loop pays for one or two tiles and
+a full sweep still covers the frame. Once a tile finds the person, runs stay
+on a target_crop around that box (at least tile_px) while the subject is far
+— never back to the full frame that could not resolve it — and the sweep
+resumes when the box is lost. Only sweep runs are stitched: the worker
+carries the marker with each submission (DetectionResult.tiled). An earlier
+tile's boxes are in the image it was inferred on, so they are moved into the
+current run's image (box_motion, user-008) from the two encoder poses, or
+dropped when that cannot be done, and nothing older than one full sweep is
+kept — a tile re-inferred since supersedes it.
+
+Blob proposals (user-019): the orange blob is the cheapest strong cue, yet
+confirming it cost a whole-frame run. With detector.proposals, whenever
+color found blobs, a run instead detects only on squares around the
+proposal_k largest of them — proposal_scale x the blob's larger side (a vest
+patch is a fraction of the person), at least proposal_min_px — batched like
+the crops above. The boxes feed fusion's blob x person confirmation as usual,
+from crops that keep the subject near native resolution. The GPS search ROI
+joins the batch when there is one, and every proposal_full_every-th run the
+full frame does too: larger distractor blobs must not keep YOLO off the
+subject, nor starve the person-only fallback.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .detections import BoxBatch, blob_rects
+from .detector_onnx import nms
+
+# (x1, y1, x2, y2) pixel crop; None = the full frame.
+Crop = Optional[Tuple[int, int, int, int]]
+
+
+def target_crop(bbox, frame_w: int, frame_h: int, scale: float,
+                min_px: int) -> Crop:
+    """Square crop around an (x, y, w, h) target, shifted to stay inside the
+    frame; None when it would cover the whole frame anyway."""
+    x, y, bw, bh = bbox
+    side = int(max(scale * max(bw, bh), min_px))
+    side = min(side, frame_w, frame_h)
+    cx, cy = x + bw / 2.0, y + bh / 2.0
+    x1 = int(min(max(0, cx - side / 2.0), frame_w - side))
+    y1 = int(min(max(0, cy - side / 2.0), frame_h - side))
+    if side >= frame_w and side >= frame_h:
+        return None
+    return (x1, y1, x1 + side, y1 + side)
+
+
+def plan_crops(frame_w: int, frame_h: int, gps_crop: Crop, target_bbox,
+               scale: float, min_px: int) -> List[Crop]:
+    """The regions for one run: GPS ROI, target crop, full frame (None)."""
+    crops: List[Crop] = []
+    if gps_crop is not None:
+        crops.append(tuple(gps_crop))          # type: ignore[arg-type]
+    if target_bbox is not None:
+        tc = target_crop(target_bbox, frame_w, frame_h, scale, min_px)
+        if tc is not None and tc not in crops:
+            crops.append(tc)
+    crops.append(None)
+    return crops
+
+
+def blob_crops(blobs, frame_w: int, frame_h: int, k: int, scale: float,
+               min_px: int) -> List[Crop]:
+    """Person-sized squares around the k largest blobs, largest first."""
+    crops: List[Crop] = []
+    for rect in blob_rects(blobs[:k]):
+        c = target_crop(rect, frame_w, frame_h, scale, min_px)
+        if c not in crops:
+            crops.append(c)
+    return crops
+
+
+def merge_boxes(batches: Sequence[BoxBatch], iou: float) -> BoxBatch:
+    """Concatenate frame-space batches and suppress cross-crop duplicates."""
+    data = np.concatenate([b.data for b in batches]) if batches else np.zeros((0, 6))
+    if not len(data):
+        return BoxBatch()
+    keep = nms(data[:, :4], data[:, 4], iou)
+    return BoxBatch(data[keep])
+
+
+def detect_crops(detect: Callable, frame: np.ndarray, crops: Sequence[Crop],
+                 iou: float, detect_batch: Optional[Callable] = None) -> BoxBatch:
+    """Run every crop (batched when detect_batch is given) and merge."""
+    images = [frame if c is None else frame[c[1]:c[3], c[0]:c[2]] for c in crops]
+    results = detect_batch(images) if detect_batch is not None else [detect(im) for im in images]
+    return merge_boxes([BoxBatch.of(r) if c is None else BoxBatch.of(r).offset(c[0], c[1])
+                        for r, c in zip(results, crops)], iou)
+
+
+def _starts(length: int, side: int, stride: int) -> List[int]:
+    starts = list(range(0, max(1, length - side + 1), stride))
+    if starts[-1] + side < length:
+        starts.append(length - side)           # last tile flush with the edge
+    return starts
+
+
+def tile_grid(frame_w: int, frame_h: int, tile_px: int, overlap: float) -> List[Crop]:
+    """Overlapping square tiles covering the frame, row-major."""
+    side = max(1, min(int(tile_px), frame_w, frame_h))
+    stride = max(1, int(side * (1.0 - min(max(overlap, 0.0), 0.9))))
+    return [(x, y, x + side, y + side)
+            for y in _starts(frame_h, side, stride) for x in _starts(frame_w, side, stride)]
+
+
+class TileSweep:
+    """Round-robin over tile_grid(), tiles_per_run tiles per detector run."""
+
+    def __init__(self, tile_px: int = 320, overlap: float = 0.25, per_run: int = 2,
+                 max_age_sec: float = 0.5, iou: float = 0.5) -> None:
+        self.tile_px = tile_px
+        self.overlap = overlap
+        self.per_run = max(1, per_run)
+        self.max_age_sec = max_age_sec
+        self.iou = iou
+        self._grid: List[Crop] = []
+        self._shape: Optional[Tuple[int, int]] = None
+        self._next = 0
+        self._recent: Deque[Tuple[float, Optional[tuple], BoxBatch]] = deque()
+
+    @property
+    def frame_size(self) -> Optional[Tuple[int, int]]:
+        """(w, h) of the grid in use, once next() has run."""
+        return self._shape
+
+    def next(self, frame_w: int, frame_h: int) -> List[Crop]:
+        """The next per_run tiles of the round-robin."""
+        if self._shape != (frame_w, frame_h):
+            self._shape = (frame_w, frame_h)
+            self._grid = tile_grid(frame_w, frame_h, self.tile_px, self.overlap)
+            self._next = 0
+            self._recent.clear()
+        n = min(self.per_run, len(self._grid))
+        out = [self._grid[(self._next + i) % len(self._grid)] for i in range(n)]
+        self._next = (self._next + n) % len(self._grid)
+        return out
+
+    def stitch(self, boxes: BoxBatch, t: float, pose: Optional[tuple] = None,
+               shift: Optional[Callable] = None) -> BoxBatch:
+        """This run's frame-space boxes merged with the earlier tiles' boxes
+        younger than max_age_sec and than one sweep, in this run's image.
+
+        pose is the run's encoder pose (None: no PTZ, a still camera). An
+        earlier tile at the same pose is taken as is; otherwise shift(boxes,
+        then_pose, age_sec) must map it into this run's image, and a tile it
+        cannot map (None, or no shift) is dropped."""
+        self._recent.append((t, pose, boxes))
+        runs = -(-len(self._grid) // self.per_run) if self._grid else None
+        while self._recent and (t - self._recent[0][0] > self.max_age_sec
+                                or (runs is not None and len(self._recent) > runs)):
+            self._recent.popleft()
+        parts = []
+        for t_then, then, b in list(self._recent)[:-1]:
+            if then == pose:
+                parts.append(b)
+            elif shift is not None and then is not None and pose is not None:
+                moved = shift(b, then, t - t_then)
+                if moved is not None:
+                    parts.append(moved)
+        parts.append(boxes)
+        return merge_boxes(parts, self.iou)
+
+    def reset(self) -> None:
+        self._recent.clear()
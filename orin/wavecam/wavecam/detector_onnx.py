@@ -0,0 +1,193 @@
+"""
+ONNX Runtime detector backend (detector.backend: onnx | tensorrt). Runs an
+exported YOLO model directly, skipping Ultralytics' per-call letterbox,
+Results construction and per-box .tolist() loop (user-006).
+
+  - letterbox: one cv2.resize straight into a preallocated canvas, then a
+    single vectorized BGR->RGB / HWC->CHW / 1/255 pass into the preallocated
+    float32 input tensor. Nothing is allocated per frame on the input side.
+  - outputs: both export layouts are decoded with NumPy —
+      raw      (1, 4 + nc, N)  cx,cy,w,h + class scores  -> class filter + nms()
+      end2end  (1, K, 6)       x1,y1,x2,y2,conf,cls (YOLO26 / nms=True export)
+  - detect_batch() letterboxes several crops into one (B, 3, S, S) tensor and
+    runs them in one call when the export has a dynamic batch axis (user-017).
+  - "tensorrt" is ORT's TensorRT execution provider (engine cache next to the
+    .onnx), falling back to CUDA then CPU — the raw TensorRT API would add a
+    pycuda dependency for the same kernels.
+
+Returns the same BoxBatch as PersonDetector. No tracker: persistent
+ids need Ultralytics' ByteTrack, so detector.tracker is ignored here.
+onnxruntime is imported lazily, like ultralytics in detector.py.
+"""
+from __future__ import annotations
+
+import os
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .detections import BoxBatch
+from .detector import _check_model_path
+
+LETTERBOX_FILL = 114                 # Ultralytics' pad value; the model was trained on it
+NMS_IOU = 0.45
+
+_PROVIDERS = {
+    "onnx": ["CPUExecutionProvider"],
+    "tensorrt": ["TensorrtExecutionProvider", "CUDAExecutionProvider",
+                 "CPUExecutionProvider"],
+}
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou: float = NMS_IOU) -> np.ndarray:
+    """Greedy non-max suppression. boxes (N, 4) x1,y1,x2,y2; returns the kept
+    indices, highest score first."""
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = np.maximum(0.0, x2 - x1) * np.maximum(0.0, y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+        h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+        inter = w * h
+        union = areas[i] + areas[rest] - inter
+        order = rest[inter <= iou * np.maximum(union, 1e-9)]
+    return np.asarray(keep, dtype=np.intp)
+
+
+class Letterbox:
+    """Preallocated square letterbox for a fixed imgsz. fill() writes the model
+    input for one frame and returns (scale, pad_x, pad_y) for un-mapping."""
+
+    def __init__(self, imgsz: int) -> None:
+        self.imgsz = int(imgsz)
+        self.canvas = np.full((self.imgsz, self.imgsz, 3), LETTERBOX_FILL, dtype=np.uint8)
+        self.input = np.empty((1, 3, self.imgsz, self.imgsz), dtype=np.float32)
+        self._shape: Optional[Tuple[int, int]] = None
+        self._geom = (1.0, 0, 0, self.imgsz, self.imgsz)
+
+    def _layout(self, h: int, w: int) -> None:
+        s = self.imgsz
+        r = min(s / h, s / w)
+        nw, nh = max(1, int(round(w * r))), max(1, int(round(h * r)))
+        px, py = (s - nw) // 2, (s - nh) // 2
+        self.canvas[...] = LETTERBOX_FILL        # only on a source-size change
+        self._shape = (h, w)
+        self._geom = (r, px, py, nw, nh)
+
+    def fill(self, frame_bgr: np.ndarray) -> Tuple[float, int, int]:
+        h, w = frame_bgr.shape[:2]
+        if self._shape != (h, w):
+            self._layout(h, w)
+        r, px, py, nw, nh = self._geom
+        cv2.resize(frame_bgr, (nw, nh), dst=self.canvas[py:py + nh, px:px + nw],
+                   interpolation=cv2.INTER_LINEAR)
+        # BGR->RGB + HWC->CHW as a strided view, then one scaled copy.
+        np.multiply(self.canvas[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0,
+                    out=self.input[0], casting="unsafe")
+        return r, px, py
+
+
+def decode_output(out: np.ndarray, person_class: int, conf: float,
+                  iou: float = NMS_IOU) -> Tuple[np.ndarray, np.ndarray]:
+    """Model output -> (boxes (M, 4) x1,y1,x2,y2 in letterbox px, scores (M,))."""
+    out = out[0] if out.ndim == 3 else out
+    if out.shape[-1] == 6 and out.shape[0] > out.shape[1]:
+        # end2end: already NMS'd, one row per detection
+        sel = (out[:, 5].astype(np.int64) == person_class) & (out[:, 4] >= conf)
+        return out[sel, :4].astype(np.float32), out[sel, 4].astype(np.float32)
+    # raw: (4 + nc, N) channel-major
+    scores = out[4 + person_class]
+    sel = scores >= conf
+    if not sel.any():
+        return np.empty((0, 4), np.float32), np.empty(0, np.float32)
+    cx, cy, bw, bh = out[0, sel], out[1, sel], out[2, sel], out[3, sel]
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+    scores = scores[sel]
+    keep = nms(boxes, scores, iou)
+    return boxes[keep].astype(np.float32), scores[keep].astype(np.float32)
+
+
+class OnnxPersonDetector:
+    """Drop-in for PersonDetector over an ONNX Runtime session."""
+
+    def __init__(self, cfg, session=None) -> None:
+        self.cfg = cfg
+        self.backend = getattr(cfg, "backend", "onnx")
+        if session is None:
+            session = self._open_session(cfg.model, self.backend)
+        self.session = session
+        self._in_name = session.get_inputs()[0].name
+        self._out_name = session.get_outputs()[0].name
+        if getattr(cfg, "tracker", None):
+            print(f"[detector] {self.backend} backend has no tracker; "
+                  f"detector.tracker={cfg.tracker!r} ignored")
+        self._lb = Letterbox(self._model_imgsz(session, int(cfg.imgsz)))
+        batch = session.get_inputs()[0].shape[0]
+        self._dynamic_batch = not (isinstance(batch, int) and batch == 1)
+        self._batch_input: Optional[np.ndarray] = None
+        self._batch_lbs: List[Letterbox] = []
+
+    @staticmethod
+    def _open_session(model: str, backend: str):
+        _check_model_path(model)
+        import onnxruntime as ort  # lazy
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        available = set(ort.get_available_providers())
+        providers = [p for p in _PROVIDERS.get(backend, _PROVIDERS["onnx"]) if p in available]
+        if "TensorrtExecutionProvider" in providers:
+            cache = os.path.dirname(os.path.abspath(model))
+            providers[providers.index("TensorrtExecutionProvider")] = (
+                "TensorrtExecutionProvider",
+                {"trt_engine_cache_enable": True, "trt_engine_cache_path": cache,
+                 "trt_fp16_enable": True})
+        return ort.InferenceSession(model, sess_options=opts,
+                                    providers=providers or ["CPUExecutionProvider"])
+
+    @staticmethod
+    def _model_imgsz(session, fallback: int) -> int:
+        """A static export pins the input size; honour it over detector.imgsz."""
+        shape = session.get_inputs()[0].shape
+        side = shape[-1] if len(shape) == 4 else None
+        return int(side) if isinstance(side, int) and side > 0 else fallback
+
+    def detect(self, frame_bgr) -> BoxBatch:
+        r, px, py = self._lb.fill(frame_bgr)
+        out = self.session.run([self._out_name], {self._in_name: self._lb.input})[0]
+        return self._unmap(np.asarray(out), frame_bgr.shape, r, px, py)
+
+    def detect_batch(self, images) -> List[BoxBatch]:
+        """One session run over several crops (user-017) when the export has
+        a dynamic batch axis; a static batch-1 export runs them in turn."""
+        if not self._dynamic_batch or len(images) < 2:
+            return [self.detect(im) for im in images]
+        n = len(images)
+        if self._batch_input is None or len(self._batch_input) < n:
+            s = self._lb.imgsz
+            self._batch_input = np.empty((n, 3, s, s), np.float32)
+            self._batch_lbs = [Letterbox(s) for _ in range(n)]
+            for i, lb in enumerate(self._batch_lbs):
+                lb.input = self._batch_input[i:i + 1]
+        geoms = [lb.fill(im) for lb, im in zip(self._batch_lbs, images)]
+        out = np.asarray(self.session.run([self._out_name],
+                                          {self._in_name: self._batch_input[:n]})[0])
+        return [self._unmap(out[i:i + 1], im.shape, *g)
+                for i, (im, g) in enumerate(zip(images, geoms))]
+
+    def _unmap(self, out: np.ndarray, shape, r: float, px: int, py: int) -> BoxBatch:
+        boxes, scores = decode_output(out, int(self.cfg.person_class), float(self.cfg.conf))
+        if len(boxes) == 0:
+            return BoxBatch()
+        # letterbox px -> frame px, clipped, in one vectorized pass
+        h, w = shape[:2]
+        boxes -= np.array([px, py, px, py], dtype=np.float32)
+        boxes /= r
+        np.clip(boxes, 0.0, np.array([w, h, w, h], dtype=np.float32), out=boxes)
+        return BoxBatch.from_arrays(boxes, scores)
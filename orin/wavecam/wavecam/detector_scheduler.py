@@ -0,0 +1,153 @@
+"""
+Detector scheduling. detector.schedule: "fixed" is the legacy
+`frame_i % every_n == 0` cadence; "adaptive" decides per frame from what the
+loop already knows, spending YOLO where it buys an acquisition and saving it
+where color-only tracking is already enough (user-007):
+
+  searching / coasting / GPS owns (handoff) -> as fast as the budget allows
+  camera moving                             -> tracking_interval_sec (M5 discards
+                                               cached boxes under motion anyway)
+  tracking, color and person disagree       -> tracking_interval_sec
+  tracking, color + person matched, still   -> locked_interval_sec
+
+Every decision is capped by the inference budget: with an EMA of the measured
+inference time L, runs are spaced at least L / budget_frac apart, so YOLO never
+takes more than budget_frac of wall time (the loop's, when inline; the GPU's,
+with the async worker). The chosen rate and the reason are published in status.
+
+Scene-motion gate (user-020): parked between sets with nobody in frame, both
+schedules still ran YOLO on a static seascape. With detector.motion_gate,
+MotionGate measures how much the frame changed since the LAST INFERENCE (mean
+absolute difference of a 64 x 36 grey thumbnail, ~0.2 ms), so a slow walk
+into frame still accumulates. While SEARCHING, with the camera stopped and no
+GPS handoff, a scene below motion_threshold skips the run ("static") — but
+never for longer than 1 / motion_min_hz, the guaranteed minimum rate.
+"""
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Camera counts as "moving" for this long after the last non-stop command.
+MOTION_HOLD_SEC = 0.5
+_LAT_ALPHA = 0.2                 # EMA weight of a new inference-time sample
+_RATE_ALPHA = 0.2                # EMA weight of a new run-to-run interval
+MOTION_THUMB = (64, 36)          # MotionGate thumbnail (w, h)
+
+
+class MotionGate:
+    def __init__(self, threshold: float = 2.0) -> None:
+        self.threshold = threshold
+        self.energy: Optional[float] = None
+        self._thumb: Optional[np.ndarray] = None
+        self._ref: Optional[np.ndarray] = None
+
+    def update(self, frame: np.ndarray) -> float:
+        """Mean |grey difference| (0-255) of this frame vs the last marked
+        one; inf until a reference exists."""
+        tw, th = MOTION_THUMB
+        # linear to 4x then area: averages ~64 samples per cell at a tenth
+        # of a full-frame INTER_AREA
+        small = cv2.resize(frame, (tw * 4, th * 4), interpolation=cv2.INTER_LINEAR)
+        small = cv2.resize(small, (tw, th), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        self._thumb = small
+        if self._ref is None:
+            self.energy = float("inf")
+        else:
+            self.energy = float(cv2.absdiff(small, self._ref).mean())
+        return self.energy
+
+    @property
+    def static(self) -> bool:
+        return self.energy is not None and self.energy < self.threshold
+
+    def mark(self) -> None:
+        """The current frame was sent to the detector: diff against it now."""
+        self._ref = self._thumb
+
+
+class DetectorScheduler:
+    def __init__(self, cfg) -> None:
+        self.cfg = cfg
+        self._last_run: Optional[float] = None
+        self._lat: Optional[float] = None
+        self._interval: Optional[float] = None
+        self.reason = "fixed"
+
+    @property
+    def adaptive(self) -> bool:
+        return getattr(self.cfg, "schedule", "fixed") == "adaptive"
+
+    def observe_latency(self, sec: Optional[float]) -> None:
+        """Feed one measured inference duration (inline detect() or worker)."""
+        if sec is None or sec < 0:
+            return
+        self._lat = sec if self._lat is None else \
+            (1 - _LAT_ALPHA) * self._lat + _LAT_ALPHA * sec
+
+    def budget_interval(self) -> float:
+        """Shortest spacing the inference budget allows."""
+        frac = float(getattr(self.cfg, "budget_frac", 0.5))
+        if self._lat is None or frac <= 0:
+            return 0.0
+        return self._lat / min(1.0, frac)
+
+    def _wanted(self, state: str, matched: bool, moving: bool, owner: str) -> float:
+        if owner == "gps_tracker":
+            self.reason = "gps_handoff"
+            return 0.0
+        if state != "TRACKING":
+            self.reason = state.lower()          # searching / coasting
+            return 0.0
+        if moving:
+            self.reason = "moving"
+            return float(getattr(self.cfg, "tracking_interval_sec", 0.15))
+        if not matched:
+            self.reason = "unmatched"
+            return float(getattr(self.cfg, "tracking_interval_sec", 0.15))
+        self.reason = "locked"
+        return float(getattr(self.cfg, "locked_interval_sec", 0.5))
+
+    def should_run(self, now: float, frame_i: int, state: str = "SEARCHING",
+                   matched: bool = False, moving: bool = False,
+                   owner: str = "idle", static: bool = False) -> bool:
+        """Called once per frame with the loop's frame counter. The fusion
+        inputs describe the PREVIOUS frame (this frame's result isn't known
+        until after detection). static: MotionGate saw no scene change."""
+        if not self.adaptive:
+            self.reason = "fixed"
+            run = (frame_i % max(1, int(self.cfg.every_n))) == 0
+        else:
+            wait = max(self._wanted(state, matched, moving, owner), self.budget_interval())
+            if self.budget_interval() > 0 and wait == self.budget_interval():
+                self.reason += "/budget"
+            run = self._last_run is None or (now - self._last_run) >= wait
+        if run and static and self._skip_static(now, state, moving, owner):
+            self.reason = "static"
+            run = False
+        if run:
+            if self._last_run is not None:
+                dt = now - self._last_run
+                self._interval = dt if self._interval is None else \
+                    (1 - _RATE_ALPHA) * self._interval + _RATE_ALPHA * dt
+            self._last_run = now
+        return run
+
+    def _skip_static(self, now: float, state: str, moving: bool, owner: str) -> bool:
+        if state != "SEARCHING" or moving or owner == "gps_tracker" or self._last_run is None:
+            return False
+        min_hz = float(getattr(self.cfg, "motion_min_hz", 1.0))
+        return min_hz > 0 and (now - self._last_run) < 1.0 / min_hz
+
+    def rate_hz(self, now: Optional[float] = None) -> float:
+        """Smoothed inference rate; decays toward 0 once runs stop."""
+        if self._interval is None or self._last_run is None:
+            return 0.0
+        now = time.time() if now is None else now
+        gap = max(self._interval, now - self._last_run)
+        return 1.0 / gap if gap > 0 else 0.0
@@ -0,0 +1,141 @@
+"""
+Asynchronous detector worker. Inline YOLO stalls color tracking and the servo
+for the whole TensorRT call every detector.every_n frames; with
+detector.async_worker the loop instead submit()s a frame lease to a one-slot
+mailbox and keeps running color + fusion + servo at full rate (user-005).
+
+The mailbox holds only the newest submission: a frame submitted while the
+worker is busy replaces (and releases) any frame still waiting, so the worker
+always infers on the freshest frame and never works through a backlog. Results
+are tagged with the source frame's sequence number and decode time — the M5
+stale-box check compares commands against WHEN THE FRAME WAS CAPTURED, not
+when the boxes happened to reach the loop.
+
+The worker holds two ring slots at most (one inferring, one waiting), which is
+why the pipeline widens the grabber ring when this is on.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Tuple
+
+from .detections import BoxBatch
+from .detector import offset_boxes
+from .detector_crops import detect_crops
+
+# Ring slots the worker can pin on top of the loop's own lease.
+WORKER_RING_SLOTS = 2
+
+
+@dataclass
+class DetectionResult:
+    boxes: BoxBatch = field(default_factory=BoxBatch)
+    seq: int = 0                       # FrameLease.seq of the source frame
+    t: float = 0.0                     # decode wall-clock of the source frame
+    done_t: float = 0.0                # time.time() when the boxes were published
+    infer_sec: float = 0.0             # detect() duration, for the scheduler budget
+    pose: Optional[tuple] = None       # caller's encoder pose at submit (user-008)
+    tiled: bool = False                # boxes are one tile-sweep run's (user-018)
+
+
+class DetectorWorker(threading.Thread):
+    """One inference thread over a latest-frame mailbox. `detect` is the
+    detector's detect(frame) -> BoxBatch; it is only ever called from
+    this thread (tracker state in YOLO.track is not thread-safe)."""
+
+    def __init__(self, detect: Callable, perf=None, stages=None,
+                 detect_batch: Optional[Callable] = None, crop_iou: float = 0.5) -> None:
+        super().__init__(daemon=True, name="detector-worker")
+        self._detect = detect
+        self._detect_batch = detect_batch
+        self._crop_iou = crop_iou
+        self._perf = perf
+        self._stages = stages
+        self._lock = threading.Lock()
+        self._cv = threading.Condition(self._lock)
+        self._pending: Optional[Tuple[object, object, Optional[tuple], bool]] = None
+        self._result: Optional[DetectionResult] = None
+        # NOT named _stop: shadows threading.Thread._stop() (M22).
+        self._stop_evt = threading.Event()
+        self._busy = False
+        self._submitted = 0
+        self._dropped = 0              # submissions replaced before inference
+        self._errors = 0
+
+    def submit(self, lease, crop=None, pose: Optional[tuple] = None,
+               tiled: bool = False) -> None:
+        """Hand a frame lease (ownership transfers to the worker) and an
+        optional (x1, y1, x2, y2) pixel crop, or a list of crops (None = full
+        frame) to detect in one batch (user-017). `pose` and `tiled` are
+        passed through to the result untouched. Replaces any frame still
+        waiting."""
+        with self._lock:
+            old, self._pending = self._pending, (lease, crop, pose, tiled)
+            self._submitted += 1
+            if old is not None:
+                self._dropped += 1
+            self._cv.notify()
+        if old is not None:
+            old[0].release()
+
+    def latest(self) -> Optional[DetectionResult]:
+        with self._lock:
+            return self._result
+
+    def run(self) -> None:
+        while True:
+            with self._lock:
+                while self._pending is None and not self._stop_evt.is_set():
+                    self._cv.wait(0.5)
+                if self._stop_evt.is_set():
+                    break
+                (lease, crop, pose, tiled), self._pending = self._pending, None
+                self._busy = True
+            try:
+                self._infer(lease, crop, pose, tiled)
+            finally:
+                lease.release()
+                with self._lock:
+                    self._busy = False
+        with self._lock:
+            left, self._pending = self._pending, None
+        if left is not None:
+            left[0].release()
+
+    def _infer(self, lease, crop, pose: Optional[tuple] = None, tiled: bool = False) -> None:
+        t_start = time.perf_counter()
+        try:
+            if isinstance(crop, list):
+                boxes = detect_crops(self._detect, lease.image, crop, self._crop_iou,
+                                     self._detect_batch)
+            elif crop is not None:
+                x1, y1, x2, y2 = crop
+                boxes = offset_boxes(self._detect(lease.image[y1:y2, x1:x2]), x1, y1)
+            else:
+                boxes = self._detect(lease.image)
+        except Exception as e:  # pragma: no cover - mirrors the inline path
+            self._errors += 1
+            print(f"[detector-worker] YOLO inference error: {e}")
+            return
+        done = time.time()
+        infer_sec = time.perf_counter() - t_start
+        if self._stages is not None:
+            self._stages.observe("yolo_infer", infer_sec)
+        if self._perf is not None:
+            self._perf.since("frame_to_boxes", lease.t or None, done)
+        with self._lock:
+            self._result = DetectionResult(boxes=boxes, seq=lease.seq,
+                                           t=lease.t or done, done_t=done,
+                                           infer_sec=infer_sec, pose=pose, tiled=tiled)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"submitted": self._submitted, "dropped": self._dropped,
+                    "errors": self._errors, "busy": self._busy}
+
+    def stop(self) -> None:
+        self._stop_evt.set()
+        with self._lock:
+            self._cv.notify_all()
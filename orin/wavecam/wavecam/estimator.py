@@ -223,7 +223,9 @@ class TargetEstimator:
             self._t_last = now
             return
         dt = max(0.0, now - self._t_last)
-        self._t_last = now
+        # an observation stamped before the last update (user-024: a frame's
+        # decode time) is fused at the current state; the clock never rewinds
+        self._t_last = max(self._t_last, now)
         if dt <= 0.0:
             return
 
@@ -315,7 +317,8 @@ class TargetEstimator:
             pixel_cx: blob centre x in pixels.
             frame_w: frame width in pixels.
             zoom_enc: current zoom encoder (for FOV interpolation).
-            now: current time.
+            now: observation time (the frame's decode time with
+                ptz.align_encoders).
         """
         if not self._enabled or not self._initialised:
             return
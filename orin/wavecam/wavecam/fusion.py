@@ -20,17 +20,40 @@ P2 GPS-cue boost (gps_cue_px in update()):
   applied when gps_cue_px is not None (caller gates it on GPS ownership), so a
   random orange object cannot self-lock when GPS isn't directing the camera.
 
+Candidate scoring is vectorized (user-014): each frame builds the blob
+centres, person centres/aim points and scale-aware match radii once, then the
+persons x blobs distance matrix and every nearest-to-EMA / nearest-to-cue pick
+are single NumPy reductions (argmin keeps the first of equal minima, exactly
+like the min() scans they replace), so cost no longer grows as a Python loop
+over blobs x persons. BoxBatch / BlobBatch inputs (user-016) are read straight
+from their columns; only the chosen candidate is ever materialized as a
+PersonBox / Blob. Plain lists take the per-item path they always did.
+Below SCALAR_MAX_PAIRS blob x person pairs — the usual 1-3 blobs and one
+person — building the arrays costs more than it saves, so the same selection
+runs on plain tuples (same first-of-equal-minima picks) instead.
+
+With fusion.multi_target (user-015) the frame's blobs and persons first go
+through MultiTargetTracker (multi_target.py), which keeps a few candidate
+tracks, assigns them globally each frame and picks the subject track — by
+operator pin, GPS cue or continuity. The selection below then runs on that
+track's candidate only, so the result is the legacy single-target one for
+the chosen subject.
+
 Returns a FusionResult the controller and overlay consume.
 """
 from __future__ import annotations
 import math
 import time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
 
-if TYPE_CHECKING:                       # type-only: keeps fusion importable cv2-free
-    from .color_detector import Blob
-    from .detector import PersonBox
+from .detections import BlobBatch, BoxBatch
+from .multi_target import Candidate, MultiTargetTracker
+
+if TYPE_CHECKING:
+    from .detections import Blob, PersonBox
 
 # Confidence model (see test_fusion_invariants.py for the asserted semantics):
 CONF_MATCHED_BASE = 0.5     # color+person agree: 0.5 + 0.5*person_conf — acquires
@@ -73,6 +96,37 @@ class FusionResult:
     has_person: bool = False
     matched: bool = False             # color blob and person box agree
     track_id: Optional[int] = None    # persistent id of the tracked person (None = no tracker)
+    frame_t: Optional[float] = None   # decode wall-clock of the source frame (user-003)
+    subject_id: Optional[int] = None  # multi-target subject track (user-015; None = off)
+
+
+# user-014: up to this many blob x person pairs the per-item scans beat the
+# NumPy setup cost (see _select).
+SCALAR_MAX_PAIRS = 12
+
+
+def _match_radii(cfg, person_bbox_h: np.ndarray) -> np.ndarray:
+    """Vectorized _effective_match_dist over an array of person heights."""
+    base = float(cfg.match_dist)
+    if not bool(getattr(cfg, "match_dist_scale", False)):
+        return np.full(len(person_bbox_h), base)
+    return np.clip(base * (person_bbox_h / MATCH_DIST_SCALE_REF_H),
+                   MATCH_DIST_SCALE_LO, MATCH_DIST_SCALE_HI)
+
+
+def _nearest(points, xy: Tuple[float, float]) -> Tuple[int, float]:
+    """(index, distance) of the first point nearest xy; points is an (N, 2)
+    array or a list of N (x, y) tuples, N > 0."""
+    if not isinstance(points, np.ndarray):
+        best, best_d = 0, math.inf
+        for i, pt in enumerate(points):
+            d = math.hypot(pt[0] - xy[0], pt[1] - xy[1])
+            if d < best_d:
+                best, best_d = i, d
+        return best, best_d
+    d = np.hypot(points[:, 0] - xy[0], points[:, 1] - xy[1])
+    i = int(np.argmin(d))
+    return i, float(d[i])
 
 
 def _dist(a: Tuple[float, float], b: Tuple[float, float]) -> float:
@@ -96,6 +150,28 @@ def _person_center(p) -> Tuple[float, float]:
     return (x + w / 2.0, y + h / 2.0)
 
 
+def _blob_centers(blobs) -> np.ndarray:
+    if isinstance(blobs, BlobBatch):
+        return blobs.centers()
+    return np.array([(b.cx, b.cy) for b in blobs], float).reshape(-1, 2)
+
+
+def _person_arrays(persons) -> Tuple[np.ndarray, np.ndarray]:
+    """(xywh (N, 4) int, centers (N, 2) float) of the person boxes."""
+    if isinstance(persons, BoxBatch):
+        return persons.xywh(), persons.centers()
+    return (np.array([_person_xywh(p) for p in persons], np.int64).reshape(-1, 4),
+            np.array([_person_center(p) for p in persons], float).reshape(-1, 2))
+
+
+def _take(items, mask):
+    """The items where mask is set: a sub-batch for a batch or array, else a
+    list."""
+    if isinstance(items, (BoxBatch, BlobBatch, np.ndarray)):
+        return items[np.asarray(mask, bool)]
+    return [x for x, keep in zip(items, mask) if keep]
+
+
 class Fusion:
     def __init__(self, cfg):
         self.cfg = cfg
@@ -103,21 +179,34 @@ class Fusion:
         self._ema: Optional[Tuple[float, float]] = None
         self._last_seen = 0.0
         self._last_track_id: Optional[int] = None
+        self.targets: Optional[MultiTargetTracker] = \
+            MultiTargetTracker(cfg) if getattr(cfg, "multi_target", False) else None
+
+    def select_subject(self, track_id: Optional[int]) -> bool:
+        """Operator pin of the multi-target subject (None = automatic).
+        False when multi-target is off or the id is not a live track."""
+        return self.targets is not None and self.targets.pin(track_id)
 
-    def _continuity(self, items, center_of):
+    def _continuity(self, items, centers: np.ndarray):
         """Prefer the candidate nearest the last smoothed center (anti-flip);
-        else the first (detector inputs arrive largest-first)."""
+        else the first (detector inputs arrive largest-first). `centers` is
+        the (N, 2) array, or list of tuples, of the items' centers."""
         if self._ema is not None and items:
-            return min(items, key=lambda it: _dist(center_of(it), self._ema))
+            return items[_nearest(centers, self._ema)[0]]
         return items[0]
 
-    def _nearest_person(self, persons, xy) -> Tuple[Optional[PersonBox], float]:
-        best, best_d = None, 1e9
-        for p in persons:
-            d = _dist(self._person_aim(p), xy)
-            if d < best_d:
-                best, best_d = p, d
-        return best, best_d
+    def _nearest_person(self, persons, aims: np.ndarray,
+                        xy) -> Tuple[Optional[PersonBox], float]:
+        if not persons:
+            return None, 1e9
+        i, d = _nearest(aims, xy)
+        return persons[i], d
+
+    def _aims(self, xywh: np.ndarray) -> np.ndarray:
+        """_person_aim over an (N, 4) xywh array."""
+        ax = _clamp01(float(getattr(self.cfg, "person_aim_x", 0.5)))
+        ay = _clamp01(float(getattr(self.cfg, "person_aim_y", 0.5)))
+        return (xywh[:, :2] + xywh[:, 2:] * np.array([ax, ay])).reshape(-1, 2)
 
     def _person_aim(self, p) -> Tuple[float, float]:
         x, y, w, h = _person_xywh(p)
@@ -127,10 +216,23 @@ class Fusion:
 
     def _confirmed(self, blobs, persons):
         """Persons with a color blob within match_dist (orange + YOLO agree)."""
-        return [p for p in persons
-                if any(_dist((b.cx, b.cy), _person_center(p))
-                       <= _effective_match_dist(self.cfg, _person_xywh(p)[3])
-                       for b in blobs)]
+        return _take(persons, self._confirmed_mask(blobs, persons))
+
+    def _confirmed_mask(self, blobs, persons, blob_xy: Optional[np.ndarray] = None,
+                        person_xy: Optional[np.ndarray] = None,
+                        person_h: Optional[np.ndarray] = None) -> np.ndarray:
+        """_confirmed as a mask over persons, from the per-frame arrays when
+        the caller already built them."""
+        if not blobs or not persons:
+            return np.zeros(len(persons), bool)
+        if blob_xy is None:
+            blob_xy = _blob_centers(blobs)
+        if person_xy is None or person_h is None:
+            xywh, person_xy = _person_arrays(persons)
+            person_h = xywh[:, 3].astype(float)
+        d = np.hypot(person_xy[:, None, 0] - blob_xy[None, :, 0],
+                     person_xy[:, None, 1] - blob_xy[None, :, 1])
+        return (d <= _match_radii(self.cfg, person_h)[:, None]).any(axis=1)
 
     def _prefer_track_id(self, persons):
         """Return the person whose track_id matches the last selected box, else None.
@@ -138,11 +240,52 @@ class Fusion:
         flag-off path is byte-identical. (Plan v3 Phase 2; adapted from Kimi.)"""
         if self._last_track_id is None:
             return None
+        if isinstance(persons, BoxBatch):
+            hit = np.nonzero(persons.track_id == self._last_track_id)[0]
+            return persons[int(hit[0])] if len(hit) else None
         for p in persons:
             if getattr(p, "track_id", None) == self._last_track_id:
                 return p
         return None
 
+    def _candidates(self, blobs, persons) -> List[Candidate]:
+        """Per-frame multi-target candidates: each color-confirmed person (at
+        its aim point, with its nearest blob), each blob no person claims, and
+        each person without color."""
+        blob_xy = _blob_centers(blobs)
+        xywh, person_xy = _person_arrays(persons)
+        person_h = xywh[:, 3].astype(float)
+        d = np.hypot(person_xy[:, None, 0] - blob_xy[None, :, 0],
+                     person_xy[:, None, 1] - blob_xy[None, :, 1])
+        near = d <= _match_radii(self.cfg, person_h)[:, None]
+        out = []
+        for i, p in enumerate(persons):
+            if near[i].any():
+                b = blobs[int(np.argmin(np.where(near[i], d[i], np.inf)))]
+                out.append(Candidate(self._person_aim(p), blob=b, person=p, matched=True))
+            else:
+                out.append(Candidate(self._person_aim(p), person=p))
+        for j in np.nonzero(~near.any(axis=0))[0]:
+            b = blobs[int(j)]
+            out.append(Candidate((b.cx, b.cy), blob=b))
+        return out
+
+    def _subject_inputs(self, blobs, persons, gps_cue_px, now: float):
+        """(blobs, persons) of the multi-target subject's candidate."""
+        assert self.targets is not None
+        before = self.targets.subject_id
+        subject = self.targets.update(self._candidates(blobs, persons), now, gps_cue_px)
+        if self.targets.subject_id != before and before is not None:
+            # a new subject must not inherit the old one's smoothed position
+            # or person id
+            self._ema = None
+            self._last_track_id = None
+        cand = subject.candidate if subject is not None else None
+        if cand is None:
+            return [], []
+        return ([cand.blob] if cand.blob is not None else [],
+                [cand.person] if cand.person is not None else [])
+
     def _select(self, blobs, persons,
                 gps_cue_px: Optional[Tuple[float, float, float]] = None):
         """(raw_xy, bbox, person_bbox, conf, matched) by priority + continuity.
@@ -152,16 +295,28 @@ class Fusion:
 
         gps_cue_px = (cue_x, cue_y, radius_px) when the camera is GPS-pointed;
         blobs within radius get a confidence boost (see module docstring)."""
-        confirmed = self._confirmed(blobs, persons)
+        if len(blobs) * max(1, len(persons)) <= SCALAR_MAX_PAIRS:
+            blob_xy = [(b.cx, b.cy) for b in blobs]
+            aims = [self._person_aim(p) for p in persons]
+            ok = [any(_dist(xy, _person_center(p))
+                      <= _effective_match_dist(self.cfg, _person_xywh(p)[3])
+                      for xy in blob_xy) for p in persons]
+        else:
+            blob_xy = _blob_centers(blobs)
+            xywh, person_xy = _person_arrays(persons)
+            person_h = xywh[:, 3].astype(float)
+            aims = self._aims(xywh)
+            ok = self._confirmed_mask(blobs, persons, blob_xy, person_xy, person_h)
+        confirmed = _take(persons, ok)
         if confirmed:
-            p = self._prefer_track_id(confirmed) or self._continuity(confirmed, self._person_aim)
+            p = self._prefer_track_id(confirmed) or self._continuity(confirmed, _take(aims, ok))
             self._last_track_id = getattr(p, "track_id", None)
             bbox = _person_xywh(p)
             return self._person_aim(p), bbox, bbox, CONF_MATCHED_BASE + CONF_MATCHED_BASE * p.conf, True
         if self.cfg.require_person:
             return None, None, None, 0.0, False
         if self._ema is not None and persons:
-            p, d = self._nearest_person(persons, self._ema)
+            p, d = self._nearest_person(persons, aims, self._ema)
             # Prefer the same persistent track over pure proximity (no-op without a tracker)
             same_id = self._prefer_track_id(persons)
             if same_id is not None:
@@ -181,9 +336,9 @@ class Fusion:
                 # No existing EMA track: choose the blob nearest the GPS cue
                 # (camera is already pointed there; prefer that signal over continuity).
                 cx, cy, r = gps_cue_px
-                b = min(blobs, key=lambda x: _dist((x.cx, x.cy), (cx, cy)))
+                b = blobs[_nearest(blob_xy, (cx, cy))[0]]
             else:
-                b = self._continuity(blobs, lambda x: (x.cx, x.cy))
+                b = self._continuity(blobs, blob_xy)
             conf = CONF_SUSTAIN
             if gps_cue_px is not None:
                 cx, cy, r = gps_cue_px
@@ -198,17 +353,22 @@ class Fusion:
                     conf = min(CONF_BOOST_CAP, conf + boost)
             return (b.cx, b.cy), b.bbox, None, conf, False
         if persons:
-            p = self._continuity(persons, self._person_aim)
+            p = self._continuity(persons, aims)
             bbox = _person_xywh(p)
             return self._person_aim(p), bbox, bbox, CONF_PERSON_ONLY, False
         return None, None, None, 0.0, False
 
-    def update(self, blobs: List[Blob], persons: Optional[List[PersonBox]],
-               gps_cue_px: Optional[Tuple[float, float, float]] = None) -> "FusionResult":
+    def update(self, blobs: Sequence[Blob], persons: Optional[Sequence[PersonBox]],
+               gps_cue_px: Optional[Tuple[float, float, float]] = None,
+               frame_t: Optional[float] = None) -> "FusionResult":
+        """frame_t is carried through to the result untouched (latency
+        accounting only); association and grace timing stay on loop time."""
         now = time.time()
         persons = persons or []
         has_color, has_person = len(blobs) > 0, len(persons) > 0
 
+        if self.targets is not None:
+            blobs, persons = self._subject_inputs(blobs, persons, gps_cue_px, now)
         raw_xy, bbox, person_bbox, conf, matched = self._select(blobs, persons, gps_cue_px)
 
         # H5 (audit 2026-07-01): the dropout grace must be evaluated BEFORE the
@@ -255,4 +415,7 @@ class Fusion:
             has_person=has_person,
             matched=matched,
             track_id=self._last_track_id if state != "SEARCHING" else None,
+            frame_t=frame_t,
+            subject_id=(self.targets.subject_id
+                        if self.targets is not None and state != "SEARCHING" else None),
         )
@@ -24,7 +24,7 @@ class BearingCue:
     radius_px: float
 
 
-def _fov_at_zoom(fov_curve: List[Tuple[int, float]], zoom_enc: int) -> float:
+def fov_at_zoom(fov_curve: List[Tuple[int, float]], zoom_enc: int) -> float:
     """Linear interpolation of horizontal FOV (degrees) from the calibration curve."""
     if not fov_curve:
         return 60.0
@@ -70,7 +70,7 @@ def compute_bearing_cue(
         return None
     if not fov_curve:
         return None
-    hfov = _fov_at_zoom(fov_curve, zoom_enc)
+    hfov = fov_at_zoom(fov_curve, zoom_enc)
     if hfov <= 0:
         return None
 
@@ -0,0 +1,242 @@
+"""
+Multi-target layer in front of Fusion (user-015).
+
+Fusion follows ONE EMA target and picks its candidate greedily, so two foilers
+in orange sharing a break can swap the lock between frames. With
+fusion.multi_target, Fusion first turns the frame's blobs and persons into
+candidates and hands them to MultiTargetTracker, which keeps up to max_targets
+candidate tracks alive across frames:
+
+  candidates   a color-confirmed person (aim point, its nearest blob); a blob
+               with no person in range; a person with no color. Only a
+               candidate with color may spawn a track — orange stays the
+               primary cue — but a person-only candidate can continue one.
+               Unlike the legacy path, a lone off-colour person therefore
+               yields no candidate at all (legacy: a 0.2 person-only pick,
+               which never locks but seeds the smoothed position).
+  assignment   tracks x candidates by pixel distance, gated at match_dist, with
+               a shared ByteTrack/box-tracker id counting as distance 0, solved
+               globally each frame (linear_assignment: Hungarian over a matrix
+               of at most max_targets rows, so well inside the frame budget).
+  table        when a color-confirmed person finds every slot taken, the
+               lowest-value track gives its slot up: unmatched, not the
+               subject or pinned, least recently seen. Static orange (buoys,
+               flags) is re-seen every frame and would otherwise hold the
+               table forever.
+  subject      the track that drives VisualServo. The operator may pin one by
+               id (POST /api/v1/tracking/subject) — when that track
+               expires the pin is released and the pipeline records a
+               "subject" event (take_pin_lost()); otherwise the current
+               subject is kept while it lives — unless it is color-only and a
+               matched track is in view — the GPS cue (when gps_tracker owns)
+               picks the track inside its radius, and a fresh pick prefers
+               matched, then longest-lived tracks.
+
+pin() and snapshot() come from API threads while update() runs on the loop
+thread, so the table is guarded by one lock.
+
+Fusion then runs its unchanged single-target selection on the subject's
+candidate alone, so the FusionResult contract (lock hysteresis, grace, EMA,
+confidence model) is exactly the legacy one for the chosen track.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+_INFEASIBLE = 1e9
+
+
+def linear_assignment(cost: np.ndarray) -> List[Tuple[int, int]]:
+    """Minimum-cost one-to-one assignment (Hungarian, O(n^2 m)) of a (N, M)
+    matrix; returns min(N, M) (row, col) pairs sorted by row."""
+    cost = np.asarray(cost, float)
+    if cost.size == 0:
+        return []
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    u, v = np.zeros(n + 1), np.zeros(m + 1)
+    p = np.zeros(m + 1, np.int64)        # p[j]: 1-based row assigned to column j
+    way = np.zeros(m + 1, np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            cand = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(cand)) + 1
+            delta = cand[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = int(way[j0])
+            p[j0] = p[j1]
+            j0 = j1
+    pairs = [(int(p[j]) - 1, j - 1) for j in range(1, m + 1) if p[j]]
+    if transposed:
+        pairs = [(c, r) for r, c in pairs]
+    return sorted(pairs)
+
+
+@dataclass
+class Candidate:
+    xy: Tuple[float, float]
+    blob: object = None                 # color_detector.Blob or None
+    person: object = None               # PersonBox or None
+    matched: bool = False               # color and person agree
+
+
+@dataclass
+class TargetTrack:
+    id: int
+    xy: Tuple[float, float]
+    candidate: Optional[Candidate]      # this frame's candidate; None = unseen
+    first_seen: float
+    last_seen: float
+    matched: bool = False               # last candidate was color+person
+
+
+def _track_key(c: Optional[Candidate]) -> Optional[int]:
+    return None if c is None or c.person is None else getattr(c.person, "track_id", None)
+
+
+class MultiTargetTracker:
+    def __init__(self, cfg) -> None:
+        self.cfg = cfg
+        self.tracks: List[TargetTrack] = []
+        self.subject_id: Optional[int] = None
+        self.pinned_id: Optional[int] = None     # operator choice; None = automatic
+        self.pin_lost: Optional[int] = None      # pinned id that expired, until taken
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def _track(self, track_id: Optional[int]) -> Optional[TargetTrack]:
+        for tr in self.tracks:
+            if tr.id == track_id:
+                return tr
+        return None
+
+    def pin(self, track_id: Optional[int]) -> bool:
+        """Operator subject choice; None returns to automatic selection.
+        False (and no change) when the id is not a live track."""
+        with self._lock:
+            if track_id is not None and self._track(track_id) is None:
+                return False
+            self.pinned_id = track_id
+            if track_id is not None:
+                self.subject_id = track_id
+            return True
+
+    def take_pin_lost(self) -> Optional[int]:
+        """The pinned id whose track expired since the last call, once."""
+        with self._lock:
+            lost, self.pin_lost = self.pin_lost, None
+            return lost
+
+    def _associate(self, cands: List[Candidate]) -> List[Tuple[int, int]]:
+        if not self.tracks or not cands:
+            return []
+        txy = np.array([tr.xy for tr in self.tracks], float)
+        cxy = np.array([c.xy for c in cands], float)
+        cost = np.hypot(txy[:, None, 0] - cxy[None, :, 0], txy[:, None, 1] - cxy[None, :, 1])
+        tkeys = [_track_key(tr.candidate) for tr in self.tracks]
+        for j, c in enumerate(cands):
+            key = _track_key(c)
+            if key is not None:
+                for i, tk in enumerate(tkeys):
+                    if tk == key:
+                        cost[i, j] = 0.0
+        gate = float(self.cfg.match_dist)
+        cost[cost > gate] = _INFEASIBLE
+        return [(r, c) for r, c in linear_assignment(cost) if cost[r, c] < _INFEASIBLE]
+
+    def update(self, cands: List[Candidate], now: float,
+               gps_cue_px: Optional[Tuple[float, float, float]] = None) -> Optional[TargetTrack]:
+        """Associate this frame's candidates, then return the subject track
+        (its .candidate is None while it is unseen) or None."""
+        with self._lock:
+            return self._update(cands, now, gps_cue_px)
+
+    def _update(self, cands: List[Candidate], now: float,
+                gps_cue_px: Optional[Tuple[float, float, float]]) -> Optional[TargetTrack]:
+        pairs = self._associate(cands)
+        for tr in self.tracks:
+            tr.candidate = None
+        for r, c in pairs:
+            tr = self.tracks[r]
+            tr.candidate, tr.xy, tr.last_seen = cands[c], cands[c].xy, now
+            tr.matched = cands[c].matched
+        taken = {c for _, c in pairs}
+        limit = max(1, int(getattr(self.cfg, "max_targets", 4)))
+        for j, c in enumerate(cands):
+            if j in taken or c.blob is None:
+                continue
+            if len(self.tracks) >= limit and not (c.matched and self._evict()):
+                continue
+            self.tracks.append(TargetTrack(self._next_id, c.xy, c, now, now, c.matched))
+            self._next_id += 1
+        grace = float(self.cfg.lost_grace_sec)
+        self.tracks = [tr for tr in self.tracks if now - tr.last_seen <= grace]
+        return self._choose(now, gps_cue_px)
+
+    def _evict(self) -> bool:
+        """Free the lowest-value slot for a matched candidate: an unmatched,
+        unpinned non-subject track, least recently seen first."""
+        spare = [tr for tr in self.tracks if not tr.matched
+                 and tr.id not in (self.subject_id, self.pinned_id)]
+        if not spare:
+            return False
+        self.tracks.remove(min(spare, key=lambda tr: (tr.last_seen, tr.first_seen, tr.id)))
+        return True
+
+    def _choose(self, now: float,
+                gps_cue_px: Optional[Tuple[float, float, float]]) -> Optional[TargetTrack]:
+        if self.pinned_id is not None:
+            pinned = self._track(self.pinned_id)
+            if pinned is not None:
+                self.subject_id = pinned.id
+                return pinned
+            self.pin_lost = self.pinned_id       # the pipeline records the event
+            self.pinned_id = None
+        current = self._track(self.subject_id)
+        seen = [tr for tr in self.tracks if tr.candidate is not None]
+        if current is not None and not current.matched:
+            matched = [tr for tr in seen if tr.matched]
+            if matched:
+                current = min(matched, key=lambda tr: (tr.first_seen, tr.id))
+        if gps_cue_px is not None:
+            cx, cy, r = gps_cue_px
+            in_cue = [tr for tr in seen if math.hypot(tr.xy[0] - cx, tr.xy[1] - cy) <= r]
+            if in_cue and (current is None or current not in in_cue):
+                current = min(in_cue, key=lambda tr: math.hypot(tr.xy[0] - cx, tr.xy[1] - cy))
+        if current is None and seen:
+            current = min(seen, key=lambda tr: (not tr.matched, tr.first_seen, tr.id))
+        self.subject_id = current.id if current is not None else None
+        return current
+
+    def snapshot(self, now: float) -> List[dict]:
+        """Live tracks for the status API."""
+        with self._lock:
+            return [{"id": tr.id, "x": round(tr.xy[0], 1), "y": round(tr.xy[1], 1),
+                     "matched": tr.matched, "seen": tr.candidate is not None,
+                     "age_sec": round(now - tr.first_seen, 2),
+                     "subject": tr.id == self.subject_id, "pinned": tr.id == self.pinned_id}
+                    for tr in self.tracks]
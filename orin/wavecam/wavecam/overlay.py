@@ -1,19 +1,22 @@
 """Draw the annotated debug frame: mask blend, color/person boxes, target,
 center crosshair + deadzone, the PTZ command vector, and a text HUD."""
 from __future__ import annotations
-from typing import List, Optional
+from typing import Optional, Sequence
 
 import cv2
 import numpy as np
 
-from .color_detector import Blob
-from .detector import PersonBox
+from .detections import Blob, PersonBox, blob_rects, box_rows
 from .fusion import FusionResult
 from .controller import PtzCommand
 from .ptz_visca import PAN_RIGHT, TILT_DOWN
 
 _GREEN = (80, 230, 120)
 _TINT: Optional[np.ndarray] = None  # reused mask-tint buffer (pipeline thread only, M7)
+# Reused render target: the loop's frame is a read-only capture lease, so we
+# draw into one persistent buffer instead of a fresh frame.copy() per frame
+# (user-001). Pipeline thread only; valid until the next annotate() call.
+_OUT: Optional[np.ndarray] = None
 _AMBER = (40, 180, 255)
 _CYAN = (220, 210, 60)
 _RED = (60, 60, 255)
@@ -21,11 +24,15 @@ _GREY = (150, 150, 150)
 _WHITE = (240, 240, 240)
 
 
-def annotate(frame: np.ndarray, mask: Optional[np.ndarray], blobs: List[Blob],
-             persons: List[PersonBox], fr: FusionResult, cmd: Optional[PtzCommand],
+def annotate(frame: np.ndarray, mask: Optional[np.ndarray], blobs: Sequence[Blob],
+             persons: Sequence[PersonBox], fr: FusionResult, cmd: Optional[PtzCommand],
              cfg_ptz, hud: dict, show_mask: bool = True,
              person_label: str = "person") -> np.ndarray:
-    out = frame.copy()
+    global _OUT
+    if _OUT is None or _OUT.shape != frame.shape or _OUT.dtype != frame.dtype:
+        _OUT = np.empty_like(frame)
+    out = _OUT
+    np.copyto(out, frame)
     h, w = out.shape[:2]
 
     if show_mask and mask is not None:
@@ -37,16 +44,15 @@ def annotate(frame: np.ndarray, mask: Optional[np.ndarray], blobs: List[Blob],
         else:
             _TINT[:] = 0
         _TINT[mask > 0] = (0, 90, 160)
-        out = cv2.addWeighted(out, 1.0, _TINT, 0.45, 0)
+        cv2.addWeighted(out, 1.0, _TINT, 0.45, 0, dst=out)
 
-    for b in blobs:
-        x, y, bw, bh = b.bbox
+    # user-016: batch inputs are drawn from their columns, no per-box objects
+    for x, y, bw, bh in blob_rects(blobs):
         cv2.rectangle(out, (x, y), (x + bw, y + bh), _AMBER, 1)
 
-    for p in persons:
-        x, y, pw, ph = p.xywh
+    for x, y, pw, ph, conf in box_rows(persons):
         cv2.rectangle(out, (x, y), (x + pw, y + ph), _GREY, 1)
-        cv2.putText(out, f"{person_label} {p.conf:.2f}", (x, max(12, y - 4)),
+        cv2.putText(out, f"{person_label} {conf:.2f}", (x, max(12, y - 4)),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.4, _GREY, 1, cv2.LINE_AA)
 
     # center crosshair + deadzone box
@@ -90,6 +96,11 @@ def annotate(frame: np.ndarray, mask: Optional[np.ndarray], blobs: List[Blob],
     cv2.rectangle(out, (0, 0), (w, 22), (20, 20, 20), -1)
     cv2.putText(out, "  |  ".join(bar), (6, 15),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.45, _WHITE, 1, cv2.LINE_AA)
+    stages = hud.get("stages")
+    if stages:                         # user-004: costliest loop stages, p95
+        cv2.rectangle(out, (0, 22), (w, 40), (20, 20, 20), -1)
+        cv2.putText(out, stages, (6, 35),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, _WHITE, 1, cv2.LINE_AA)
 
     if hud.get("killed"):
         cv2.putText(out, "KILLED", (w // 2 - 60, h // 2 + 60),
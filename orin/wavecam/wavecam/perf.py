@@ -0,0 +1,155 @@
+"""Rolling latency histograms for the vision loop. Each named segment keeps the
+last N samples in a fixed-size ring (no allocation per observe) and reports
+p50/p95/p99 over that window on /api/v1/perf — the numbers to tune every_n,
+ff_gain and decode settings against. Observability only: nothing here feeds
+back into control, and a snapshot never blocks the loop for longer than a copy.
+
+Segments are measured from the frame's decode wall-clock (FrameLease.t), so
+"glass_to_visca" is decode -> pan_tilt() bytes on the socket (user-003; behind
+the ptz.scheduler writer it is recorded at the writer's send, user-021). The
+stream PTS and the decode clock share no epoch, so the RTSP/decode share is
+reported as PtsLag: how far (decode - PTS) sits above its best-seen value —
+jitter-buffer and decoder queueing on top of the unavoidable transit time.
+
+StageClock laps the loop body on the monotonic clock into a second registry,
+one histogram per stage (grab, color, yolo, ...), so a field FPS drop points
+at the stage that ate the budget instead of a guess (user-004).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+# ~30 s of history at the loop's ~35 fps; percentiles over a window this size
+# are stable without hiding a regression for minutes.
+DEFAULT_WINDOW = 1024
+
+
+class LatencyHistogram:
+    """Fixed-size ring of latency samples (seconds). Not thread-safe on its
+    own; PerfRegistry serializes access."""
+
+    __slots__ = ("_buf", "_n", "_i", "_last")
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._buf = np.zeros(max(1, int(window)), dtype=np.float64)
+        self._n = 0                   # samples ever observed
+        self._i = 0                   # next write index
+        self._last = 0.0
+
+    def observe(self, sec: float) -> None:
+        self._buf[self._i] = sec
+        self._i = (self._i + 1) % len(self._buf)
+        self._n += 1
+        self._last = sec
+
+    def summary(self) -> dict:
+        k = min(self._n, len(self._buf))
+        if k == 0:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(self._buf[:k], (50, 95, 99))
+        return {
+            "count": self._n,
+            "window": k,
+            "last_ms": round(self._last * 1000.0, 2),
+            "p50_ms": round(float(p50) * 1000.0, 2),
+            "p95_ms": round(float(p95) * 1000.0, 2),
+            "p99_ms": round(float(p99) * 1000.0, 2),
+            "max_ms": round(float(self._buf[:k].max()) * 1000.0, 2),
+        }
+
+
+class PerfRegistry:
+    """Named LatencyHistograms, created on first observe()."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._lock = threading.Lock()
+        self._window = window
+        self._hist: Dict[str, LatencyHistogram] = {}
+
+    def observe(self, name: str, sec: Optional[float]) -> None:
+        """Record one sample. None / negative (clock step) samples are dropped."""
+        if sec is None or sec < 0:
+            return
+        with self._lock:
+            h = self._hist.get(name)
+            if h is None:
+                h = self._hist[name] = LatencyHistogram(self._window)
+            h.observe(float(sec))
+
+    def since(self, name: str, t_start: Optional[float], now: float) -> None:
+        """observe(name, now - t_start); no-op when t_start is None."""
+        if t_start is not None:
+            self.observe(name, now - t_start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self._hist.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+
+
+class PtsLag:
+    """Excess of (decode wall-clock - stream PTS) over its running minimum.
+    The minimum is the fastest a frame has ever made it through; anything on
+    top is buffering. A PTS that steps backwards (reconnect, stream restart)
+    re-bases the minimum."""
+
+    __slots__ = ("_min", "_last_pts")
+
+    def __init__(self) -> None:
+        self._min: Optional[float] = None
+        self._last_pts: Optional[float] = None
+
+    def update(self, t: float, pts: Optional[float]) -> Optional[float]:
+        if pts is None:
+            return None
+        if self._last_pts is not None and pts < self._last_pts:
+            self._min = None
+        self._last_pts = pts
+        off = t - pts
+        if self._min is None or off < self._min:
+            self._min = off
+        return off - self._min
+
+
+class StageClock:
+    """Lap timer over a PerfRegistry. start() at the top of an iteration, then
+    lap(name) after each stage records the time since the previous mark;
+    mark() moves the mark without recording (a stage that didn't run this
+    frame must not drag its percentiles toward zero)."""
+
+    __slots__ = ("_reg", "_t0", "_t")
+
+    def __init__(self, registry: PerfRegistry) -> None:
+        self._reg = registry
+        self._t0 = self._t = time.perf_counter()
+
+    def start(self) -> None:
+        self._t0 = self._t = time.perf_counter()
+
+    def mark(self) -> None:
+        self._t = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        self._reg.observe(name, now - self._t)
+        self._t = now
+
+    def total(self, name: str) -> None:
+        """Record the time since start() (the whole iteration)."""
+        self._reg.observe(name, time.perf_counter() - self._t0)
+
+
+def hud_line(snapshot: dict, top: int = 4, skip: tuple = ("loop",)) -> str:
+    """Compact "p95 ms" summary of the costliest stages for the preview HUD."""
+    rows = sorted(((v["p95_ms"], k) for k, v in snapshot.items()
+                   if k not in skip and v.get("count")), reverse=True)[:top]
+    if not rows:
+        return ""
+    return "p95ms " + "  ".join(f"{k} {ms:.1f}" for ms, k in rows)
@@ -11,15 +11,22 @@ from typing import Optional
 
 import cv2
 
-from .capture import FrameGrabber
-from .color_detector import ColorDetector
+from .capture import DEFAULT_FRAME_RING, FrameGrabber
+from .color_detector import ColorDetector, pyramid_level
+from .color_roi import ColorRoi
 from .controller import VisualServo, STOP_CMD, PtzAbsoluteCommand
 from .fusion import Fusion
-from .gps_geo import GeoPoint, bearing_deg
+from .gps_geo import GeoPoint, bearing_deg, haversine_m
 from .gps_bearing_cue import compute_bearing_cue
 from .gps_pointing import compute_target, ZoomCurve
 from .overlay import annotate
-from .detector import class_label as _detector_class_label
+from .perf import PerfRegistry, PtsLag, StageClock, hud_line
+from .box_motion import compensate_boxes, conf_decay
+from .box_tracker import BoxTracker
+from .detections import BoxBatch
+from .detector import class_label as _detector_class_label, offset_boxes
+from .detector_crops import TileSweep, blob_crops, detect_crops, plan_crops, target_crop
+from .detector_scheduler import MOTION_HOLD_SEC, DetectorScheduler, MotionGate
 
 
 def _cls_label(cfg) -> str:
@@ -37,6 +44,10 @@ ABS_CMD_KEEPALIVE_SEC = 2.5
 # hands back the same non-None frame forever (ZOMBIE-1). Generous vs the ~35fps
 # loop so a momentary hiccup doesn't drop vision authority.
 CAPTURE_STALE_SEC = 2.0
+# loop.pacing == "frame": longest wait for a new frame before re-running on the
+# newest (possibly frozen) one. Keeps arbiter/GPS/ZOMBIE-1 ticking at >=10 Hz
+# through a wedged stream instead of blocking the loop on the decoder.
+FRAME_WAIT_TIMEOUT_SEC = 0.1
 
 # GPS-cued ROI minimum size (px) — ensures the detector has enough context even
 # when the GPS-predicted position is at a frame edge (review 2026-06-12).
@@ -77,16 +88,6 @@ def compute_roi_crop(
     return (x1, y1, x2, y2)
 
 
-def offset_boxes(boxes: list, x1: int, y1: int) -> list:
-    """Shift PersonBox coordinates from crop space back to full-frame space."""
-    from .detector import PersonBox
-    return [
-        PersonBox(b.x1 + x1, b.y1 + y1, b.x2 + x1, b.y2 + y1, b.conf,
-                  track_id=getattr(b, "track_id", None))
-        for b in boxes
-    ]
-
-
 
 class SharedState:
     def __init__(self):
@@ -130,6 +131,47 @@ class SharedState:
             return dict(self.status)
 
 
+def _make_box_tracker(det_cfg) -> Optional[BoxTracker]:
+    """user-009: the between-detection tracker, or None when it is off."""
+    if not getattr(det_cfg, "box_tracker", False):
+        return None
+    return BoxTracker(iou_thresh=float(getattr(det_cfg, "tracker_iou", 0.3)),
+                      max_age_sec=float(getattr(det_cfg, "tracker_max_age_sec", 0.6)))
+
+
+def _make_motion_gate(det_cfg) -> Optional[MotionGate]:
+    """user-020: the static-scene detector gate, or None when it is off."""
+    if not getattr(det_cfg, "motion_gate", False):
+        return None
+    return MotionGate(float(getattr(det_cfg, "motion_threshold", 2.0)))
+
+
+def _aligned_sample(cfg, ptz_state, t: Optional[float]):
+    """user-024: the PtzState history sample at decode time t, or None
+    (ptz.align_encoders off, no t, or a poller without history). _run takes
+    one per frame and hands it to every encoder consumer of that frame."""
+    if t is None or not getattr(getattr(cfg, "ptz", None), "align_encoders", False):
+        return None
+    at = getattr(ptz_state, "at", None)
+    return at(t) if at is not None else None
+
+
+def _encoders_at(ptz_state, s=None) -> tuple:
+    """(pan, tilt) and its age like PtzState.latest(); from the frame's
+    _aligned_sample s when there is one, the age being the distance to the
+    nearest real sample."""
+    if s is None:
+        return ptz_state.latest()
+    return (s.pan, s.tilt), s.gap_sec
+
+
+def _zoom_at(ptz_state, s=None) -> tuple:
+    """Zoom and its age like PtzState.latest_zoom(), aligned as _encoders_at."""
+    if s is None:
+        return ptz_state.latest_zoom()
+    return s.zoom, s.zoom_gap_sec
+
+
 class Pipeline(threading.Thread):
     def __init__(self, cfg, ptz, detector_factory):
         super().__init__(daemon=True)
@@ -142,7 +184,14 @@ class Pipeline(threading.Thread):
         # resetting to the SharedState default of True.
         self.state.show_mask = bool(getattr(cfg.web, "show_mask", True))
 
-        self.grab = FrameGrabber(cfg.camera)
+        # user-005: the async detector pins up to two more ring slots.
+        _async_det = bool(getattr(cfg.detector, "enabled", False)
+                          and getattr(cfg.detector, "async_worker", False))
+        _ring = getattr(cfg.camera, "frame_ring", DEFAULT_FRAME_RING)
+        if _async_det:
+            from .detector_worker import WORKER_RING_SLOTS
+            _ring = max(_ring, DEFAULT_FRAME_RING + WORKER_RING_SLOTS)
+        self.grab = FrameGrabber(cfg.camera, ring_size=_ring)
         self.color = ColorDetector(cfg.color) if cfg.color.enabled else None
         self.fusion = Fusion(cfg.fusion)
         self.servo = VisualServo(cfg.ptz)
@@ -163,6 +212,14 @@ class Pipeline(threading.Thread):
                 # so a zombie rig (engine dead, API up) is in the event stream too.
                 print(f"[pipeline] YOLO disabled (load failed): {e}")
                 self._detector_load_error = str(e)
+        self._det_worker = None
+        self._last_det_result = None
+        # user-007: per-frame "run YOLO now?" (fixed every_n or adaptive)
+        self._det_sched = DetectorScheduler(cfg.detector)
+        self._box_tracker = _make_box_tracker(cfg.detector)
+        self._motion_gate = _make_motion_gate(cfg.detector)
+        # user-012: ROI-first color segmentation while TRACKING
+        self._color_roi = ColorRoi(getattr(cfg, "color", None))
 
         # P1: GPS coarse-pointing handoff (staleness is gated here in the
         # pipeline via gps.drive_stale_sec before decide() is called)
@@ -180,6 +237,18 @@ class Pipeline(threading.Thread):
         # Health registry — every loop beat()s each component; /health exposes staleness
         from .health import HealthRegistry
         self.health = HealthRegistry()
+        # user-003: rolling per-segment latency histograms for /api/v1/perf,
+        # all measured from the frame's decode wall-clock.
+        self.perf = PerfRegistry()
+        self._pts_lag = PtsLag()
+        # user-004: per-stage loop timings (monotonic), same surface.
+        self.stages = PerfRegistry()
+        if self.detector is not None and _async_det:
+            from .detector_worker import DetectorWorker
+            self._det_worker = DetectorWorker(
+                self.detector.detect, perf=self.perf, stages=self.stages,
+                detect_batch=getattr(self.detector, "detect_batch", None),
+                crop_iou=float(getattr(cfg.detector, "crop_nms_iou", 0.5)))
         # Event ring — records lock/owner/gps/kill transitions for /events
         from .events import EventRing
         self.events = EventRing(maxlen=500)
@@ -191,7 +260,11 @@ class Pipeline(threading.Thread):
         # PtzState — background encoder poller. Started in run() only when
         # ptz.enabled is True. Additive telemetry; does not affect the servo.
         from .ptz_state import PtzState
-        self.ptz_state = PtzState(self.ptz)
+        self.ptz_state = PtzState(self.ptz,
+                                  poll_hz=float(getattr(cfg.ptz, "poll_hz", 10.0)),
+                                  pipelined=bool(getattr(cfg.ptz, "pipelined_poll", False)),
+                                  idle_hz=(float(getattr(cfg.ptz, "idle_poll_hz", 3.0))
+                                           if getattr(cfg.ptz, "adaptive_poll", False) else None))
         from .pointing_verifier import PointingVerifier
         self._pointing_verifier = PointingVerifier(
             self.ptz, self.ptz_state, self.events,
@@ -238,6 +311,7 @@ class Pipeline(threading.Thread):
         self._cinematic_zoom_suppressed_until = 0.0
         self._last_boxes = []
         self._last_boxes_time = 0.0
+        self._last_boxes_pose = None
         self._frame_i = 0
 
         # P3: estimator shadow wiring — instantiated lazily via _init_estimator()
@@ -308,12 +382,23 @@ class Pipeline(threading.Thread):
             >= getattr(self.cfg.ptz, "stop_resend_interval", DEFAULT_STOP_RESEND_INTERVAL_SEC)
         )
         if changed or (due and not cmd.is_stop) or stop_due:
+            _perf = getattr(self, "perf", None)
+            # user-021: behind the VISCA writer the call only queues; the
+            # writer records glass_to_visca when the bytes actually go out
+            _trace = getattr(self.ptz, "trace", None) if _perf is not None else None
+            if _trace is not None:
+                _trace(cmd.frame_t, _perf)
             if cmd.is_stop:
                 self.ptz.stop()
             else:
                 self.ptz.pan_tilt(cmd.pan_speed, cmd.tilt_speed, cmd.pan_dir, cmd.tilt_dir)
+                self._note_ptz_motion()
             self._last_cmd_key = key
             self._last_cmd_time = now
+            # user-003: decode -> bytes on the UDP socket, for sends only (a
+            # de-duped repeat never reached the camera).
+            if _perf is not None and _trace is None:
+                _perf.since("glass_to_visca", cmd.frame_t, time.time())
 
     def suppress_cinematic_zoom(self, seconds: float) -> None:
         """Suppress auto-zoom briefly after a manual zoom nudge.
@@ -331,7 +416,7 @@ class Pipeline(threading.Thread):
         now = time.time() if now is None else now
         return now < getattr(self, "_cinematic_zoom_suppressed_until", 0.0)
 
-    def _estimator_shadow_tick(self, fr, w, t0, frame_h: int = 0) -> None:
+    def _estimator_shadow_tick(self, fr, w, t0, frame_h: int = 0, enc=None) -> None:
         """One shadow-estimator tick. Shadow is observability, never control:
         ANY exception here disables shadow and the vision loop lives (doctrine
         set by the /data/shadow PermissionError zombie and re-proven when a
@@ -359,8 +444,13 @@ class Pipeline(threading.Thread):
 
             # One zoom read per tick. None = no fresh zoom (poller outage or
             # pre-first-reply); consumers decide their own fallback.
-            from .ptz_state import ZOOM_FRESH_SEC
-            _z, _z_age = self.ptz_state.latest_zoom()
+            from .ptz_state import ENCODER_FRESH_SEC, ZOOM_FRESH_SEC
+            # user-024: with ptz.align_encoders, encoders and observation
+            # time are the frame's decode time
+            _frame_t = getattr(fr, "frame_t", None)
+            _obs_t = (_frame_t if _frame_t is not None and getattr(
+                getattr(self.cfg, "ptz", None), "align_encoders", False) else t0)
+            _z, _z_age = _zoom_at(self.ptz_state, enc)
             _fresh_zoom = _z if (_z is not None and _z_age is not None
                                  and _z_age < ZOOM_FRESH_SEC) else None
 
@@ -369,13 +459,13 @@ class Pipeline(threading.Thread):
             # offset at tele into a ~14 deg observation with a falsely tight R
             # — one poller hiccup could yank the state tens of metres.
             if fr.locked and fr.target_xy is not None and _fresh_zoom is not None:
-                _enc, _enc_age = self.ptz_state.latest()
-                if _enc is not None and (_enc_age is None or _enc_age < 0.5):
+                _enc, _enc_age = _encoders_at(self.ptz_state, enc)
+                if _enc is not None and (_enc_age is None or _enc_age < ENCODER_FRESH_SEC):
                     self.estimator.update_vision(
                         pan_enc=_enc[0],
                         pixel_cx=fr.target_xy[0], frame_w=w,
                         zoom_enc=_fresh_zoom,
-                        now=t0,
+                        now=_obs_t,
                     )
                     _vision_updated = True
 
@@ -392,7 +482,7 @@ class Pipeline(threading.Thread):
                 self.estimator.update_vision_range(
                     bbox_h_px=float(_pb[3]),
                     frame_h=float(frame_h) if frame_h > 0 else 720.0,
-                    zoom_enc=_fresh_zoom, now=t0,
+                    zoom_enc=_fresh_zoom, now=_obs_t,
                 )
 
             if self._est_tick % _log_every_n == 0:
@@ -493,9 +583,178 @@ class Pipeline(threading.Thread):
         )
         if changed or (due and direction != "stop") or stop_due:
             self.ptz.zoom(direction, speed)
+            if direction != "stop":
+                self._note_ptz_motion()
             self._last_zoom_key = key
             self._last_zoom_time = now
 
+    def _note_ptz_motion(self) -> None:
+        """user-025: a move command went out — the encoder poller bursts.
+        Not for stops: the parked loop resends STOP faster than the burst
+        hold, which would pin the poller at the burst rate."""
+        note = getattr(getattr(self, "ptz_state", None), "note_motion", None)
+        if note is not None:
+            note()
+
+    def _ptz_moving(self, now: float) -> bool:
+        """user-007: a non-stop velocity command is still in force, or an
+        absolute / manual move went out within MOTION_HOLD_SEC."""
+        return ((self._last_cmd_key is not None and self._last_cmd_key != STOP_CMD.key())
+                or now - self._last_abs_cmd_time < MOTION_HOLD_SEC
+                or now - self._last_manual_cmd_time < MOTION_HOLD_SEC)
+
+    def _color_level(self) -> int:
+        """user-013: color pyramid level for the current zoom (0 without a
+        color.pyramid_zoom table or a fresh zoom reading)."""
+        table = getattr(getattr(self.cfg, "color", None), "pyramid_zoom", None)
+        if not table:
+            return 0
+        from .ptz_state import ZOOM_FRESH_SEC
+        zoom, age = self.ptz_state.latest_zoom()
+        if zoom is None or age is None or age >= ZOOM_FRESH_SEC:
+            return 0
+        return pyramid_level(table, int(zoom))
+
+    def _enc_pose(self, enc=None) -> Optional[tuple]:
+        """user-008: (pan, tilt, zoom) encoders from PtzState, or None unless
+        all are fresh (same gates as the bearing cue, L9). user-024: from the
+        frame's aligned sample enc with ptz.align_encoders."""
+        from .ptz_state import ENCODER_FRESH_SEC, ZOOM_FRESH_SEC
+        ptz_state = getattr(self, "ptz_state", None)
+        if ptz_state is None:
+            return None
+        pt, enc_age = _encoders_at(ptz_state, enc)
+        if pt is None or enc_age is None or enc_age >= ENCODER_FRESH_SEC:
+            return None
+        zoom, zoom_age = _zoom_at(ptz_state, enc)
+        if zoom is None or zoom_age is None or zoom_age >= ZOOM_FRESH_SEC:
+            return None
+        return (int(round(pt[0])), int(round(pt[1])), int(round(zoom)))
+
+    def _detector_crops(self, gps_crop, prev_fr, w: int, h: int) -> Optional[list]:
+        """user-017: regions for one batched detector run, or None for the
+        single-region path (flag off, or nothing beyond the full frame — which
+        keeps ByteTrack ids on plain full-frame runs)."""
+        det_cfg = self.cfg.detector
+        if not getattr(det_cfg, "multi_crop", False):
+            return None
+        bbox = (getattr(prev_fr, "bbox", None)
+                if getattr(prev_fr, "state", "SEARCHING") != "SEARCHING" else None)
+        crops = plan_crops(w, h, gps_crop, bbox,
+                           float(getattr(det_cfg, "crop_scale", 4.0)),
+                           int(getattr(det_cfg, "crop_min_px", 256)))
+        return crops if len(crops) > 1 else None
+
+    def _proposal_crops(self, blobs, w: int, h: int, gps_crop=None) -> Optional[list]:
+        """user-019: squares around this frame's largest color blobs, plus the
+        GPS search ROI and, every proposal_full_every-th run, the full frame;
+        None (flag off or no blobs)."""
+        det_cfg = self.cfg.detector
+        if not getattr(det_cfg, "proposals", False) or not len(blobs):
+            return None
+        crops = blob_crops(blobs, w, h, int(getattr(det_cfg, "proposal_k", 3)),
+                           float(getattr(det_cfg, "proposal_scale", 6.0)),
+                           int(getattr(det_cfg, "proposal_min_px", 128)))
+        if gps_crop is not None and tuple(gps_crop) not in crops:
+            crops.append(tuple(gps_crop))
+        self._proposal_runs = getattr(self, "_proposal_runs", 0) + 1
+        if self._proposal_runs % int(getattr(det_cfg, "proposal_full_every", 4)) == 0:
+            crops.append(None)
+        return crops
+
+    def _subject_range_m(self, now: float) -> Optional[float]:
+        """user-018: subject range from the estimator, else base -> fresh GPS
+        fix; None when neither is available."""
+        est = getattr(self, "estimator", None)
+        out = est.predict_output(now=now) if est is not None else None
+        if out is not None:
+            return float(out.dist_m)
+        gps, pose = getattr(self, "gps", None), getattr(self, "pose", None)
+        if gps is None or pose is None or not pose.has_base:
+            return None
+        fix = gps.get_fix()
+        if fix is None or fix.age_sec >= getattr(self.cfg.gps, "drive_stale_sec", 8.0):
+            return None
+        return haversine_m(pose.lat, pose.lon, fix.lat, fix.lon)
+
+    def _tile_crops(self, prev_fr, w: int, h: int, now: float) -> Optional[list]:
+        """user-018: the next tiles of the far-subject sweep, or once a person
+        box was found, a tile_px-or-larger crop around it (self._tile_focus);
+        None when the flag is off or the subject is near or its range unknown."""
+        det_cfg = self.cfg.detector
+        active = False
+        if getattr(det_cfg, "tiling", False):
+            rng = self._subject_range_m(now)
+            active = rng is not None and rng >= float(getattr(det_cfg, "tile_range_m", 150.0))
+        sweep = getattr(self, "_tile_sweep", None)
+        if active and sweep is None:
+            sweep = self._tile_sweep = TileSweep(
+                int(getattr(det_cfg, "tile_px", 320)),
+                float(getattr(det_cfg, "tile_overlap", 0.25)),
+                int(getattr(det_cfg, "tiles_per_run", 2)),
+                float(getattr(det_cfg, "tile_max_age_sec", 0.5)),
+                float(getattr(det_cfg, "crop_nms_iou", 0.5)))
+        if sweep is not None and active != getattr(self, "_tiling", False):
+            sweep.reset()
+        self._tiling = active
+        self._tile_focus = False
+        if not active:
+            return None
+        # the full frame is the view that cannot resolve a far subject: keep
+        # looking where the sweep found it until it is lost
+        bbox = (getattr(prev_fr, "person_bbox", None)
+                if getattr(prev_fr, "has_person", False) else None)
+        if bbox is not None:
+            crop = target_crop(bbox, w, h, float(getattr(det_cfg, "crop_scale", 4.0)),
+                               int(getattr(det_cfg, "tile_px", 320)))
+            if crop is not None:
+                self._tile_focus = True
+                return [crop]
+        return sweep.next(w, h)
+
+    def _stitch_tiles(self, boxes, t: float, tiled: bool, pose: Optional[tuple] = None):
+        """user-018: a sweep run's boxes merged with the sweep's recent tiles,
+        moved from their own encoder pose into this run's (`pose`) with
+        decayed confidence; `tiled` is the run's own marker, not the current
+        mode. With PTZ on but no pose the camera may have moved, so earlier
+        tiles cannot be placed and are dropped."""
+        sweep = getattr(self, "_tile_sweep", None)
+        if not tiled or sweep is None:
+            return boxes
+        ptz_cfg = getattr(self.cfg, "ptz", None)
+        if pose is None and getattr(ptz_cfg, "enabled", False):
+            sweep.reset()
+        size = sweep.frame_size
+        if pose is None or size is None:
+            return sweep.stitch(BoxBatch.of(boxes), t, pose)
+        fov_curve = getattr(getattr(self, "_store", None), "fov_curve", None) or []
+        half_life = float(getattr(self.cfg.detector, "motion_comp_half_life_sec", 0.3))
+        cam = getattr(self, "pose", None)
+
+        def shift(then_boxes, then, age):
+            return compensate_boxes(
+                then_boxes, then, pose, fov_curve, size[0], size[1],
+                pan_enc_per_deg=getattr(cam, "pan_enc_per_deg", 0.0),
+                tilt_enc_per_deg=getattr(cam, "tilt_enc_per_deg", 0.0),
+                conf_scale=conf_decay(age, half_life))
+
+        return sweep.stitch(BoxBatch.of(boxes), t, pose, shift)
+
+    def _compensated_boxes(self, now: float, w: int, h: int,
+                           enc=None) -> Optional[list]:
+        """user-008: cached boxes moved into the current image, or None (the
+        M5 skip) without a capture pose, live encoders or a FOV curve."""
+        fov_curve = getattr(getattr(self, "_store", None), "fov_curve", None) or []
+        half_life = float(getattr(self.cfg.detector, "motion_comp_half_life_sec", 0.3))
+        pose = getattr(self, "pose", None)
+        return compensate_boxes(
+            self._last_boxes, getattr(self, "_last_boxes_pose", None), self._enc_pose(enc),
+            fov_curve, w, h,
+            pan_enc_per_deg=getattr(pose, "pan_enc_per_deg", 0.0),
+            tilt_enc_per_deg=getattr(pose, "tilt_enc_per_deg", 0.0),
+            conf_scale=conf_decay(now - self._last_boxes_time, half_life),
+        )
+
     def _auto_zoom_is_moving(self) -> bool:
         return getattr(self, "_last_zoom_key", None) not in (None, ("stop", 0))
 
@@ -582,7 +841,7 @@ class Pipeline(threading.Thread):
         self._no_video_stopped = True
         self.events.record("no_video_stop", {"owner": self.owner.owner})
 
-    def _gps_cue(self, w: int, h: int):
+    def _gps_cue(self, w: int, h: int, enc=None):
         """Fusion GPS cue while gps_tracker owns. Bearing-projected onto the frame
         when fusion.gps_bearing_cue_enabled (Plan v3 Phase 3) and the inputs are
         available; otherwise the legacy frame-center cue (byte-identical default).
@@ -602,14 +861,14 @@ class Pipeline(threading.Thread):
         # L9: same freshness gates as the estimator path — a wedged poller's old
         # encoder/wide-FOV px-per-deg would mislocate the boost region, which can
         # boost the WRONG blob across the lock threshold. Stale -> center cue.
-        from .ptz_state import ZOOM_FRESH_SEC
-        enc, enc_age = ptz_state.latest()
-        if enc is None or (enc_age is not None and enc_age >= 0.5):
+        from .ptz_state import ENCODER_FRESH_SEC, ZOOM_FRESH_SEC
+        pt, enc_age = _encoders_at(ptz_state, enc)
+        if pt is None or (enc_age is not None and enc_age >= ENCODER_FRESH_SEC):
             return center
-        zoom_enc, zoom_age = ptz_state.latest_zoom()
+        zoom_enc, zoom_age = _zoom_at(ptz_state, enc)
         if zoom_enc is None or zoom_age is None or zoom_age >= ZOOM_FRESH_SEC:
             return center
-        cur_bearing = self.pose.pan_encoder_to_bearing(enc[0])
+        cur_bearing = self.pose.pan_encoder_to_bearing(pt[0])
         if cur_bearing is None:
             return center
         tgt_bearing = bearing_deg(self.pose.lat, self.pose.lon, fix.lat, fix.lon)
@@ -760,6 +1019,28 @@ class Pipeline(threading.Thread):
             self._shutdown()
 
     def _run(self):
+        if getattr(self, "perf", None) is None:   # harness Pipelines built via __new__
+            self.perf = PerfRegistry()
+            self._pts_lag = PtsLag()
+        if getattr(self, "stages", None) is None:
+            self.stages = PerfRegistry()
+        clock = StageClock(self.stages)
+        if getattr(self, "_det_worker", None) is None:
+            self._det_worker = None
+            self._last_det_result = None
+        if getattr(self, "_det_sched", None) is None:
+            self._det_sched = DetectorScheduler(getattr(self.cfg, "detector", None))
+        if not hasattr(self, "_box_tracker"):
+            self._box_tracker = _make_box_tracker(getattr(self.cfg, "detector", None))
+        if not hasattr(self, "_motion_gate"):
+            self._motion_gate = _make_motion_gate(getattr(self.cfg, "detector", None))
+        if not hasattr(self, "_color_roi"):
+            self._color_roi = ColorRoi(getattr(self.cfg, "color", None))
+        _prev_fr = None
+        if self._det_worker is not None:
+            self._det_worker.start()
+        _stage_hud = ""
+        _stage_hud_at = 0.0
         self.grab.start()
         if self.cfg.ptz.enabled:
             self.ptz_state.start()
@@ -768,6 +1049,9 @@ class Pipeline(threading.Thread):
 
         self._maybe_init_estimator()
         period = 1.0 / max(1.0, self.cfg.loop.target_fps)
+        frame_paced = getattr(self.cfg.loop, "pacing", "timer") == "frame"
+        _last_seq = 0
+        _last_sampled_seq = 0
         t_fps = time.time()
         n_fps = 0
         fps = 0.0
@@ -777,9 +1061,19 @@ class Pipeline(threading.Thread):
         _capture_stale = False
 
         while not self._stop_evt.is_set():
+            clock.start()
+            # user-001: a read-only lease on the grabber's ring slot instead of a
+            # full-frame copy; released once render is done with it below.
+            if frame_paced:
+                # user-002: wake on frame arrival. A timeout falls back to the
+                # newest frame so a frozen stream still reaches ZOMBIE-1 below.
+                lease = self.grab.wait_for_frame(_last_seq, FRAME_WAIT_TIMEOUT_SEC)
+                if lease is None:
+                    lease = self.grab.acquire()
+            else:
+                lease = self.grab.acquire()
             t0 = time.time()
-            frame = self.grab.read()
-            if frame is None:
+            if lease is None:
                 self.state.set_status(state="NO_VIDEO", connected=self.grab.connected)
                 self._stop_for_no_video()   # C1: no runaway PTZ on video dropout
                 # R2b (audit round-2): this loop thread is alive and doing its
@@ -796,6 +1090,22 @@ class Pipeline(threading.Thread):
                 time.sleep(0.1)
                 continue
             self._no_video_stopped = False  # video back — re-arm the C1 one-shot
+            # user-004: frame-paced "grab" includes the wait for the next frame
+            # (idle time, not cost); under timer pacing it is the lease alone.
+            clock.lap("grab")
+            frame = lease.image
+            _last_seq = lease.seq
+            # user-003: latency accounting from the frame's decode time. A
+            # frozen-stream re-run (frame-paced fallback) re-reads an old lease
+            # and would inflate frame_age, so only a new frame is sampled.
+            frame_t = lease.t or None
+            if lease.seq != _last_sampled_seq:
+                _last_sampled_seq = lease.seq
+                self.perf.since("frame_age", frame_t, t0)
+                self.perf.observe("pts_lag", self._pts_lag.update(lease.t, lease.pts))
+            # user-024: one history lookup per frame, shared by every encoder
+            # consumer below (None = the newest sample, as before)
+            enc_sample = _aligned_sample(self.cfg, self.ptz_state, frame_t)
 
             # Zombie-rig guard (ZOMBIE-1): a wedged grabber keeps handing back the
             # SAME non-None frame, so this loop runs fusion on a frozen image while
@@ -819,36 +1129,112 @@ class Pipeline(threading.Thread):
             self.health.beat("capture", {"fps": round(fps, 1), "connected": self.grab.connected})
             blobs, mask = ([], None)
             if self.color is not None:
-                blobs, mask = self.color.detect(frame)
+                _roi = self._color_roi.plan(_prev_fr, w, h)
+                _level = self._color_level()
+                if _roi is not None:
+                    blobs, mask = self.color.detect(frame, roi=_roi)
+                elif _level > 0:
+                    blobs, mask = self.color.detect(frame, level=_level)
+                else:
+                    blobs, mask = self.color.detect(frame)
+                clock.lap("color")
+            else:
+                clock.mark()
 
             # throttled YOLO; reuse last boxes within TTL
             # When gps_roi_enabled + GPS owns, crop detector input to the
             # arbiter's search_roi so YOLO focuses on the likely subject area.
             # Color detection stays full-frame. Flag OFF = byte-identical path.
+            # user-005: with detector.async_worker the frame is submitted to the
+            # worker instead and the newest published boxes are picked up here;
+            # box time is the SOURCE frame's decode time either way.
             persons = None
+            run_yolo = False
+            fresh_boxes = False
+            det_worker = self._det_worker
             if self.detector is not None:
                 self._frame_i += 1
-                run_yolo = (self._frame_i % max(1, self.cfg.detector.every_n)) == 0
+                _gate = self._motion_gate
+                if _gate is not None:
+                    _gate.update(frame)
+                # user-007: decided from the PREVIOUS frame's fusion state
+                run_yolo = self._det_sched.should_run(
+                    t0, self._frame_i,
+                    state=getattr(_prev_fr, "state", "SEARCHING"),
+                    matched=bool(getattr(_prev_fr, "matched", False)),
+                    moving=self._ptz_moving(t0),
+                    owner=self._arbiter_state,
+                    static=_gate is not None and _gate.static,
+                )
                 if run_yolo:
-                    try:
-                        _roi_enabled = bool(getattr(self.cfg.fusion, "gps_roi_enabled", False))
-                        _prev_roi = getattr(self, "_prev_search_roi", None)
-                        if _roi_enabled and _prev_roi is not None:
-                            _rx1, _ry1, _rx2, _ry2 = compute_roi_crop(_prev_roi, h, w)
-                            _crop = frame[_ry1:_ry2, _rx1:_rx2]
-                            _raw_boxes = self.detector.detect(_crop)
-                            self._last_boxes = offset_boxes(_raw_boxes, _rx1, _ry1)
-                        else:
-                            self._last_boxes = self.detector.detect(frame)
-                        self._last_boxes_time = t0
-                    except Exception as e:  # pragma: no cover
-                        print(f"[pipeline] YOLO inference error: {e}")
-                if (t0 - self._last_boxes_time) <= self.cfg.detector.box_ttl_sec:
+                    if _gate is not None:
+                        _gate.mark()
+                    _crop_box = None
+                    _roi_enabled = bool(getattr(self.cfg.fusion, "gps_roi_enabled", False))
+                    _prev_roi = getattr(self, "_prev_search_roi", None)
+                    if _roi_enabled and _prev_roi is not None:
+                        _crop_box = compute_roi_crop(_prev_roi, h, w)
+                    _tiled = False
+                    _crops = self._proposal_crops(blobs, w, h, _crop_box)
+                    if _crops is not None:
+                        self._tiling = False            # user-019: proposals win
+                    else:
+                        _crops = self._tile_crops(_prev_fr, w, h, t0)
+                        _tiled = _crops is not None and not self._tile_focus
+                        if _crops is None:
+                            _crops = self._detector_crops(_crop_box, _prev_fr, w, h)
+                    if det_worker is not None:
+                        det_worker.submit(lease.share(),
+                                          _crops if _crops is not None else _crop_box,
+                                          pose=self._enc_pose(enc_sample), tiled=_tiled)
+                    else:
+                        try:
+                            _t_inf = time.perf_counter()
+                            if _crops is not None:
+                                self._last_boxes = detect_crops(
+                                    self.detector.detect, frame, _crops,
+                                    float(getattr(self.cfg.detector, "crop_nms_iou", 0.5)),
+                                    getattr(self.detector, "detect_batch", None))
+                            elif _crop_box is not None:
+                                _rx1, _ry1, _rx2, _ry2 = _crop_box
+                                _crop = frame[_ry1:_ry2, _rx1:_rx2]
+                                _raw_boxes = self.detector.detect(_crop)
+                                self._last_boxes = offset_boxes(_raw_boxes, _rx1, _ry1)
+                            else:
+                                self._last_boxes = self.detector.detect(frame)
+                            self._last_boxes_time = frame_t or t0
+                            self._last_boxes_pose = self._enc_pose(enc_sample)
+                            self._last_boxes = self._stitch_tiles(self._last_boxes,
+                                                                  self._last_boxes_time,
+                                                                  _tiled,
+                                                                  self._last_boxes_pose)
+                            fresh_boxes = True
+                            if self._box_tracker is not None:
+                                self._box_tracker.update(self._last_boxes, self._last_boxes_time)
+                            self._det_sched.observe_latency(time.perf_counter() - _t_inf)
+                        except Exception as e:  # pragma: no cover
+                            print(f"[pipeline] YOLO inference error: {e}")
+                if det_worker is not None:
+                    _res = det_worker.latest()
+                    if _res is not None and _res is not self._last_det_result:
+                        self._last_det_result = _res
+                        self._last_boxes = self._stitch_tiles(_res.boxes, _res.t, _res.tiled,
+                                                              _res.pose)
+                        self._last_boxes_time = _res.t
+                        self._last_boxes_pose = _res.pose
+                        if self._box_tracker is not None:
+                            self._box_tracker.update(self._last_boxes, _res.t)
+                        self._det_sched.observe_latency(_res.infer_sec)
+                # user-009: with the box tracker, its track expiry is the window
+                _tracker = self._box_tracker
+                _ttl = (self.cfg.detector.box_ttl_sec if _tracker is None
+                        else _tracker.max_age_sec)
+                if (t0 - self._last_boxes_time) <= _ttl:
                     # M5: cached boxes live in image coordinates with no motion
                     # compensation — if a moving pan/tilt command has been sent
                     # since they were captured, the scene has shifted under them
                     # and they'd confirm phantoms, so skip the reuse. Boxes from
-                    # THIS frame always pass (any cmd predates their capture).
+                    # THIS frame always pass (they describe exactly this image).
                     # R4 (audit round-2): the velocity check alone missed GPS
                     # absolute slews and manual PTZ nudges — neither path sets
                     # _last_cmd_key — so stale boxes were still reused in image
@@ -856,7 +1242,7 @@ class Pipeline(threading.Thread):
                     # was written for. A box captured before the most recent
                     # non-stop motion of ANY kind (velocity, absolute, manual)
                     # is skipped.
-                    _panning = (
+                    _panning = not fresh_boxes and (
                         (self._last_cmd_key is not None
                          and self._last_cmd_key != STOP_CMD.key()
                          and self._last_cmd_time >= self._last_boxes_time)
@@ -864,18 +1250,29 @@ class Pipeline(threading.Thread):
                         or self._last_manual_cmd_time >= self._last_boxes_time
                     )
                     if not _panning:
-                        persons = self._last_boxes
+                        persons = (self._last_boxes if _tracker is None
+                                   else _tracker.predict(frame_t or t0))
+                    elif getattr(self.cfg.detector, "motion_comp", False):
+                        # user-008: shift them by the encoder delta instead
+                        persons = self._compensated_boxes(t0, w, h, enc_sample)
+            if run_yolo:
+                clock.lap("yolo")
+            else:
+                clock.mark()
             self.health.beat("detector", {"enabled": self.detector is not None})
 
             # P2: GPS-cue boost — when gps_tracker owned last frame the camera is
             # already aimed at the subject; boost blobs near frame center.
             if self._arbiter_state == "gps_tracker":
-                gps_cue_px = self._gps_cue(w, h)
+                gps_cue_px = self._gps_cue(w, h, enc_sample)
             else:
                 gps_cue_px = None
                 self._last_gps_cue = None
 
-            fr = self.fusion.update(blobs, persons, gps_cue_px=gps_cue_px)
+            fr = self.fusion.update(blobs, persons, gps_cue_px=gps_cue_px, frame_t=frame_t)
+            _prev_fr = fr
+            self.perf.since("frame_to_fusion", frame_t, time.time())
+            clock.lap("fusion")
 
             # control: always compute (for the overlay); SEND only while we own
             # the PTZ and are not killed.
@@ -897,7 +1294,9 @@ class Pipeline(threading.Thread):
                 # calibrated curve -> legacy FOV-independent behavior).
                 _hfov, _hfov_ref = self._servo_hfov()
                 cmd = self.servo.compute(fr.target_xy, (w, h),
-                                         hfov_deg=_hfov, hfov_ref_deg=_hfov_ref)
+                                         hfov_deg=_hfov, hfov_ref_deg=_hfov_ref,
+                                         frame_t=getattr(fr, "frame_t", None))
+                self.perf.since("frame_to_servo", frame_t, time.time())
                 zoom_cmd = None
                 abs_cmd = None
 
@@ -977,6 +1376,10 @@ class Pipeline(threading.Thread):
                 if self._prev_gps_viable != gps_fresh:
                     self.events.record("gps", "viable" if gps_fresh else "unviable")
                     self._prev_gps_viable = gps_fresh
+                _targets = getattr(self.fusion, "targets", None)
+                _pin_lost = _targets.take_pin_lost() if _targets is not None else None
+                if _pin_lost is not None:
+                    self.events.record("subject", {"pin_lost": _pin_lost})
 
                 # Atomic zoom handoff: kill old zoom before new owner takes zoom
                 if decision.owner != prev_state:
@@ -1016,14 +1419,20 @@ class Pipeline(threading.Thread):
                         self.owner.release(_curr)
                     self._send_cmd(STOP_CMD)
 
+            clock.lap("arbiter")
+
             # render — pure observability. M7: skip annotate+encode entirely when
             # no MJPEG client is connected (the normal field state); recording
             # reads RTSP directly and never consumes these JPEGs.
             if self.state.preview_client_count() > 0:
+                if self.state.show_hud and t0 - _stage_hud_at >= 1.0:
+                    _stage_hud = hud_line(self.stages.snapshot())   # <=1 Hz: percentiles aren't free
+                    _stage_hud_at = t0
                 hud = {
                     "fps": fps,
                     "ptz": "ON" if self.cfg.ptz.enabled else "off",
                     "killed": self.state.killed,
+                    "stages": _stage_hud,
                 }
                 annotated = (
                     annotate(
@@ -1041,10 +1450,12 @@ class Pipeline(threading.Thread):
                     if self.state.show_hud
                     else frame
                 )
+                clock.lap("annotate")
                 ok, buf = cv2.imencode(".jpg", annotated,
                                        [cv2.IMWRITE_JPEG_QUALITY, self.cfg.web.jpeg_quality])
                 if ok:
                     self.state.set_jpeg(buf.tobytes())
+                clock.lap("encode")
 
             self.state.set_status(
                 state=("KILLED" if self.state.killed else fr.state),
@@ -1058,13 +1469,24 @@ class Pipeline(threading.Thread):
                      else (f"GPS abs" if self._arbiter_state == "gps_tracker"
                            else f"p{cmd.pan_speed}/t{cmd.tilt_speed}")),
                 zoom_cmd=zoom_cmd or "hold",
+                det_hz=(round(self._det_sched.rate_hz(t0), 1)
+                        if self.detector is not None else 0.0),
+                det_reason=self._det_sched.reason if self.detector is not None else None,
+                det_tiling=bool(getattr(self, "_tiling", False)),
+                color_roi=self._color_roi.window,
+                subject_id=getattr(fr, "subject_id", None),
+                subjects=(self.fusion.targets.snapshot(t0)
+                          if getattr(self.fusion, "targets", None) is not None else None),
             )
+            clock.lap("status")
 
             # Estimator shadow tick — additive read-only side channel; never commands.
             if self.estimator is not None:
-                self._estimator_shadow_tick(fr, w, t0, frame_h=h)
+                self._estimator_shadow_tick(fr, w, t0, frame_h=h, enc=enc_sample)
+                clock.lap("shadow")
 
             self._pointing_verifier.tick()
+            clock.lap("verifier")
             enc, enc_age = self.ptz_state.latest()
             self.health.beat("ptz_poller", {
                 "alive": self.ptz_state.is_alive(),
@@ -1072,6 +1494,9 @@ class Pipeline(threading.Thread):
                 "age_sec": round(enc_age, 3) if enc_age is not None else None,
             })
             self.health.beat("loop")
+            clock.lap("health")
+            clock.total("loop")
+            lease.release()
 
             # fps bookkeeping
             n_fps += 1
@@ -1087,6 +1512,8 @@ class Pipeline(threading.Thread):
                       f"conn={s.get('connected')}")
                 t_log = time.time()
 
+            if frame_paced:
+                continue                     # the next frame's arrival paces us
             dt = time.time() - t0
             if dt < period:
                 time.sleep(period - dt)
@@ -1120,6 +1547,8 @@ class Pipeline(threading.Thread):
                 self.ptz.stop()
                 self.owner.release("testbed")
         finally:
+            if getattr(self, "_det_worker", None) is not None:
+                self._det_worker.stop()   # releases any frame still in its mailbox
             self.grab.stop()
 
     def stop(self):
@@ -1131,3 +1560,4 @@ class Pipeline(threading.Thread):
         stop) so the M5 stale-box skip also covers manual nudges, not just
         vision velocity and GPS absolute moves."""
         self._last_manual_cmd_time = t if t is not None else time.time()
+        self._note_ptz_motion()
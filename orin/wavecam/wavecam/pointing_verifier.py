@@ -60,6 +60,14 @@ class PointingVerifier:
         self._retry_count = 0
         self._target = new_target
         self._issue_t = t if t is not None else time.time()
+        self._poll_now()
+
+    def _poll_now(self) -> None:
+        """user-025: an adaptive poller samples the settle from now on at its
+        burst rate, so the verify read is fresh at VERIFY_DELAY_SEC."""
+        note = getattr(self._ptz_state, "note_motion", None)
+        if note is not None:
+            note(immediate=True)
 
     def tick(self) -> None:
         """Call once per pipeline loop. Verifies and retries if conditions are met."""
@@ -101,6 +109,7 @@ class PointingVerifier:
             self._ptz.pan_tilt_absolute(pan_target, tilt_target)
             self._retry_count += 1
             self._issue_t = time.time()   # reset settle clock for the retry
+            self._poll_now()
         else:
             # Second miss — give up on this move; next GPS command will reissue.
             self._target = None
@@ -62,6 +62,14 @@ class PtzInquiryLike(Protocol):
     def inquire_zoom(self) -> Optional[int]: ...
 
 
+@runtime_checkable
+class PtzPositionLike(Protocol):
+    """user-023: pipelined pan/tilt + zoom inquiry. Optional — PtzState checks
+    for it at runtime and falls back to the serial inquiries."""
+
+    def inquire_position(self) -> Tuple[Optional[Tuple[int, int]], Optional[int]]: ...
+
+
 @runtime_checkable
 class PtzStateLike(Protocol):
     """The poller cache as consumed by pipeline, verifier, and calibration."""
@@ -9,7 +9,8 @@ Socket-lock discipline (matches ptz_visca.py):
   PtzState calls ptz.inquire_pan_tilt() which follows this discipline internally.
   PtzState is the only HOT-PATH caller of inquire_pan_tilt(); the calibration
   capture endpoint also inquires (rarely) from a request thread — a known
-  shared-socket race tracked as a follow-up.
+  shared-socket race tracked as a follow-up. With ptz.async_rx (user-022) a
+  receive thread owns recvfrom and routes replies by type, closing that race.
 
 Bench-measured constants (2026-06-11, Prisual NDI PTZ, 300s stress test at each
 rate with 10Hz velocity commands interleaved):
@@ -18,6 +19,42 @@ rate with 10Hz velocity commands interleaved):
   - POLL_HZ=2:  594 sent, 3 lost (0.5%), p95=66ms
   10Hz chosen: lowest loss, comfortably under 100ms p95, fine interleave tolerance.
 
+Pipelined inquiries (user-023, ptz.pipelined_poll): instead of a serial
+pan/tilt inquiry per cycle plus a zoom inquiry every ZOOM_POLL_EVERY_N-th, each
+cycle calls ptz.inquire_position(), which sends both back-to-back and splits
+the replies by frame length — zoom refreshes at the pan/tilt rate for about
+the wall time of one inquiry. ptz.poll_hz raises the cycle rate where a bench
+run at that rate shows no loss. Transports without inquire_position fall back
+to the serial cycle.
+
+Encoder history (user-024): every accepted pan/tilt and zoom sample also goes
+into a HISTORY_LEN ring stamped with the time the camera read it: midway
+between the inquiry's send and its reply's arrival (the transport's reply_t,
+kept by the receive thread or the demux loop; the inquiry's return when it
+has none) — not when the call returned, which in the pipelined cycle is
+after both replies, up to a full round trip late. at(t) interpolates the
+pose at an arbitrary time — a frame's decode time — so an observation from a
+frame decoded tens of ms ago is paired with where the camera was THEN, not
+with whatever the poller read last. Outside the sampled span it extrapolates
+(linearly from the last two samples, capped at MAX_EXTRAPOLATE_SEC; held
+before the first) and says so; gap_sec is the distance to the nearest real
+sample, which callers gate on exactly as they gate latest()'s age. at()
+bisects the ring under the lock and copies out only the rows around t; the
+pipeline takes one sample per frame. A sample stamped before the newest one
+(a wall-clock step back) updates latest() but stays out of the ring, which
+must remain sorted.
+
+Adaptive rate (user-025, ptz.adaptive_poll): a parked camera does not need
+10 Hz of inquiries. note_motion() — called on every pan/tilt/zoom command the
+pipeline, the manual path and PointingVerifier send — and any encoder change
+beyond MOTION_DEADBAND_ENC keep the poller at poll_hz (the bench-verified
+loss-free rate) for BURST_HOLD_SEC; after that the rate halves every
+IDLE_DECAY_HALF_SEC down to idle_hz. note_motion(immediate=True), on an
+absolute move, wakes the loop for a poll now, and the hold outlasts
+VERIFY_DELAY_SEC, so the verifier reads a sample taken during the settle.
+Zoom is then polled on a time cadence (every ZOOM_POLL_EVERY_N / poll_hz
+seconds) rather than every Nth cycle, so a slow idle rate cannot starve it.
+
 Stale-late-reply defense (2026-06-11): ViscaIP.inquire_pan_tilt sweeps for the
 freshest queued position frame, and _poll_once rejects physically implausible
 jumps (> MAX_SLEW_COUNTS_PER_SEC vs the previous sample) — one garbage frame
@@ -28,7 +65,12 @@ from __future__ import annotations
 
 import threading
 import time
-from typing import TYPE_CHECKING, Optional, Tuple
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, List, Optional, Sequence, Tuple
+
+from .protocols import PtzPositionLike
 
 if TYPE_CHECKING:
     from .protocols import PtzInquiryLike
@@ -67,18 +109,111 @@ ZOOM_POLL_EVERY_N: int = 5
 ZOOM_FRESH_SEC: float = 2.0
 
 
+# user-025: adaptive poll rate. Changes of this many counts or fewer between
+# consecutive samples are encoder jitter, not motion.
+MOTION_DEADBAND_ENC: int = 2
+# poll_hz is held this long after the last command or encoder change; must
+# exceed VERIFY_DELAY_SEC so the verify sample is taken at the burst rate.
+BURST_HOLD_SEC: float = 1.0
+IDLE_DECAY_HALF_SEC: float = 0.5
+
+# Consumers (estimator vision update, GPS bearing cue, box motion
+# compensation) treat pan/tilt older than this as absent.
+ENCODER_FRESH_SEC: float = 0.5
+# Slowest idle rate whose parked samples stay inside ENCODER_FRESH_SEC: the
+# idle period plus a p95 round trip, with one more p95 of slack for the
+# wake-up. ~3.0 Hz; load_config resets a slower ptz.idle_poll_hz.
+MIN_IDLE_POLL_HZ: float = 1.0 / (ENCODER_FRESH_SEC - 2.0 * REPLY_LATENCY_P95_MS / 1000.0)
+
+
+# user-024: encoder history. 128 samples is ~13 s at POLL_HZ — far more than
+# any frame or box age a consumer asks about.
+HISTORY_LEN: int = 128
+# Linear extrapolation past the newest sample is trusted this far at most;
+# beyond it the last velocity is stale and the value is held.
+MAX_EXTRAPOLATE_SEC: float = 0.2
+
+
+@dataclass(frozen=True)
+class EncoderSample:
+    """at(t): interpolated pose. zoom is None before the first zoom reply."""
+    pan: float
+    tilt: float
+    gap_sec: float                    # |t - nearest pan/tilt sample|
+    extrapolated: bool
+    zoom: Optional[float] = None
+    zoom_gap_sec: Optional[float] = None
+
+
+def _row_t(row: Tuple[float, ...]) -> float:
+    return row[0]
+
+
+def _neighbours(hist: Sequence[Tuple[float, ...]], t: float) -> List[Tuple[float, ...]]:
+    """The rows _interp needs from a non-empty history of (t, v...) rows
+    sorted by time: the sample at t, the pair bracketing it, the first one
+    before the span or the last two past it. Called under the lock, so only
+    these rows are copied out."""
+    i = bisect_left(hist, t, key=_row_t)
+    if i == 0 or (i < len(hist) and hist[i][0] == t):
+        return [hist[i]]
+    if i == len(hist):
+        return [hist[-2], hist[-1]] if len(hist) > 1 else [hist[-1]]
+    return [hist[i - 1], hist[i]]
+
+
+def _interp(rows: Sequence[Tuple[float, ...]],
+            t: float) -> Tuple[Tuple[float, ...], float, bool]:
+    """(values at t, gap to nearest sample, extrapolated) from _neighbours(t)."""
+    first, last = rows[0], rows[-1]
+    if t > last[0]:
+        gap = t - last[0]
+        if len(rows) < 2 or first[0] >= last[0]:
+            near = min(rows, key=lambda r: abs(t - r[0]))   # no usable velocity
+            return near[1:], abs(t - near[0]), True
+        dt = min(gap, MAX_EXTRAPOLATE_SEC)
+        span = last[0] - first[0]
+        return (tuple(y + (y - x) * dt / span for x, y in zip(first[1:], last[1:])),
+                gap, True)
+    if t <= first[0]:
+        return first[1:], first[0] - t, t < first[0]
+    # ta < t <= tb here, so equal or out-of-order stamps (a wall-clock step)
+    # never reach the division: they take a branch above
+    (ta, *a), (tb, *b) = first, last
+    f = (t - ta) / (tb - ta)
+    return (tuple(x + f * (y - x) for x, y in zip(a, b)),
+            min(t - ta, tb - t), False)
+
+
+def _append_in_order(hist: Deque[Tuple[float, ...]], row: Tuple[float, ...]) -> None:
+    """Append unless row is stamped before the newest one (a wall-clock step
+    back): the history must stay sorted for _neighbours' bisect. The cached
+    latest() value still updates."""
+    if hist and row[0] < hist[-1][0]:
+        return
+    hist.append(row)
+
+
 class PtzState:
     """Background encoder-position cache. One instance per pipeline."""
 
-    def __init__(self, ptz: "PtzInquiryLike", poll_hz: float = POLL_HZ):
+    def __init__(self, ptz: "PtzInquiryLike", poll_hz: float = POLL_HZ,
+                 pipelined: bool = False, idle_hz: Optional[float] = None):
         self._ptz = ptz
         self._poll_hz = poll_hz
+        self._pipelined = pipelined
+        self._idle_hz = idle_hz                       # None = fixed poll_hz
+        self._motion_t = float("-inf")                # last command / encoder change
+        self._poll_now = False
+        self._wake = threading.Event()
         self._lock = threading.Lock()
         self._enc: Optional[Tuple[int, int]] = None   # (pan, tilt) counts
         self._ts: Optional[float] = None              # time of last valid reply
         self._zoom: Optional[int] = None              # zoom encoder counts
         self._zoom_ts: Optional[float] = None
         self._cycle: int = 0
+        self._hist: Deque[Tuple[float, ...]] = deque(maxlen=HISTORY_LEN)
+        self._zoom_hist: Deque[Tuple[float, ...]] = deque(maxlen=HISTORY_LEN)
         self._thread: Optional[threading.Thread] = None
         self._stop_ev = threading.Event()
 
@@ -99,6 +234,40 @@ class PtzState:
                 return None, None
             return self._zoom, time.time() - self._zoom_ts
 
+    def at(self, t: float) -> Optional[EncoderSample]:
+        """user-024: pose at wall-clock time t (a frame's decode time), or
+        None before the first pan/tilt reply."""
+        with self._lock:
+            if not self._hist:
+                return None
+            rows = _neighbours(self._hist, t)
+            zrows = _neighbours(self._zoom_hist, t) if self._zoom_hist else None
+        (pan, tilt), gap, extra = _interp(rows, t)
+        if zrows is None:
+            return EncoderSample(pan, tilt, gap, extra)
+        (zoom,), zgap, zextra = _interp(zrows, t)
+        return EncoderSample(pan, tilt, gap, extra or zextra, zoom, zgap)
+
+    def note_motion(self, immediate: bool = False) -> None:
+        """user-025: a move command went out — poll at the burst rate. With
+        immediate (an absolute move), poll now rather than on the schedule."""
+        with self._lock:
+            self._motion_t = time.time()
+            if immediate:
+                self._poll_now = True
+        if self._idle_hz is not None:
+            self._wake.set()
+
+    def current_hz(self, now: Optional[float] = None) -> float:
+        """The poll rate in force: poll_hz while moving, decaying to idle_hz."""
+        burst = max(0.1, self._poll_hz)
+        if self._idle_hz is None:
+            return burst
+        quiet = (now if now is not None else time.time()) - self._motion_t - BURST_HOLD_SEC
+        if quiet <= 0:
+            return burst
+        return max(min(self._idle_hz, burst), burst * 0.5 ** (quiet / IDLE_DECAY_HALF_SEC))
+
     def start(self) -> None:
         """Start the background poll thread. Idempotent."""
         if self._thread and self._thread.is_alive():
@@ -112,6 +281,7 @@ class PtzState:
     def stop(self) -> None:
         """Signal the poll thread to exit and join (blocks up to 1.5s (a blocked recv chain can take 4×0.3s))."""
         self._stop_ev.set()
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=1.5)
 
@@ -128,7 +298,23 @@ class PtzState:
         once (could be a stale/corrupt frame). If the NEXT sample agrees with
         the held-back one, both were real (a genuine large move) and the cache
         re-baselines; if not, the outlier is dropped for good."""
+        t_send = time.time()
         result = self._ptz.inquire_pan_tilt()
+        self._accept_pan_tilt(result, self._sample_t("pan_tilt", t_send))
+
+    def _sample_t(self, kind: str, t_send: float) -> float:
+        """user-024: when the camera read the position — halfway through the
+        round trip, ending at the reply's arrival where the transport reports
+        it (an arrival outside this inquiry's span belongs to another one)."""
+        t_ret = time.time()
+        reply_t = getattr(self._ptz, "reply_t", None)
+        t_rx = reply_t.get(kind) if isinstance(reply_t, dict) else None
+        if t_rx is None or not t_send <= t_rx <= t_ret:
+            t_rx = t_ret
+        return (t_send + t_rx) / 2.0
+
+    def _accept_pan_tilt(self, result: Optional[Tuple[int, int]],
+                         sample_t: Optional[float] = None) -> None:
         if result is None:
             return
         now = time.time()
@@ -145,29 +331,62 @@ class PtzState:
                         self._outlier = None          # two agree: real big move
                     else:
                         self._outlier = result        # hold back; wait for confirmation
+                        self._motion_t = now          # either way, confirm at burst rate
                         return
                 else:
                     self._outlier = None
+            if self._enc is None or max(abs(result[0] - self._enc[0]),
+                                        abs(result[1] - self._enc[1])) > MOTION_DEADBAND_ENC:
+                self._motion_t = now
             self._enc = result
             self._ts = now
+            _append_in_order(self._hist, (sample_t if sample_t is not None else now,
+                                          float(result[0]), float(result[1])))
 
     def _poll_zoom_once(self) -> None:
+        t_send = time.time()
         result = self._ptz.inquire_zoom()
+        self._accept_zoom(result, self._sample_t("zoom", t_send))
+
+    def _poll_both_once(self) -> None:
+        """user-023: one pipelined pan/tilt + zoom cycle."""
+        ptz = self._ptz
+        if not isinstance(ptz, PtzPositionLike):
+            self._poll_once()
+            return
+        t_send = time.time()
+        pt, zoom = ptz.inquire_position()
+        self._accept_pan_tilt(pt, self._sample_t("pan_tilt", t_send))
+        self._accept_zoom(zoom, self._sample_t("zoom", t_send))
+
+    def _accept_zoom(self, result: Optional[int], sample_t: Optional[float] = None) -> None:
         if result is None:
             return
         with self._lock:
+            if self._zoom is None or abs(int(result) - self._zoom) > MOTION_DEADBAND_ENC:
+                self._motion_t = time.time()
             self._zoom = int(result)
             self._zoom_ts = time.time()
+            _append_in_order(self._zoom_hist,
+                             (sample_t if sample_t is not None else self._zoom_ts,
+                              float(self._zoom)))
 
     def _poll_loop(self) -> None:
+        if self._idle_hz is not None:
+            self._adaptive_loop()
+            return
         period = 1.0 / max(0.1, self._poll_hz)
+        pipelined = self._pipelined and isinstance(self._ptz, PtzPositionLike)
         while not self._stop_ev.is_set():
             t0 = time.time()
             try:
-                self._poll_once()
-                self._cycle += 1
-                if self._cycle % ZOOM_POLL_EVERY_N == 0:
-                    self._poll_zoom_once()
+                if pipelined:
+                    self._poll_both_once()
+                else:
+                    self._poll_once()
+                    self._cycle += 1
+                    if self._cycle % ZOOM_POLL_EVERY_N == 0:
+                        self._poll_zoom_once()
             except Exception as e:
                 # Log but do not crash — a transient UDP failure must not kill
                 # the poller; it will retry next cycle.
@@ -176,3 +395,31 @@ class PtzState:
             wait = period - dt
             if wait > 0:
                 self._stop_ev.wait(wait)
+
+    def _adaptive_loop(self) -> None:
+        """user-025: _poll_loop at current_hz(), woken early by note_motion()."""
+        pipelined = self._pipelined and isinstance(self._ptz, PtzPositionLike)
+        zoom_every = ZOOM_POLL_EVERY_N / max(0.1, self._poll_hz)
+        last = last_zoom = float("-inf")
+        while not self._stop_ev.is_set():
+            now = time.time()
+            with self._lock:
+                poll_now, self._poll_now = self._poll_now, False
+            wait = last + 1.0 / self.current_hz(now) - now
+            if not poll_now and wait > 0:
+                # a wake re-evaluates the schedule: a command shortens the
+                # period, but only immediate=True polls ahead of it
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            last = now
+            try:
+                if pipelined:
+                    self._poll_both_once()
+                else:
+                    self._poll_once()
+                    if now - last_zoom >= zoom_every:
+                        last_zoom = now
+                        self._poll_zoom_once()
+            except Exception as e:
+                print(f"[ptz_state] poll error: {e}")
@@ -10,10 +10,37 @@ truth: orin/camera_control/visca_backend.py).
 The controller depends only on the method interface (pan_tilt, stop, zoom, home,
 inquire_pan_tilt), so the transport stays swappable if a future camera needs the
 Sony framing header.
+
+Asynchronous receive (user-022, ptz.async_rx): the legacy inquiries drain the
+socket, send, then block on up to four recvfrom() calls, throwing away ACKs,
+completions and any reply meant for the other inquiry (and racing the
+calibration capture endpoint on the same socket). With async_rx a receive
+thread owns recvfrom: parse_frame() classifies every RAW VISCA frame — ACK
+(90 4y FF), completion (90 5y FF), error (90 6y ee FF), pan/tilt position (11
+bytes) and zoom position (7 bytes) — and resolves the oldest waiting inquiry
+of that reply type, so a pan/tilt and a zoom inquiry never steal each other's
+replies. An inquiry that timed out leaves a marker: the next reply of its type
+within _LATE_REPLY_TIMEOUTS x timeout of its send is taken to be its late
+reply and dropped, never handed straight to the following inquiry (which
+would read a stale position — what the legacy newest-frame sweep guards
+against). The dropped value is held for the oldest inquiry still waiting: if
+no newer reply reaches it before its timeout, the timed-out reply was lost
+and the held one was this inquiry's own, so it is returned (one timeout
+late) and, its reply accounted for, the inquiry leaves no marker. One lost
+reply therefore costs one None, never a cascade. Commands are correlated to
+their ACK / error in send order and to
+their completion by the ACK's socket number; those round-trips, and each
+inquiry's, land in the `rtt` PerfRegistry ("ack_<cmd>", "done_<cmd>",
+"inq_pan_tilt", "inq_zoom") served on /api/v1/perf.
 """
 from __future__ import annotations
 import socket
 import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple, Union
+
+from .perf import PerfRegistry
 
 PAN_LEFT = 0x01
 PAN_RIGHT = 0x02
@@ -22,9 +49,81 @@ TILT_UP = 0x01
 TILT_DOWN = 0x02
 TILT_STOP = 0x03
 
+# Commands sent but not yet ACKed / errored, for RTT correlation. Bounded:
+# UDP drops replies, and a lost ACK must not misattribute every later one.
+_ACK_BACKLOG = 16
+
+# Command bytes 1..3 -> name, for the "ack_<cmd>" / "done_<cmd>" histograms.
+_COMMANDS = {
+    bytes([0x01, 0x06, 0x01]): "pan_tilt",
+    bytes([0x01, 0x06, 0x02]): "pan_tilt_absolute",
+    bytes([0x01, 0x06, 0x04]): "home",
+    bytes([0x01, 0x04, 0x07]): "zoom",
+    bytes([0x01, 0x04, 0x47]): "zoom_absolute",
+}
+
+# A timed-out inquiry's reply is still expected this many timeouts after its
+# send; the next reply of that type inside the window is dropped as late.
+_LATE_REPLY_TIMEOUTS = 3.0
+
+Frame = Tuple[str, Union[int, Tuple[int, int], None]]
+
+
+def _pan_tilt_position(data: bytes) -> Optional[Tuple[int, int]]:
+    if len(data) == 11 and data[0] == 0x90 and data[1] == 0x50:
+        pan = (data[2] << 12) | (data[3] << 8) | (data[4] << 4) | data[5]
+        tilt = (data[6] << 12) | (data[7] << 8) | (data[8] << 4) | data[9]
+        if pan & 0x8000:
+            pan -= 0x10000
+        if tilt & 0x8000:
+            tilt -= 0x10000
+        return pan, tilt
+    return None
+
+
+def _zoom_position(data: bytes) -> Optional[int]:
+    # EXACT length 7: an 11-byte pan/tilt position reply also starts 90 50.
+    if len(data) == 7 and data[0] == 0x90 and data[1] == 0x50:
+        return (data[2] << 12) | (data[3] << 8) | (data[4] << 4) | data[5]
+    return None
+
+
+def parse_frame(data: bytes) -> Optional[Frame]:
+    """Classify one RAW VISCA reply: ("ack", socket), ("done", socket),
+    ("error", (socket, code)), ("pan_tilt", (pan, tilt)), ("zoom", pos);
+    None = garbage."""
+    if len(data) < 3 or data[0] != 0x90 or data[-1] != 0xFF:
+        return None
+    pt = _pan_tilt_position(data)
+    if pt is not None:
+        return ("pan_tilt", pt)
+    z = _zoom_position(data)
+    if z is not None:
+        return ("zoom", z)
+    kind, sock = data[1] & 0xF0, data[1] & 0x0F
+    if len(data) == 3 and kind == 0x40:
+        return ("ack", sock)
+    if len(data) == 3 and kind == 0x50:
+        return ("done", sock)
+    if len(data) == 4 and kind == 0x60:
+        return ("error", (sock, data[2]))
+    return None
+
+
+class _Waiter:
+    __slots__ = ("event", "value", "held")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Union[int, Tuple[int, int], None] = None
+        # a reply dropped as late while this waiter was pending; it is this
+        # waiter's own if nothing newer arrives before the timeout
+        self.held: Union[int, Tuple[int, int], None] = None
+
 
 class ViscaIP:
-    def __init__(self, ip: str, port: int = 1259, address: int = 1, timeout: float = 0.3):
+    def __init__(self, ip: str, port: int = 1259, address: int = 1, timeout: float = 0.3,
+                 async_rx: bool = False):
         self.ip = ip
         self.port = port
         self.addr = 0x80 | (address & 0x0F)        # 0x81 for address 1
@@ -36,6 +135,29 @@ class ViscaIP:
         # — an extended camera-LAN outage would otherwise log every send (up to
         # 10 Hz from the NO_VIDEO stop path) instead of once per outage.
         self._send_failed = False
+        # user-022: receive thread + reply correlation (async_rx only)
+        self.async_rx = async_rx
+        self.rtt = PerfRegistry()
+        self.errors: Dict[int, int] = {}
+        self.unsolicited = 0
+        # user-024: wall time each position type's last accepted reply came in
+        self.reply_t: Dict[str, float] = {}
+        self._rx_lock = threading.Lock()
+        self._waiters: Dict[str, Deque[Tuple[float, _Waiter]]] = {
+            "pan_tilt": deque(), "zoom": deque()}
+        # expiry time of each timed-out inquiry's late-reply window, per type
+        self._late: Dict[str, Deque[float]] = {"pan_tilt": deque(), "zoom": deque()}
+        self._unacked: Deque[Tuple[str, float]] = deque(maxlen=_ACK_BACKLOG)
+        self._executing: Dict[int, Tuple[str, float]] = {}
+        # user-021: set by ViscaScheduler so inquiry bytes leave through its
+        # writer thread too; None = sent from the inquiring thread
+        self.inquiry_sender: Optional[Callable[[bytes], None]] = None
+        self._rx_thread: Optional[threading.Thread] = None
+        self._closed = False
+        if async_rx:
+            self._rx_thread = threading.Thread(target=self._rx_loop, name="visca-rx",
+                                               daemon=True)
+            self._rx_thread.start()
 
     # ---- transport: RAW VISCA, no VISCA-over-IP header (validated @1259) ----
     def _send(self, payload: bytes) -> None:
@@ -49,6 +171,10 @@ class ViscaIP:
         try:
             with self._lock:
                 self._sock.sendto(payload, (self.ip, self.port))
+                if getattr(self, "async_rx", False):
+                    with self._rx_lock:
+                        self._unacked.append((_COMMANDS.get(payload[1:4], "cmd"),
+                                              time.monotonic()))
             self._send_failed = False
         except OSError as e:
             if not self._send_failed:
@@ -128,6 +254,9 @@ class ViscaIP:
         """Zoom position inquiry -> unsigned 16-bit encoder value, or None.
         Same drain-then-send pattern as inquire_pan_tilt — lock held only
         for the sendto, not the blocking recv loop."""
+        if getattr(self, "async_rx", False):
+            z = self._inquire("zoom", bytes([self.addr, 0x09, 0x04, 0x47, 0xFF]))
+            return z if isinstance(z, int) else None
         self._drain()
         with self._lock:
             self._sock.sendto(bytes([self.addr, 0x09, 0x04, 0x47, 0xFF]),
@@ -137,12 +266,12 @@ class ViscaIP:
                 data, _ = self._sock.recvfrom(64)
             except socket.timeout:
                 break
-            # EXACT length 7: an 11-byte pan/tilt position reply also starts
-            # 90 50 and would otherwise be parsed as zoom (cross-talk is real:
-            # both inquiries share this socket at 10Hz/2Hz).
-            if len(data) == 7 and data[0] == 0x90 and data[1] == 0x50:
-                return ((data[2] << 12) | (data[3] << 8) |
-                        (data[4] << 4) | data[5])
+            # EXACT length 7 (see _zoom_position): cross-talk is real, both
+            # inquiries share this socket at 10Hz/2Hz.
+            z = _zoom_position(data)
+            if z is not None:
+                self._stamp_reply("zoom")
+                return z
         return None
 
     def home(self) -> None:
@@ -153,29 +282,22 @@ class ViscaIP:
         Raw reply: 90 50 0p 0p 0p 0p 0t 0t 0t 0t FF (no 8-byte header). Reads past
         stale ACK/completion frames. Lock held only for the sendto, not the blocking
         recv loop (same pattern as inquire_zoom)."""
+        if getattr(self, "async_rx", False):
+            pt = self._inquire("pan_tilt", bytes([self.addr, 0x09, 0x06, 0x12, 0xFF]))
+            return pt if isinstance(pt, tuple) else None
         self._drain()
         with self._lock:
             self._sock.sendto(bytes([self.addr, 0x09, 0x06, 0x12, 0xFF]), (self.ip, self.port))
 
-        def parse(data: bytes) -> tuple[int, int] | None:
-            if len(data) == 11 and data[0] == 0x90 and data[1] == 0x50:
-                pan = (data[2] << 12) | (data[3] << 8) | (data[4] << 4) | data[5]
-                tilt = (data[6] << 12) | (data[7] << 8) | (data[8] << 4) | data[9]
-                if pan & 0x8000:
-                    pan -= 0x10000
-                if tilt & 0x8000:
-                    tilt -= 0x10000
-                return pan, tilt
-            return None
-
         result = None
         for _ in range(4):
             try:
                 data, _ = self._sock.recvfrom(64)
             except socket.timeout:
                 break
-            result = parse(data)
+            result = _pan_tilt_position(data)
             if result is not None:
+                self._stamp_reply("pan_tilt")
                 break
         if result is None:
             return None
@@ -188,20 +310,174 @@ class ViscaIP:
             self._sock.setblocking(False)
             while True:
                 data, _ = self._sock.recvfrom(64)
-                newer = parse(data)
+                newer = _pan_tilt_position(data)
                 if newer is not None:
                     result = newer
+                    self._stamp_reply("pan_tilt")
         except OSError:
             pass
         finally:
             self._sock.settimeout(self.timeout)
         return result
 
+    def inquire_position(self) -> tuple[tuple[int, int] | None, int | None]:
+        """user-023: pan/tilt and zoom inquiries sent back-to-back, replies
+        demultiplexed by frame length (11 = pan/tilt, 7 = zoom) — both values
+        for about the wall time of one inquiry. Either may be None."""
+        pt_q = bytes([self.addr, 0x09, 0x06, 0x12, 0xFF])
+        zoom_q = bytes([self.addr, 0x09, 0x04, 0x47, 0xFF])
+        deadline = time.monotonic() + self.timeout
+        if getattr(self, "async_rx", False):
+            pt_pending = self._post("pan_tilt", pt_q)
+            zoom_pending = self._post("zoom", zoom_q)
+            pt_v = self._collect("pan_tilt", pt_pending, deadline)
+            zoom_v = self._collect("zoom", zoom_pending, deadline)
+            return (pt_v if isinstance(pt_v, tuple) else None,
+                    zoom_v if isinstance(zoom_v, int) else None)
+        self._drain()
+        with self._lock:
+            self._sock.sendto(pt_q, (self.ip, self.port))
+            self._sock.sendto(zoom_q, (self.ip, self.port))
+        pt: tuple[int, int] | None = None
+        zoom: int | None = None
+        for _ in range(8):                   # two replies + interleaved ACKs
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._sock.settimeout(remaining)
+                data, _ = self._sock.recvfrom(64)
+            except OSError:
+                break
+            p = _pan_tilt_position(data)
+            if p is not None:
+                pt = p
+                self._stamp_reply("pan_tilt")
+            z = _zoom_position(data)
+            if z is not None:
+                zoom = z
+                self._stamp_reply("zoom")
+            if pt is not None and zoom is not None:
+                break
+        self._sock.settimeout(self.timeout)
+        return pt, zoom
+
+    def _stamp_reply(self, kind: str) -> None:
+        """user-024: record when a position reply of this type arrived."""
+        stamps = getattr(self, "reply_t", None)
+        if stamps is None:
+            stamps = self.reply_t = {}
+        stamps[kind] = time.time()
+
     def close(self) -> None:
+        self._closed = True
         try:
             self._sock.close()
         except OSError:
             pass
+        if self._rx_thread is not None:
+            self._rx_thread.join(timeout=1.0)
+
+    # ---- user-022: asynchronous receive ----
+    def _inquire(self, kind: str, payload: bytes) -> Union[int, Tuple[int, int], None]:
+        """Send one inquiry and wait for the receive thread to hand over the
+        next reply of its type; None on timeout or send failure."""
+        pending = self._post(kind, payload)
+        return self._collect(kind, pending, time.monotonic() + self.timeout)
+
+    def _post(self, kind: str, payload: bytes) -> Tuple[float, _Waiter]:
+        waiter = _Waiter()
+        t0 = time.monotonic()
+        with self._rx_lock:
+            self._waiters[kind].append((t0, waiter))
+        sender = getattr(self, "inquiry_sender", None)
+        if sender is not None:
+            sender(payload)
+        else:
+            self.send_inquiry(payload)
+        return t0, waiter
+
+    def send_inquiry(self, payload: bytes) -> None:
+        """Inquiry bytes on the socket; no ACK follows, so no RTT backlog."""
+        try:
+            with self._lock:
+                self._sock.sendto(payload, (self.ip, self.port))
+        except OSError:
+            pass
+
+    def _collect(self, kind: str, pending: Tuple[float, _Waiter],
+                 deadline: float) -> Union[int, Tuple[int, int], None]:
+        waiter = pending[1]
+        if not waiter.event.wait(max(0.0, deadline - time.monotonic())):
+            with self._rx_lock:
+                try:
+                    self._waiters[kind].remove(pending)
+                except ValueError:
+                    return waiter.value      # resolved just after the timeout
+                if waiter.held is not None:
+                    return waiter.held       # starved by a lost reply's marker
+                self._late[kind].append(pending[0] + _LATE_REPLY_TIMEOUTS * self.timeout)
+        return waiter.value
+
+    def _rx_loop(self) -> None:
+        while not self._closed:
+            try:
+                data, _ = self._sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._closed:
+                    return
+                time.sleep(self.timeout)     # LAN outage: do not spin
+                continue
+            self._dispatch(data, time.monotonic())
+
+    def _dispatch(self, data: bytes, now: float) -> None:
+        frame = parse_frame(data)
+        if frame is None:
+            self.unsolicited += 1
+            return
+        kind, value = frame
+        with self._rx_lock:
+            if kind in self._waiters:
+                late = self._late[kind]
+                while late and now > late[0]:
+                    late.popleft()           # that reply was lost, not late
+                if late or not self._waiters[kind]:
+                    if late:
+                        late.popleft()
+                    if self._waiters[kind]:
+                        self._waiters[kind][0][1].held = value
+                        self._stamp_reply(kind)
+                    self.unsolicited += 1    # late reply to a timed-out inquiry
+                    return
+                t0, waiter = self._waiters[kind].popleft()
+                self._stamp_reply(kind)
+                waiter.value = value
+                waiter.event.set()
+                self.rtt.observe(f"inq_{kind}", now - t0)
+            elif kind == "ack" and isinstance(value, int):
+                if self._unacked:
+                    name, t0 = self._unacked.popleft()
+                    self.rtt.observe(f"ack_{name}", now - t0)
+                    self._executing[value] = (name, t0)
+            elif kind == "done" and isinstance(value, int):
+                started = self._executing.pop(value, None)
+                if started is not None:
+                    self.rtt.observe(f"done_{started[0]}", now - started[1])
+            elif kind == "error" and isinstance(value, tuple):
+                sock, code = value
+                # an executing command's socket, else a rejection in place of its ACK
+                if self._executing.pop(sock, None) is None and self._unacked:
+                    self._unacked.popleft()
+                self.errors[code] = self.errors.get(code, 0) + 1
+
+    def stats(self) -> dict:
+        """Round-trip histograms and error counts (async_rx only)."""
+        with self._rx_lock:
+            errors = {f"0x{k:02x}": v for k, v in sorted(self.errors.items())}
+        return {"rtt": self.rtt.snapshot(), "errors": errors,
+                "unsolicited": self.unsolicited}
 
 
 class NullPtz:
@@ -215,4 +491,5 @@ class NullPtz:
     def home(self) -> None: pass
     def inquire_pan_tilt(self) -> tuple[int, int] | None: return None
     def inquire_zoom(self) -> int | None: return None
+    def inquire_position(self) -> tuple[tuple[int, int] | None, int | None]: return None, None
     def close(self) -> None: pass
@@ -0,0 +1,241 @@
+"""
+Single-writer VISCA command scheduler (user-021).
+
+PTZ bytes used to leave from whichever thread wanted to move the camera —
+the servo (_send_cmd / _send_zoom / _send_absolute_cmd), PointingVerifier
+resends, the manual dispatcher and its deadman timers, the KILL path — all
+contending on ViscaIP._lock, with dedupe scattered across the callers. With
+ptz.scheduler, run.py wraps the transport in ViscaScheduler, which keeps the
+same method interface (so no caller changes) but only ENQUEUES: one writer
+thread owns the socket and sends.
+
+  - two channels, "pt" (pan_tilt, pan_tilt_absolute, home) and "zoom"
+    (zoom, zoom_absolute). Each holds only the NEWEST pending intent — a
+    newer command to the same axis supersedes an unsent older one, which is
+    what the camera would do with it anyway ("coalesced").
+  - stop() and zoom("stop") are urgent: they drop the pending intent of their
+    channel, jump the queue and ignore the send gap ("preempted"). Urgent
+    intents are FIFO, so a move enqueued after a stop still goes out after it.
+  - otherwise sends are spaced at least min_gap_sec apart (shaped to what the
+    Prisual absorbs without dropping datagrams), oldest pending channel first.
+
+Every send records its enqueue -> socket time in perf ("visca_queue_pt",
+"visca_queue_zoom", "visca_queue_inq", "visca_queue_urgent"), served with the counters on
+/api/v1/perf. Inquiries (PtzState, calibration) are still called on the
+transport, since the caller waits for the reply on its own thread. With
+ptz.async_rx, though, the transport's receive thread routes the replies, so
+the inquiry BYTES go through this writer too: a FIFO "inq" channel, never
+coalesced (each has a waiter) and spaced like any other send, so nothing
+but the writer touches the socket. Without async_rx the legacy
+drain-send-recv inquiries stay on the calling thread.
+
+A command can carry its frame's decode time (trace()); the writer records
+"glass_to_visca" when the bytes are actually sent, not when they were
+queued. A coalesced-away or preempted command never reached the camera and
+records nothing.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .perf import PerfRegistry
+
+PT = "pt"
+ZOOM = "zoom"
+INQ = "inq"
+
+# How long close() waits for the writer to flush before returning; the writer
+# still finishes (and closes the transport) after that.
+CLOSE_JOIN_SEC = 1.0
+
+
+@dataclass
+class _Intent:
+    channel: str
+    method: str
+    args: Tuple[Any, ...]
+    t: float = field(default_factory=time.monotonic)
+    urgent: bool = False
+    origin: Optional[Tuple[float, PerfRegistry]] = None   # (frame decode t, perf)
+
+
+class ViscaScheduler:
+    def __init__(self, transport, min_gap_sec: float = 0.02,
+                 perf: Optional[PerfRegistry] = None) -> None:
+        self.transport = transport
+        self.min_gap_sec = max(0.0, float(min_gap_sec))
+        self.perf = perf if perf is not None else PerfRegistry()
+        self._cv = threading.Condition()
+        self._slots: Dict[str, _Intent] = {}
+        self._urgent: Deque[_Intent] = deque()
+        self._inq: Deque[_Intent] = deque()
+        self._local = threading.local()
+        self._last_send = float("-inf")
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.sent = 0
+        self.coalesced = 0
+        self.preempted = 0
+        if getattr(transport, "async_rx", False) is True:
+            transport.inquiry_sender = self._enqueue_inquiry
+
+    # ---- lifecycle ----
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="visca-writer",
+                                            daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Flush what is queued (a final stop first), then close the
+        transport. With a writer thread the writer does both on its way out —
+        every pending move and inquiry, spaced by the usual gap, even if it is
+        still inside a slow transport call when the join gives up — so no
+        second thread ever touches the socket; without one, only the urgent
+        intents are sent here."""
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+            thread = self._thread
+            urgent = list(self._urgent) if thread is None else []
+            if thread is None:
+                self._urgent.clear()
+        if thread is not None:
+            thread.join(timeout=CLOSE_JOIN_SEC)
+            if thread.is_alive():
+                print("[visca_scheduler] writer still busy at close; it closes the transport")
+            return
+        for intent in urgent:
+            self._send(intent)
+        self.transport.close()
+
+    # ---- ViscaIP interface: commands enqueue ----
+    def pan_tilt(self, pan_speed: int, tilt_speed: int, pan_dir: int, tilt_dir: int) -> None:
+        self._put(_Intent(PT, "pan_tilt", (pan_speed, tilt_speed, pan_dir, tilt_dir)))
+
+    def pan_tilt_absolute(self, pan_pos: int, tilt_pos: int,
+                          pan_speed: int = 5, tilt_speed: int = 5) -> None:
+        self._put(_Intent(PT, "pan_tilt_absolute", (pan_pos, tilt_pos, pan_speed, tilt_speed)))
+
+    def home(self) -> None:
+        self._put(_Intent(PT, "home", ()))
+
+    def stop(self) -> None:
+        self._put(_Intent(PT, "stop", (), urgent=True))
+
+    def zoom(self, direction: str, speed: int = 0) -> None:
+        self._put(_Intent(ZOOM, "zoom", (direction, speed), urgent=direction == "stop"))
+
+    def zoom_absolute(self, zoom_pos: int) -> None:
+        self._put(_Intent(ZOOM, "zoom_absolute", (zoom_pos,)))
+
+    def trace(self, frame_t: Optional[float], perf: PerfRegistry) -> None:
+        """Attribute this thread's next command to the frame decoded at
+        frame_t: its glass_to_visca lands in perf when the writer sends it."""
+        self._local.origin = (frame_t, perf) if frame_t else None
+
+    def _enqueue_inquiry(self, payload: bytes) -> None:
+        self._put(_Intent(INQ, "send_inquiry", (payload,)))
+
+    # ---- pass-through ----
+    def reset_sequence(self) -> None:
+        self.transport.reset_sequence()
+
+    def inquire_pan_tilt(self) -> Optional[Tuple[int, int]]:
+        return self.transport.inquire_pan_tilt()
+
+    def inquire_zoom(self) -> Optional[int]:
+        return self.transport.inquire_zoom()
+
+    def inquire_position(self) -> Tuple[Optional[Tuple[int, int]], Optional[int]]:
+        return self.transport.inquire_position()
+
+    @property
+    def reply_t(self) -> Dict[str, float]:
+        return getattr(self.transport, "reply_t", {})
+
+    def stats(self) -> dict:
+        with self._cv:
+            pending = len(self._slots) + len(self._urgent) + len(self._inq)
+        transport_stats = getattr(self.transport, "stats", None)
+        return {"sent": self.sent, "coalesced": self.coalesced,
+                "preempted": self.preempted, "pending": pending,
+                "queue": self.perf.snapshot(),
+                "transport": transport_stats() if callable(transport_stats) else None}
+
+    # ---- queue ----
+    def _put(self, intent: _Intent) -> None:
+        if intent.channel != INQ:
+            intent.origin = getattr(self._local, "origin", None)
+            self._local.origin = None
+        with self._cv:
+            if intent.channel == INQ:
+                self._inq.append(intent)
+            elif intent.urgent:
+                if self._slots.pop(intent.channel, None) is not None:
+                    self.preempted += 1
+                # moves always go out after every pending urgent, so an
+                # identical one already queued covers this (KILL + deadman)
+                if any((u.method, u.args) == (intent.method, intent.args)
+                       for u in self._urgent):
+                    self.coalesced += 1
+                else:
+                    self._urgent.append(intent)
+            else:
+                if self._slots.get(intent.channel) is not None:
+                    self.coalesced += 1
+                    intent.t = self._slots[intent.channel].t   # queue time of the oldest
+                self._slots[intent.channel] = intent
+            self._cv.notify()
+
+    def _next(self, now: float) -> Tuple[Optional[_Intent], float]:
+        """(intent to send now, or None; seconds to wait otherwise). Caller
+        holds the condition."""
+        if self._urgent:
+            return self._urgent.popleft(), 0.0
+        if not self._slots and not self._inq:
+            return None, float("inf")
+        wait = self._last_send + self.min_gap_sec - now
+        if wait > 0:
+            return None, wait
+        pending = list(self._slots.values())
+        if self._inq:
+            pending.append(self._inq[0])
+        intent = min(pending, key=lambda i: i.t)
+        if intent.channel == INQ:
+            self._inq.popleft()
+        else:
+            del self._slots[intent.channel]
+        return intent, 0.0
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                intent, wait = self._next(time.monotonic())
+                if intent is None:
+                    # closing still drains: a move or inquiry inside the send
+                    # gap waits it out rather than being dropped
+                    if self._closed and wait == float("inf"):
+                        break
+                    self._cv.wait(None if wait == float("inf") else wait)
+                    continue
+            self._send(intent)
+        self.transport.close()                # close() left the socket to us
+
+    def _send(self, intent: _Intent) -> None:
+        try:
+            getattr(self.transport, intent.method)(*intent.args)
+        except Exception as e:  # the writer must survive a bad transport call
+            print(f"[visca_scheduler] {intent.method} failed: {e}")
+        now = time.monotonic()
+        self._last_send = now
+        self.sent += 1
+        self.perf.observe(f"visca_queue_{'urgent' if intent.urgent else intent.channel}",
+                          now - intent.t)
+        if intent.origin is not None:
+            frame_t, perf = intent.origin
+            perf.since("glass_to_visca", frame_t, time.time())